@@ -31,4 +31,7 @@ module Comp = (
 
   @send
   external addAnchorFromVec2: (Context.t, Vec2.Unit.t) => Types.comp = "anchor"
+
+  @set
+  external setAnchor: (T.t, anchor) => unit = "anchor"
 }
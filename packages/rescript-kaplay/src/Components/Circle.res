@@ -6,6 +6,9 @@ module Comp = (
   @get
   external getRadius: T.t => float = "radius"
 
+  @set
+  external setRadius: (T.t, float) => unit = "radius"
+
   type circleOptions = {fill?: bool}
 
   @send
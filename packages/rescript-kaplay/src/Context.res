@@ -210,6 +210,25 @@ external loadSprite: (t, string, string, ~options: loadSpriteOptions=?) => unit
 @send
 external getSprite: (t, string) => Asset.t<SpriteData.t> = "getSprite"
 
+/** Region of a sprite atlas image that becomes a sprite. */
+type spriteAtlasEntry = {
+  x: int,
+  y: int,
+  width: int,
+  height: int,
+  sliceX?: int,
+  sliceY?: int,
+  anims?: Dict.t<loadSpriteAnimation>,
+  anim?: string,
+}
+
+/**
+ `loadSpriteAtlas(context, src, data)` loads one image and registers a sprite for every entry of `data`.
+ All sprites share the texture of the image. See `SpriteAtlas` to load a packed atlas.
+ */
+@send
+external loadSpriteAtlas: (t, string, Dict.t<spriteAtlasEntry>) => unit = "loadSpriteAtlas"
+
 /** Use for short sound effects, use `loadMusic` for background music. */
 @send
 external loadSound: (t, string, string) => unit = "loadSound"
@@ -412,6 +431,8 @@ external setFullscreen: (t, bool) => unit = "setFullscreen"
 type levelOptions = {
   tileWidth?: float,
   tileHeight?: float,
+  /** Position of the top left tile. */
+  pos?: Vec2.World.t,
   tiles: Dict.t<unit => array<comp>>,
 }
 
@@ -420,6 +441,30 @@ module Level = {
 
   @send
   external spawn: (t, array<comp>, Vec2.Tile.t) => 't = "spawn"
+
+  @send
+  external numColumns: t => int = "numColumns"
+
+  @send
+  external numRows: t => int = "numRows"
+
+  @send
+  external tileWidth: t => float = "tileWidth"
+
+  @send
+  external tileHeight: t => float = "tileHeight"
+
+  /** The game objects on a tile. */
+  @send
+  external getAt: (t, Vec2.Tile.t) => array<'gameObj> = "getAt"
+
+  @send
+  external worldPos: t => Vec2.World.t = "worldPos"
+
+  /** Called when a tile is spawned, removed or changes its obstacle or cost. */
+  @send
+  external onNavigationMapInvalid: (t, unit => unit) => KEventController.t =
+    "onNavigationMapInvalid"
 }
 
 @send
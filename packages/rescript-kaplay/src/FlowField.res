@@ -0,0 +1,475 @@
+/***
+ Flow fields over the tile grid of a level, to move many game objects to the same goal.
+
+ The `Agent` component searches a path for every game object that has it. A flow field instead
+ stores, for every tile, the next tile on a cheapest path to the goal. It is computed once per goal
+ with a single pass over the grid, and any number of game objects read their direction from it with
+ `directionInto`, which only looks up the tile they stand on.
+
+ - The cost to enter a tile is `1` plus the `cost` of the tile components on it. A tile with an
+   obstacle on it can't be entered.
+ - Fields are cached on the grid, `toGoal` returns the same field for the same goal until it is
+   `release`d.
+ - When the level reports that its tiles changed, the grid reads them again before the next
+   `toGoal` or `directionInto`. Only the part of a field that went through a changed tile is
+   computed again.
+
+ ## Examples
+
+ ```rescript
+ let grid = FlowField.forLevel(k, level)
+ let field = grid->FlowField.toGoal(k->Context.vec2Tile(1., 1.))
+
+ charmander->onUpdate(() => {
+   if field->FlowField.directionInto(charmander->worldPos, charmander.velocity) {
+     charmander.velocity->Vec2.World.scaleInPlace(120.)
+     charmander->move(charmander.velocity)
+   }
+ })
+ ```
+ */
+
+@get_index external getUnsafe: (TypedArray.t<'a>, int) => 'a = ""
+@set_index external setUnsafe: (TypedArray.t<'a>, int, 'a) => unit = ""
+@send external fill: (TypedArray.t<'a>, 'a) => unit = "fill"
+@set external setLength: (array<'a>, int) => unit = "length"
+
+/** Cost of a tile that can't be entered. */
+let blocked = -1
+
+/** What a game object on a tile tells about it, objects without a tile component have neither. */
+type navigation = {
+  isObstacle?: bool,
+  cost?: int,
+}
+
+type source = {
+  k: Context.t,
+  level: Context.Level.t,
+  /** Reused to look up the game objects on a tile. */
+  tilePos: Vec2.Tile.t,
+}
+
+type rec grid = {
+  columns: int,
+  rows: int,
+  tileWidth: float,
+  tileHeight: float,
+  /** World position of the top left corner of the grid. */
+  mutable originX: float,
+  mutable originY: float,
+  /** Cost to enter every tile, row by row, `blocked` for obstacles. */
+  costs: Int32Array.t,
+  /** Fields by `fieldKey` of their goal. */
+  fields: Map.t<int, t>,
+  /** The level the costs are read from, `None` for grids from `make`. */
+  source: option<source>,
+  /** Set when the level reported that its tiles changed. */
+  mutable stale: bool,
+}
+and t = {
+  grid: grid,
+  /** Index of the goal tile. */
+  goal: int,
+  allowDiagonals: bool,
+  /** Cost of the cheapest path from every tile to the goal, infinity when there is none. */
+  distances: Float64Array.t,
+  /** The tile to move to from every tile, `-1` on the goal and when there is no path. */
+  next: Int32Array.t,
+  /**
+   Binary heap of tiles by distance. A tile is pushed again when its distance drops, the older
+   entry is skipped when it is popped.
+   */
+  heapTiles: array<int>,
+  heapDistances: array<float>,
+  /** Tiles whose path went through a tile that got more expensive, reused by every repair. */
+  invalidated: array<int>,
+}
+
+/** Orthogonal steps first, then diagonal ones. */
+let stepColumns = [1, -1, 0, 0, 1, 1, -1, -1]
+let stepRows = [0, 0, 1, -1, 1, -1, 1, -1]
+
+let stepLength = (direction: int): float => direction < 4 ? 1. : Stdlib_Math.Constants.sqrt2
+
+let directionCount = (field: t): int => field.allowDiagonals ? 8 : 4
+
+let fieldKey = (goal: int, allowDiagonals: bool): int => goal * 2 + (allowDiagonals ? 1 : 0)
+
+/**
+ The tile next to `tile` in `direction`, or `-1` when it is outside the grid, an obstacle, or when
+ the diagonal step would cut the corner of an obstacle.
+ */
+let neighbour = (grid: grid, tile: int, direction: int): int => {
+  let stepColumn = stepColumns->Array.getUnsafe(direction)
+  let stepRow = stepRows->Array.getUnsafe(direction)
+  let column = mod(tile, grid.columns) + stepColumn
+  let row = tile / grid.columns + stepRow
+  if column < 0 || column >= grid.columns || row < 0 || row >= grid.rows {
+    -1
+  } else {
+    let other = row * grid.columns + column
+    if grid.costs->getUnsafe(other) == blocked {
+      -1
+    } else if (
+      direction >= 4 &&
+        (grid.costs->getUnsafe(tile + stepColumn) == blocked ||
+          grid.costs->getUnsafe(tile + stepRow * grid.columns) == blocked)
+    ) {
+      -1
+    } else {
+      other
+    }
+  }
+}
+
+let push = (field: t, tile: int, distance: float) => {
+  let position = ref(field.heapTiles->Array.length)
+  field.heapTiles->Array.push(tile)
+  field.heapDistances->Array.push(distance)
+  while (
+    position.contents > 0 &&
+      field.heapDistances->Array.getUnsafe((position.contents - 1) / 2) > distance
+  ) {
+    let parent = (position.contents - 1) / 2
+    field.heapTiles->Array.setUnsafe(position.contents, field.heapTiles->Array.getUnsafe(parent))
+    field.heapDistances->Array.setUnsafe(
+      position.contents,
+      field.heapDistances->Array.getUnsafe(parent),
+    )
+    position := parent
+  }
+  field.heapTiles->Array.setUnsafe(position.contents, tile)
+  field.heapDistances->Array.setUnsafe(position.contents, distance)
+}
+
+/** Removes the closest tile from the heap, read it and its distance at index `0` first. */
+let pop = (field: t) => {
+  let last = field.heapTiles->Array.length - 1
+  let tile = field.heapTiles->Array.getUnsafe(last)
+  let distance = field.heapDistances->Array.getUnsafe(last)
+  field.heapTiles->setLength(last)
+  field.heapDistances->setLength(last)
+  let position = ref(0)
+  let sifting = ref(last > 0)
+  while sifting.contents {
+    let left = position.contents * 2 + 1
+    let right = left + 1
+    let smallest =
+      right < last &&
+        field.heapDistances->Array.getUnsafe(right) < field.heapDistances->Array.getUnsafe(left)
+        ? right
+        : left
+    if smallest < last && field.heapDistances->Array.getUnsafe(smallest) < distance {
+      field.heapTiles->Array.setUnsafe(
+        position.contents,
+        field.heapTiles->Array.getUnsafe(smallest),
+      )
+      field.heapDistances->Array.setUnsafe(
+        position.contents,
+        field.heapDistances->Array.getUnsafe(smallest),
+      )
+      position := smallest
+    } else {
+      sifting := false
+    }
+  }
+  if last > 0 {
+    field.heapTiles->Array.setUnsafe(position.contents, tile)
+    field.heapDistances->Array.setUnsafe(position.contents, distance)
+  }
+}
+
+/** Dijkstra from the tiles on the heap outwards, until the heap is empty. */
+let run = (field: t) => {
+  let grid = field.grid
+  while field.heapTiles->Array.length > 0 {
+    let tile = field.heapTiles->Array.getUnsafe(0)
+    let distance = field.heapDistances->Array.getUnsafe(0)
+    field->pop
+    if distance == field.distances->getUnsafe(tile) {
+      // Every neighbour can step onto this tile, paying its cost
+      let cost = Int.toFloat(grid.costs->getUnsafe(tile))
+      for direction in 0 to directionCount(field) - 1 {
+        let other = grid->neighbour(tile, direction)
+        if other >= 0 {
+          let candidate = distance + cost * stepLength(direction)
+          if candidate < field.distances->getUnsafe(other) {
+            field.distances->setUnsafe(other, candidate)
+            field.next->setUnsafe(other, tile)
+            field->push(other, candidate)
+          }
+        }
+      }
+    }
+  }
+}
+
+/** Computes the whole field, one pass over the grid. */
+let compute = (field: t) => {
+  field.distances->fill(Float.Constants.positiveInfinity)
+  field.next->fill(-1)
+  if field.grid.costs->getUnsafe(field.goal) != blocked {
+    field.distances->setUnsafe(field.goal, 0.)
+    field->push(field.goal, 0.)
+    field->run
+  }
+}
+
+/** The cheapest way from `tile` to the goal through one of its neighbours, kept when shorter. */
+let improveFromNeighbours = (field: t, tile: int) => {
+  let grid = field.grid
+  for direction in 0 to directionCount(field) - 1 {
+    let other = grid->neighbour(tile, direction)
+    if other >= 0 {
+      let candidate =
+        field.distances->getUnsafe(other) +
+          Int.toFloat(grid.costs->getUnsafe(other)) * stepLength(direction)
+      if candidate < field.distances->getUnsafe(tile) {
+        field.distances->setUnsafe(tile, candidate)
+        field.next->setUnsafe(tile, other)
+      }
+    }
+  }
+}
+
+/**
+ Forgets the path of every tile that moves through `tile`, directly or further down the way, and
+ collects them in `field.invalidated`. `tile` itself is collected first.
+ */
+let invalidateThrough = (field: t, tile: int) => {
+  let grid = field.grid
+  let invalidated = field.invalidated
+  invalidated->Array.push(tile)
+  let position = ref(0)
+  while position.contents < invalidated->Array.length {
+    let through = invalidated->Array.getUnsafe(position.contents)
+    for direction in 0 to directionCount(field) - 1 {
+      let other = grid->neighbour(through, direction)
+      if other >= 0 && field.next->getUnsafe(other) == through {
+        field.distances->setUnsafe(other, Float.Constants.positiveInfinity)
+        field.next->setUnsafe(other, -1)
+        invalidated->Array.push(other)
+      }
+    }
+    position := position.contents + 1
+  }
+}
+
+/**
+ Updates the field after the cost of `tile` changed from `previous`, without going over the tiles
+ whose path doesn't change.
+ */
+let repair = (field: t, tile: int, previous: int) => {
+  let grid = field.grid
+  let cost = grid.costs->getUnsafe(tile)
+  if tile == field.goal || (field.allowDiagonals && (cost == blocked) != (previous == blocked)) {
+    // An obstacle also decides which diagonal steps next to it cut a corner
+    field->compute
+  } else if cost == blocked || (previous != blocked && cost > previous) {
+    if cost == blocked {
+      field.distances->setUnsafe(tile, Float.Constants.positiveInfinity)
+      field.next->setUnsafe(tile, -1)
+    }
+    field->invalidateThrough(tile)
+    field.invalidated->Array.forEach(invalidated => {
+      if grid.costs->getUnsafe(invalidated) != blocked {
+        field->improveFromNeighbours(invalidated)
+        let distance = field.distances->getUnsafe(invalidated)
+        if distance < Float.Constants.positiveInfinity {
+          field->push(invalidated, distance)
+        }
+      }
+    })
+    field.invalidated->setLength(0)
+    field->run
+  } else {
+    if previous == blocked {
+      field->improveFromNeighbours(tile)
+    }
+    let distance = field.distances->getUnsafe(tile)
+    if distance < Float.Constants.positiveInfinity {
+      field->push(tile, distance)
+      field->run
+    }
+  }
+}
+
+let setCostAt = (grid: grid, tile: int, cost: int) => {
+  let previous = grid.costs->getUnsafe(tile)
+  if cost != previous {
+    grid.costs->setUnsafe(tile, cost)
+    grid.fields->Map.forEach(field => field->repair(tile, previous))
+  }
+}
+
+/** Index of a tile in the grid, the tile must be on the grid. */
+let indexOf = (grid: grid, tile: Vec2.Tile.t): int =>
+  Float.toInt(tile.y) * grid.columns + Float.toInt(tile.x)
+
+/**
+ `setCost(grid, tile, cost)` sets the cost to enter a tile, `blocked` for an obstacle, and repairs
+ every field of the grid. On the grid of a level, it is overwritten when the tile changes in the
+ level.
+ */
+let setCost = (grid: grid, tile: Vec2.Tile.t, cost: int) =>
+  grid->setCostAt(grid->indexOf(tile), cost)
+
+/** Cost to enter a tile with these game objects on it. */
+let tileCost = (objects: array<navigation>): int =>
+  objects->Array.reduce(1, (cost, gameObj) =>
+    if cost == blocked || gameObj.isObstacle == Some(true) {
+      blocked
+    } else {
+      cost + gameObj.cost->Option.getOr(0)
+    }
+  )
+
+/**
+ Reads the tiles of the level again and repairs the fields for every tile whose cost changed.
+ This happens by itself after the level reported a change, call it to apply a change right away.
+ */
+let refresh = (grid: grid) => {
+  grid.stale = false
+  switch grid.source {
+  | Some({level, tilePos}) => {
+      let origin = level->Context.Level.worldPos
+      grid.originX = origin.x
+      grid.originY = origin.y
+      for row in 0 to grid.rows - 1 {
+        for column in 0 to grid.columns - 1 {
+          tilePos->Vec2.Tile.setXY(Int.toFloat(column), Int.toFloat(row))
+          let cost = tileCost(level->Context.Level.getAt(tilePos))
+          grid->setCostAt(row * grid.columns + column, cost)
+        }
+      }
+    }
+  | None => ()
+  }
+}
+
+/**
+ `make(~columns, ~rows, ~tileWidth, ~tileHeight)` creates a grid where every tile costs `1`.
+ Use `forLevel` for the grid of a level, `make` is for grids that are not backed by one.
+ */
+let make = (
+  ~columns: int,
+  ~rows: int,
+  ~tileWidth: float,
+  ~tileHeight: float,
+  ~source: source=?,
+): grid => {
+  let grid = {
+    columns,
+    rows,
+    tileWidth,
+    tileHeight,
+    originX: 0.,
+    originY: 0.,
+    costs: Int32Array.fromLength(columns * rows),
+    fields: Map.make(),
+    source,
+    stale: false,
+  }
+  grid.costs->fill(1)
+  grid
+}
+
+let grids: WeakMap.t<Context.Level.t, grid> = WeakMap.make()
+
+/** The grid of a level, shared by every field to a goal in the level. */
+let forLevel = (k: Context.t, level: Context.Level.t): grid => {
+  switch grids->WeakMap.get(level) {
+  | Some(grid) => grid
+  | None => {
+      let grid = make(
+        ~columns=level->Context.Level.numColumns,
+        ~rows=level->Context.Level.numRows,
+        ~tileWidth=level->Context.Level.tileWidth,
+        ~tileHeight=level->Context.Level.tileHeight,
+        ~source={k, level, tilePos: k->Context.vec2Tile(0., 0.)},
+      )
+      grid->refresh
+      level->Context.Level.onNavigationMapInvalid(() => grid.stale = true)->ignore
+      grids->WeakMap.set(level, grid)->ignore
+      grid
+    }
+  }
+}
+
+/**
+ `toGoal(grid, goal, ~allowDiagonals)` returns the field that leads to the `goal` tile, computing
+ it when it isn't cached yet. Diagonal steps never cut the corner of an obstacle.
+ */
+let toGoal = (grid: grid, goal: Vec2.Tile.t, ~allowDiagonals: bool=false): t => {
+  if grid.stale {
+    grid->refresh
+  }
+  let goal = grid->indexOf(goal)
+  let key = fieldKey(goal, allowDiagonals)
+  switch grid.fields->Map.get(key) {
+  | Some(field) => field
+  | None => {
+      let field = {
+        grid,
+        goal,
+        allowDiagonals,
+        distances: Float64Array.fromLength(grid.columns * grid.rows),
+        next: Int32Array.fromLength(grid.columns * grid.rows),
+        heapTiles: [],
+        heapDistances: [],
+        invalidated: [],
+      }
+      field->compute
+      grid.fields->Map.set(key, field)
+      field
+    }
+  }
+}
+
+/** Removes the field from the cache of its grid, it is no longer repaired when tiles change. */
+let release = (field: t) => {
+  field.grid.fields->Map.delete(fieldKey(field.goal, field.allowDiagonals))->ignore
+}
+
+/** Index of the tile at a world position, `-1` outside the grid. */
+let tileAt = (grid: grid, pos: Vec2.World.t): int => {
+  let column = Float.toInt(Stdlib_Math.floor((pos.x - grid.originX) / grid.tileWidth))
+  let row = Float.toInt(Stdlib_Math.floor((pos.y - grid.originY) / grid.tileHeight))
+  if column < 0 || column >= grid.columns || row < 0 || row >= grid.rows {
+    -1
+  } else {
+    row * grid.columns + column
+  }
+}
+
+/** Cost of the cheapest path from a world position to the goal, infinity when there is none. */
+let distanceAt = (field: t, pos: Vec2.World.t): float => {
+  let tile = field.grid->tileAt(pos)
+  tile < 0 ? Float.Constants.positiveInfinity : field.distances->getUnsafe(tile)
+}
+
+/**
+ `directionInto(field, pos, out)` writes the unit vector from `pos` to the center of the next tile
+ towards the goal into `out`.
+ Returns `false` and leaves `out` as it is on the goal tile, outside the grid and when there is no
+ path.
+ */
+let directionInto = (field: t, pos: Vec2.World.t, out: Vec2.World.t): bool => {
+  let grid = field.grid
+  if grid.stale {
+    grid->refresh
+  }
+  let tile = grid->tileAt(pos)
+  let next = tile < 0 ? -1 : field.next->getUnsafe(tile)
+  if next < 0 {
+    false
+  } else {
+    out->Vec2.World.setXY(
+      grid.originX + (Int.toFloat(mod(next, grid.columns)) + 0.5) * grid.tileWidth - pos.x,
+      grid.originY + (Int.toFloat(next / grid.columns) + 0.5) * grid.tileHeight - pos.y,
+    )
+    out->Vec2.World.unitInPlace
+    true
+  }
+}
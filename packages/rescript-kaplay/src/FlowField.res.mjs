@@ -0,0 +1,390 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vec2$Kaplay from "./Vec2.res.mjs";
+import * as Primitive_int from "@rescript/runtime/lib/es6/Primitive_int.mjs";
+import * as Stdlib_Option from "@rescript/runtime/lib/es6/Stdlib_Option.mjs";
+
+let stepColumns = [
+  1,
+  -1,
+  0,
+  0,
+  1,
+  1,
+  -1,
+  -1
+];
+
+let stepRows = [
+  0,
+  0,
+  1,
+  -1,
+  1,
+  -1,
+  1,
+  -1
+];
+
+function stepLength(direction) {
+  if (direction < 4) {
+    return 1;
+  } else {
+    return Math.SQRT2;
+  }
+}
+
+function directionCount(field) {
+  if (field.allowDiagonals) {
+    return 8;
+  } else {
+    return 4;
+  }
+}
+
+function fieldKey(goal, allowDiagonals) {
+  return (goal << 1) + (
+    allowDiagonals ? 1 : 0
+  ) | 0;
+}
+
+function neighbour(grid, tile, direction) {
+  let stepColumn = stepColumns[direction];
+  let stepRow = stepRows[direction];
+  let column = Primitive_int.mod_(tile, grid.columns) + stepColumn | 0;
+  let row = Primitive_int.div(tile, grid.columns) + stepRow | 0;
+  if (column < 0 || column >= grid.columns || row < 0 || row >= grid.rows) {
+    return -1;
+  }
+  let other = Math.imul(row, grid.columns) + column | 0;
+  if (grid.costs[other] === -1 || direction >= 4 && (grid.costs[tile + stepColumn | 0] === -1 || grid.costs[tile + Math.imul(stepRow, grid.columns) | 0] === -1)) {
+    return -1;
+  } else {
+    return other;
+  }
+}
+
+function push(field, tile, distance) {
+  let position = field.heapTiles.length;
+  field.heapTiles.push(tile);
+  field.heapDistances.push(distance);
+  while (position > 0 && field.heapDistances[(position - 1 | 0) / 2 | 0] > distance) {
+    let parent = (position - 1 | 0) / 2 | 0;
+    field.heapTiles[position] = field.heapTiles[parent];
+    field.heapDistances[position] = field.heapDistances[parent];
+    position = parent;
+  };
+  field.heapTiles[position] = tile;
+  field.heapDistances[position] = distance;
+}
+
+function pop(field) {
+  let last = field.heapTiles.length - 1 | 0;
+  let tile = field.heapTiles[last];
+  let distance = field.heapDistances[last];
+  field.heapTiles.length = last;
+  field.heapDistances.length = last;
+  let position = 0;
+  let sifting = last > 0;
+  while (sifting) {
+    let left = (position << 1) + 1 | 0;
+    let right = left + 1 | 0;
+    let smallest = right < last && field.heapDistances[right] < field.heapDistances[left] ? right : left;
+    if (smallest < last && field.heapDistances[smallest] < distance) {
+      field.heapTiles[position] = field.heapTiles[smallest];
+      field.heapDistances[position] = field.heapDistances[smallest];
+      position = smallest;
+    } else {
+      sifting = false;
+    }
+  };
+  if (last > 0) {
+    field.heapTiles[position] = tile;
+    field.heapDistances[position] = distance;
+    return;
+  }
+}
+
+function run(field) {
+  let grid = field.grid;
+  while (field.heapTiles.length > 0) {
+    let tile = field.heapTiles[0];
+    let distance = field.heapDistances[0];
+    pop(field);
+    if (distance === field.distances[tile]) {
+      let cost = grid.costs[tile];
+      for (let direction = 0, direction_finish = directionCount(field); direction < direction_finish; ++direction) {
+        let other = neighbour(grid, tile, direction);
+        if (other >= 0) {
+          let candidate = distance + cost * stepLength(direction);
+          if (candidate < field.distances[other]) {
+            field.distances[other] = candidate;
+            field.next[other] = tile;
+            push(field, other, candidate);
+          }
+        }
+      }
+    }
+  };
+}
+
+function compute(field) {
+  field.distances.fill(Number.POSITIVE_INFINITY);
+  field.next.fill(-1);
+  if (field.grid.costs[field.goal] !== -1) {
+    field.distances[field.goal] = 0;
+    push(field, field.goal, 0);
+    run(field);
+    return;
+  }
+}
+
+function improveFromNeighbours(field, tile) {
+  let grid = field.grid;
+  for (let direction = 0, direction_finish = directionCount(field); direction < direction_finish; ++direction) {
+    let other = neighbour(grid, tile, direction);
+    if (other >= 0) {
+      let candidate = field.distances[other] + grid.costs[other] * stepLength(direction);
+      if (candidate < field.distances[tile]) {
+        field.distances[tile] = candidate;
+        field.next[tile] = other;
+      }
+    }
+  }
+}
+
+function invalidateThrough(field, tile) {
+  let grid = field.grid;
+  let invalidated = field.invalidated;
+  invalidated.push(tile);
+  let position = 0;
+  while (position < invalidated.length) {
+    let through = invalidated[position];
+    for (let direction = 0, direction_finish = directionCount(field); direction < direction_finish; ++direction) {
+      let other = neighbour(grid, through, direction);
+      if (other >= 0 && field.next[other] === through) {
+        field.distances[other] = Number.POSITIVE_INFINITY;
+        field.next[other] = -1;
+        invalidated.push(other);
+      }
+    }
+    position = position + 1 | 0;
+  };
+}
+
+function repair(field, tile, previous) {
+  let grid = field.grid;
+  let cost = grid.costs[tile];
+  if (tile === field.goal || field.allowDiagonals && (cost === -1) !== (previous === -1)) {
+    return compute(field);
+  }
+  if (cost === -1 || previous !== -1 && cost > previous) {
+    if (cost === -1) {
+      field.distances[tile] = Number.POSITIVE_INFINITY;
+      field.next[tile] = -1;
+    }
+    invalidateThrough(field, tile);
+    field.invalidated.forEach(invalidated => {
+      if (grid.costs[invalidated] === -1) {
+        return;
+      }
+      improveFromNeighbours(field, invalidated);
+      let distance = field.distances[invalidated];
+      if (distance < Number.POSITIVE_INFINITY) {
+        return push(field, invalidated, distance);
+      }
+    });
+    field.invalidated.length = 0;
+    return run(field);
+  }
+  if (previous === -1) {
+    improveFromNeighbours(field, tile);
+  }
+  let distance = field.distances[tile];
+  if (distance < Number.POSITIVE_INFINITY) {
+    push(field, tile, distance);
+    return run(field);
+  }
+}
+
+function setCostAt(grid, tile, cost) {
+  let previous = grid.costs[tile];
+  if (cost !== previous) {
+    grid.costs[tile] = cost;
+    grid.fields.forEach(field => repair(field, tile, previous));
+    return;
+  }
+}
+
+function indexOf(grid, tile) {
+  return Math.imul(tile.y | 0, grid.columns) + (tile.x | 0) | 0;
+}
+
+function setCost(grid, tile, cost) {
+  setCostAt(grid, indexOf(grid, tile), cost);
+}
+
+function tileCost(objects) {
+  return objects.reduce((cost, gameObj) => {
+    if (cost === -1 || gameObj.isObstacle === true) {
+      return -1;
+    } else {
+      return cost + Stdlib_Option.getOr(gameObj.cost, 0) | 0;
+    }
+  }, 1);
+}
+
+function refresh(grid) {
+  grid.stale = false;
+  let match = grid.source;
+  if (match === undefined) {
+    return;
+  }
+  let tilePos = match.tilePos;
+  let level = match.level;
+  let origin = level.worldPos();
+  grid.originX = origin.x;
+  grid.originY = origin.y;
+  for (let row = 0, row_finish = grid.rows; row < row_finish; ++row) {
+    for (let column = 0, column_finish = grid.columns; column < column_finish; ++column) {
+      Vec2$Kaplay.Tile.setXY(tilePos, column, row);
+      let cost = tileCost(level.getAt(tilePos));
+      setCostAt(grid, Math.imul(row, grid.columns) + column | 0, cost);
+    }
+  }
+}
+
+function make(columns, rows, tileWidth, tileHeight, source) {
+  let grid = {
+    columns: columns,
+    rows: rows,
+    tileWidth: tileWidth,
+    tileHeight: tileHeight,
+    originX: 0,
+    originY: 0,
+    costs: new Int32Array(Math.imul(columns, rows)),
+    fields: new Map(),
+    source: source,
+    stale: false
+  };
+  grid.costs.fill(1);
+  return grid;
+}
+
+let grids = new WeakMap();
+
+function forLevel(k, level) {
+  let grid = grids.get(level);
+  if (grid !== undefined) {
+    return grid;
+  }
+  let grid$1 = make(level.numColumns(), level.numRows(), level.tileWidth(), level.tileHeight(), {
+    k: k,
+    level: level,
+    tilePos: k.vec2(0, 0)
+  });
+  refresh(grid$1);
+  level.onNavigationMapInvalid(() => {
+    grid$1.stale = true;
+  });
+  grids.set(level, grid$1);
+  return grid$1;
+}
+
+function toGoal(grid, goal, allowDiagonalsOpt) {
+  let allowDiagonals = allowDiagonalsOpt !== undefined ? allowDiagonalsOpt : false;
+  if (grid.stale) {
+    refresh(grid);
+  }
+  let goal$1 = indexOf(grid, goal);
+  let key = fieldKey(goal$1, allowDiagonals);
+  let field = grid.fields.get(key);
+  if (field !== undefined) {
+    return field;
+  }
+  let field$1 = {
+    grid: grid,
+    goal: goal$1,
+    allowDiagonals: allowDiagonals,
+    distances: new Float64Array(Math.imul(grid.columns, grid.rows)),
+    next: new Int32Array(Math.imul(grid.columns, grid.rows)),
+    heapTiles: [],
+    heapDistances: [],
+    invalidated: []
+  };
+  compute(field$1);
+  grid.fields.set(key, field$1);
+  return field$1;
+}
+
+function release(field) {
+  field.grid.fields.delete(fieldKey(field.goal, field.allowDiagonals));
+}
+
+function tileAt(grid, pos) {
+  let column = Math.floor((pos.x - grid.originX) / grid.tileWidth) | 0;
+  let row = Math.floor((pos.y - grid.originY) / grid.tileHeight) | 0;
+  if (column < 0 || column >= grid.columns || row < 0 || row >= grid.rows) {
+    return -1;
+  } else {
+    return Math.imul(row, grid.columns) + column | 0;
+  }
+}
+
+function distanceAt(field, pos) {
+  let tile = tileAt(field.grid, pos);
+  if (tile < 0) {
+    return Number.POSITIVE_INFINITY;
+  } else {
+    return field.distances[tile];
+  }
+}
+
+function directionInto(field, pos, out) {
+  let grid = field.grid;
+  if (grid.stale) {
+    refresh(grid);
+  }
+  let tile = tileAt(grid, pos);
+  let next = tile < 0 ? -1 : field.next[tile];
+  if (next < 0) {
+    return false;
+  } else {
+    Vec2$Kaplay.World.setXY(out, grid.originX + (Primitive_int.mod_(next, grid.columns) + 0.5) * grid.tileWidth - pos.x, grid.originY + (Primitive_int.div(next, grid.columns) + 0.5) * grid.tileHeight - pos.y);
+    Vec2$Kaplay.World.unitInPlace(out);
+    return true;
+  }
+}
+
+let blocked = -1;
+
+export {
+  blocked,
+  stepColumns,
+  stepRows,
+  stepLength,
+  directionCount,
+  fieldKey,
+  neighbour,
+  push,
+  pop,
+  run,
+  compute,
+  improveFromNeighbours,
+  invalidateThrough,
+  repair,
+  setCostAt,
+  indexOf,
+  setCost,
+  tileCost,
+  refresh,
+  make,
+  grids,
+  forLevel,
+  toGoal,
+  release,
+  tileAt,
+  distanceAt,
+  directionInto,
+}
+/* grids Not a pure module */
@@ -1,4 +1,4 @@
-type t
+type t = {mutable paused: bool}
 
 @send
 external cancel: t => unit = "cancel"
@@ -0,0 +1,161 @@
+/***
+ Pools of game objects that are reused instead of being added and destroyed over and over.
+
+ Projectiles and other short-lived objects are usually added with fresh components and event
+ handlers, and destroyed a moment later. A pool adds a fixed number of objects up front, hidden
+ and paused, and hands them out with `acquire`. When an object is done it goes back with `release`
+ instead of `destroy`.
+
+ - `init` runs on every `acquire` and resets the components of the object for its next use. It gets
+   the argument passed to `acquire`, like the position to fire a bullet from.
+ - `listen` runs once per object and registers its event handlers, it gets the pool to release the
+   object from a handler. The controllers are paused while the object is in the pool and resumed on
+   `acquire`, so the handlers never have to be registered again.
+
+ ## Examples
+
+ ```rescript
+ module Bullet = {
+   type t = {mutable velocity: Vec2.World.t}
+
+   include GameObjRaw.Comp({type t = t})
+   include Pos.Comp({type t = t})
+   include Area.Comp({type t = t})
+
+   external initialState: t => Types.comp = "%identity"
+
+   let pool = Pool.make(
+     k,
+     ~size=64,
+     ~components=() => [
+       k->addPos(0., 0.),
+       k->addArea,
+       initialState({velocity: k->Context.vec2World(0., 0.)}),
+     ],
+     ~listen=(pool, bullet) => [
+       bullet->onUpdateWithController(() => bullet->move(bullet.velocity)),
+       bullet->onCollideWithController("enemy", (_, _) => pool->Pool.release(bullet)),
+     ],
+     ~init=(bullet, (origin: Vec2.World.t, velocity: Vec2.World.t)) => {
+       bullet->setWorldPos(origin)
+       bullet.velocity->Vec2.World.copyInto(velocity)
+     },
+   )
+ }
+
+ let bullet = Bullet.pool->Pool.acquire((gun->worldPos, k->Context.vec2World(0., -300.)))
+ ```
+ */
+
+type entry = {
+  controllers: array<KEventController.t>,
+  mutable inUse: bool,
+}
+
+type t<'gameObj, 'arg> = {
+  k: Context.t,
+  components: unit => array<Types.comp>,
+  listen: (t<'gameObj, 'arg>, 'gameObj) => array<KEventController.t>,
+  init: ('gameObj, 'arg) => unit,
+  /** Objects that can be acquired, the last one is handed out first. */
+  available: array<'gameObj>,
+  entries: WeakMap.t<'gameObj, entry>,
+}
+
+@set
+external setHidden: ('gameObj, bool) => unit = "hidden"
+
+@set
+external setPaused: ('gameObj, bool) => unit = "paused"
+
+@send
+external exists: 'gameObj => bool = "exists"
+
+let setControllersPaused = (controllers: array<KEventController.t>, paused: bool) => {
+  for i in 0 to controllers->Array.length - 1 {
+    (controllers->Array.getUnsafe(i)).paused = paused
+  }
+}
+
+/** Adds a new object to the scene, hidden and paused until it is acquired. */
+let spawn = (pool: t<'gameObj, 'arg>): 'gameObj => {
+  let gameObj: 'gameObj = pool.k->Context.add(pool.components())
+  gameObj->setHidden(true)
+  gameObj->setPaused(true)
+  let controllers = pool.listen(pool, gameObj)
+  setControllersPaused(controllers, true)
+  pool.entries->WeakMap.set(gameObj, {controllers, inUse: false})->ignore
+  gameObj
+}
+
+/**
+ `make(k, ~size, ~components, ~listen, ~init)` creates a pool and adds `size` objects made of `components()` to the scene.
+ */
+let make = (
+  k: Context.t,
+  ~size: int,
+  ~components: unit => array<Types.comp>,
+  ~listen: (t<'gameObj, 'arg>, 'gameObj) => array<KEventController.t>=(_, _) => [],
+  ~init: ('gameObj, 'arg) => unit,
+): t<'gameObj, 'arg> => {
+  let pool = {
+    k,
+    components,
+    listen,
+    init,
+    available: [],
+    entries: WeakMap.make(),
+  }
+  for _ in 1 to size {
+    pool.available->Array.push(spawn(pool))
+  }
+  pool
+}
+
+let rec takeAvailable = (pool: t<'gameObj, 'arg>): 'gameObj => {
+  switch pool.available->Array.pop {
+  | Some(gameObj) if gameObj->exists => gameObj
+  | Some(_) => takeAvailable(pool)
+  | None => spawn(pool)
+  }
+}
+
+/**
+ `acquire(pool, arg)` takes an object out of the pool, runs `init` with `arg` on it and makes it visible and active.
+ When every object is in use, a new one is added to the scene and the pool grows.
+ Objects destroyed by a scene change are dropped and replaced the same way.
+ */
+let acquire = (pool: t<'gameObj, 'arg>, arg: 'arg): 'gameObj => {
+  let gameObj = takeAvailable(pool)
+  pool.init(gameObj, arg)
+  gameObj->setHidden(false)
+  gameObj->setPaused(false)
+  switch pool.entries->WeakMap.get(gameObj) {
+  | Some(entry) => {
+      setControllersPaused(entry.controllers, false)
+      entry.inUse = true
+    }
+  | None => ()
+  }
+  gameObj
+}
+
+/**
+ `release(pool, gameObj)` hides and pauses the object and puts it back in the pool.
+ Releasing an object that is already in the pool or that doesn't belong to it does nothing.
+ */
+let release = (pool: t<'gameObj, 'arg>, gameObj: 'gameObj): unit => {
+  switch pool.entries->WeakMap.get(gameObj) {
+  | Some(entry) if entry.inUse => {
+      entry.inUse = false
+      setControllersPaused(entry.controllers, true)
+      gameObj->setHidden(true)
+      gameObj->setPaused(true)
+      pool.available->Array.push(gameObj)
+    }
+  | _ => ()
+  }
+}
+
+/** Number of objects that can be acquired without adding a new one to the scene. */
+let availableCount = (pool: t<'gameObj, 'arg>): int => pool.available->Array.length
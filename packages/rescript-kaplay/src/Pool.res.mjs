@@ -0,0 +1,94 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Primitive_option from "@rescript/runtime/lib/es6/Primitive_option.mjs";
+
+function setControllersPaused(controllers, paused) {
+  for (let i = 0, i_finish = controllers.length; i < i_finish; ++i) {
+    controllers[i].paused = paused;
+  }
+}
+
+function spawn(pool) {
+  let gameObj = pool.k.add(pool.components());
+  gameObj.hidden = true;
+  gameObj.paused = true;
+  let controllers = pool.listen(pool, gameObj);
+  setControllersPaused(controllers, true);
+  pool.entries.set(gameObj, {
+    controllers: controllers,
+    inUse: false
+  });
+  return gameObj;
+}
+
+function make(k, size, components, listenOpt, init) {
+  let listen = listenOpt !== undefined ? listenOpt : (param, param$1) => [];
+  let pool = {
+    k: k,
+    components: components,
+    listen: listen,
+    init: init,
+    available: [],
+    entries: new WeakMap()
+  };
+  for (let _for = 1; _for <= size; ++_for) {
+    pool.available.push(spawn(pool));
+  }
+  return pool;
+}
+
+function takeAvailable(pool) {
+  while (true) {
+    let gameObj = pool.available.pop();
+    if (gameObj === undefined) {
+      return spawn(pool);
+    }
+    let gameObj$1 = Primitive_option.valFromOption(gameObj);
+    if (gameObj$1.exists()) {
+      return gameObj$1;
+    }
+    continue;
+  };
+}
+
+function acquire(pool, arg) {
+  let gameObj = takeAvailable(pool);
+  pool.init(gameObj, arg);
+  gameObj.hidden = false;
+  gameObj.paused = false;
+  let entry = pool.entries.get(gameObj);
+  if (entry !== undefined) {
+    setControllersPaused(entry.controllers, false);
+    entry.inUse = true;
+    return gameObj;
+  } else {
+    return gameObj;
+  }
+}
+
+function release(pool, gameObj) {
+  let entry = pool.entries.get(gameObj);
+  if (entry !== undefined && entry.inUse) {
+    entry.inUse = false;
+    setControllersPaused(entry.controllers, true);
+    gameObj.hidden = true;
+    gameObj.paused = true;
+    pool.available.push(gameObj);
+    return;
+  }
+}
+
+function availableCount(pool) {
+  return pool.available.length;
+}
+
+export {
+  setControllersPaused,
+  spawn,
+  make,
+  takeAvailable,
+  acquire,
+  release,
+  availableCount,
+}
+/* No side effect */
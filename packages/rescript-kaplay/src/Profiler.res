@@ -0,0 +1,267 @@
+/***
+ Opt-in instrumentation for a Kaplay context: how long the `onUpdate` handlers take per frame, and
+ a trace of timed spans that can be opened in Chrome's performance panel or Perfetto.
+
+ Only the handlers wrapped with `measureUpdate` are measured, and only between `start` and `stop`.
+ Handlers can be wrapped before the profiler starts, while it is stopped they only check a flag.
+
+ Other code can add its own spans with `record`, see `RuleSystem.startProfiling`.
+
+ ## Examples
+
+ ```rescript
+ let profiler = Profiler.forContext(k)
+ player->onUpdate(profiler->Profiler.measureUpdate(~name="movePlayer", () => movePlayer(player)))
+ profiler->Profiler.start
+
+ // Later, in a debug overlay
+ let p95 = profiler.updates->Profiler.percentile(0.95)
+ k->Context.onKeyPress(key =>
+   if key == Types.T {
+     profiler->Profiler.downloadChromeTrace
+   }
+ )
+ ```
+ */
+
+@val @scope("performance")
+external now: unit => float = "now"
+
+@get_index external getUnsafe: (Float64Array.t, int) => float = ""
+@set_index external setUnsafe: (Float64Array.t, int, float) => unit = ""
+
+/** A complete ("X") event of the Chrome trace event format, times are in microseconds. */
+type traceEvent = {
+  name: string,
+  cat: string,
+  ph: string,
+  ts: float,
+  dur: float,
+  pid: int,
+  tid: int,
+}
+
+type chromeTrace = {
+  traceEvents: array<traceEvent>,
+  displayTimeUnit: string,
+}
+
+/** Rolling histogram of the last `window` samples, in milliseconds. */
+type histogram = {
+  /** Width of a bucket, the last bucket also holds every slower sample. */
+  bucketMs: float,
+  counts: array<int>,
+  samples: Float64Array.t,
+  /** Index in `samples` that is overwritten next. */
+  mutable next: int,
+  /** Number of samples in the window. */
+  mutable size: int,
+}
+
+type t = {
+  k: Context.t,
+  mutable enabled: bool,
+  /** Total time spent in measured `onUpdate` handlers per frame. */
+  updates: histogram,
+  /** The frame `frameUpdateMs` belongs to. */
+  mutable frame: int,
+  mutable frameUpdateMs: float,
+  /** Ring buffer of trace events, the oldest event is overwritten first. */
+  events: array<traceEvent>,
+  maxEvents: int,
+  mutable nextEvent: int,
+}
+
+external traceToJson: chromeTrace => JSON.t = "%identity"
+
+let makeHistogram = (~window: int, ~bucketMs: float, ~buckets: int): histogram => {
+  bucketMs,
+  counts: Array.make(~length=buckets, 0),
+  samples: Float64Array.fromLength(window),
+  next: 0,
+  size: 0,
+}
+
+let bucketOf = (histogram: histogram, ms: float): int =>
+  Stdlib_Math.Int.min(
+    histogram.counts->Array.length - 1,
+    Float.toInt(Stdlib_Math.floor(ms / histogram.bucketMs)),
+  )
+
+/** Adds a sample, dropping the oldest one when the window is full. */
+let addSample = (histogram: histogram, ms: float): unit => {
+  let window = histogram.samples->TypedArray.length
+  if histogram.size == window {
+    let oldest = bucketOf(histogram, histogram.samples->getUnsafe(histogram.next))
+    histogram.counts->Array.setUnsafe(oldest, histogram.counts->Array.getUnsafe(oldest) - 1)
+  } else {
+    histogram.size = histogram.size + 1
+  }
+  let bucket = bucketOf(histogram, ms)
+  histogram.counts->Array.setUnsafe(bucket, histogram.counts->Array.getUnsafe(bucket) + 1)
+  histogram.samples->setUnsafe(histogram.next, ms)
+  histogram.next = mod(histogram.next + 1, window)
+}
+
+/**
+ `percentile(histogram, p)` returns the upper edge of the bucket that holds the `p` percentile, `p` is between 0 and 1.
+ Returns `0.` for an empty histogram.
+ */
+let percentile = (histogram: histogram, p: float): float => {
+  let target = Stdlib_Math.ceil(p * Int.toFloat(histogram.size))
+  let seen = ref(0)
+  let bucket = ref(0)
+  while (
+    bucket.contents < histogram.counts->Array.length - 1 &&
+      Int.toFloat(seen.contents + histogram.counts->Array.getUnsafe(bucket.contents)) < target
+  ) {
+    seen := seen.contents + histogram.counts->Array.getUnsafe(bucket.contents)
+    bucket := bucket.contents + 1
+  }
+  histogram.size == 0 ? 0. : Int.toFloat(bucket.contents + 1) * histogram.bucketMs
+}
+
+/** The slowest sample in the window. */
+let maxSample = (histogram: histogram): float => {
+  let max = ref(0.)
+  for index in 0 to histogram.size - 1 {
+    max := Stdlib_Math.max(max.contents, histogram.samples->getUnsafe(index))
+  }
+  max.contents
+}
+
+/**
+ `make(k, ~window, ~bucketMs, ~buckets, ~maxEvents)` creates a stopped profiler.
+ The update histogram keeps the last `window` frames, the trace the last `maxEvents` spans.
+ */
+let make = (
+  k: Context.t,
+  ~window: int=240,
+  ~bucketMs: float=1.,
+  ~buckets: int=34,
+  ~maxEvents: int=100_000,
+): t => {
+  k,
+  enabled: false,
+  updates: makeHistogram(~window, ~bucketMs, ~buckets),
+  frame: -1,
+  frameUpdateMs: 0.,
+  events: [],
+  maxEvents,
+  nextEvent: 0,
+}
+
+let profilers: WeakMap.t<Context.t, t> = WeakMap.make()
+
+/** The profiler shared by everything in the context. */
+let forContext = (k: Context.t): t => {
+  switch profilers->WeakMap.get(k) {
+  | Some(profiler) => profiler
+  | None => {
+      let profiler = make(k)
+      profilers->WeakMap.set(k, profiler)->ignore
+      profiler
+    }
+  }
+}
+
+/**
+ `record(profiler, ~name, ~category, ~start, ~duration)` adds a span to the trace, times are in milliseconds from `now()`.
+ Does nothing when the profiler is stopped.
+ */
+let record = (profiler: t, ~name: string, ~category: string, ~start: float, ~duration: float) => {
+  if profiler.enabled {
+    let event = {
+      name,
+      cat: category,
+      ph: "X",
+      ts: start * 1000.,
+      dur: duration * 1000.,
+      pid: 1,
+      tid: 1,
+    }
+    if profiler.events->Array.length < profiler.maxEvents {
+      profiler.events->Array.push(event)
+    } else {
+      profiler.events->Array.setUnsafe(profiler.nextEvent, event)
+    }
+    profiler.nextEvent = mod(profiler.nextEvent + 1, profiler.maxEvents)
+  }
+}
+
+/** Adds the time of one handler to the current frame, the previous frame goes into the histogram. */
+let addUpdateTime = (profiler: t, ms: float) => {
+  let frame = profiler.k.debug->Debug.numFrames
+  if frame != profiler.frame {
+    if profiler.frame >= 0 {
+      profiler.updates->addSample(profiler.frameUpdateMs)
+    }
+    profiler.frame = frame
+    profiler.frameUpdateMs = 0.
+  }
+  profiler.frameUpdateMs = profiler.frameUpdateMs + ms
+}
+
+/**
+ `measureUpdate(profiler, ~name, action)` wraps an `onUpdate` handler so it is measured while the profiler runs.
+ Its time goes into the update histogram and a span named `name` into the trace.
+ */
+let measureUpdate = (profiler: t, ~name: string="onUpdate", action: unit => unit): (unit => unit) =>
+  () =>
+    if profiler.enabled {
+      let start = now()
+      action()
+      let duration = now() - start
+      profiler->addUpdateTime(duration)
+      profiler->record(~name, ~category="update", ~start, ~duration)
+    } else {
+      action()
+    }
+
+/** Starts measuring the wrapped handlers. */
+let start = (profiler: t) => {
+  profiler.enabled = true
+}
+
+/** Stops measuring, the wrapped handlers only check a flag. The data collected so far is kept. */
+let stop = (profiler: t) => {
+  profiler.enabled = false
+}
+
+/** Clears the histogram and the trace. */
+let clear = (profiler: t) => {
+  profiler.updates.counts->Array.fill(0)
+  profiler.updates.next = 0
+  profiler.updates.size = 0
+  profiler.frame = -1
+  profiler.frameUpdateMs = 0.
+  profiler.events->Array.splice(~start=0, ~remove=profiler.events->Array.length, ~insert=[])
+  profiler.nextEvent = 0
+}
+
+/** The recorded spans in the Chrome trace event format, oldest first. */
+let chromeTrace = (profiler: t): JSON.t => {
+  let traceEvents =
+    profiler.events->Array.length < profiler.maxEvents
+      ? profiler.events->Array.copy
+      : profiler.events
+        ->Array.slice(~start=profiler.nextEvent)
+        ->Array.concat(profiler.events->Array.slice(~start=0, ~end=profiler.nextEvent))
+  traceToJson({traceEvents, displayTimeUnit: "ms"})
+}
+
+let download: (string, string) => unit = %raw(`
+  function (fileName, text) {
+    const url = URL.createObjectURL(new Blob([text], { type: "application/json" }));
+    const anchor = document.createElement("a");
+    anchor.href = url;
+    anchor.download = fileName;
+    anchor.click();
+    URL.revokeObjectURL(url);
+  }
+`)
+
+/** Saves `chromeTrace` as a JSON file from the browser, open it in Chrome's performance panel. */
+let downloadChromeTrace = (profiler: t, ~fileName: string="trace.json") => {
+  download(fileName, profiler->chromeTrace->JSON.stringify)
+}
@@ -0,0 +1,192 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Stdlib_Array from "@rescript/runtime/lib/es6/Stdlib_Array.mjs";
+import * as Primitive_int from "@rescript/runtime/lib/es6/Primitive_int.mjs";
+
+function makeHistogram(window, bucketMs, buckets) {
+  return {
+    bucketMs: bucketMs,
+    counts: Stdlib_Array.make(buckets, 0),
+    samples: new Float64Array(window),
+    next: 0,
+    size: 0
+  };
+}
+
+function bucketOf(histogram, ms) {
+  return Math.min(histogram.counts.length - 1 | 0, Math.floor(ms / histogram.bucketMs) | 0);
+}
+
+function addSample(histogram, ms) {
+  let window = histogram.samples.length;
+  if (histogram.size === window) {
+    let oldest = bucketOf(histogram, histogram.samples[histogram.next]);
+    histogram.counts[oldest] = histogram.counts[oldest] - 1 | 0;
+  } else {
+    histogram.size = histogram.size + 1 | 0;
+  }
+  let bucket = bucketOf(histogram, ms);
+  histogram.counts[bucket] = histogram.counts[bucket] + 1 | 0;
+  histogram.samples[histogram.next] = ms;
+  histogram.next = Primitive_int.mod_(histogram.next + 1 | 0, window);
+}
+
+function percentile(histogram, p) {
+  let target = Math.ceil(p * histogram.size);
+  let seen = 0;
+  let bucket = 0;
+  while (bucket < (histogram.counts.length - 1 | 0) && (seen + histogram.counts[bucket] | 0) < target) {
+    seen = seen + histogram.counts[bucket] | 0;
+    bucket = bucket + 1 | 0;
+  };
+  if (histogram.size === 0) {
+    return 0;
+  } else {
+    return (bucket + 1 | 0) * histogram.bucketMs;
+  }
+}
+
+function maxSample(histogram) {
+  let max = 0;
+  for (let index = 0, index_finish = histogram.size; index < index_finish; ++index) {
+    max = Math.max(max, histogram.samples[index]);
+  }
+  return max;
+}
+
+function make(k, windowOpt, bucketMsOpt, bucketsOpt, maxEventsOpt) {
+  let window = windowOpt !== undefined ? windowOpt : 240;
+  let bucketMs = bucketMsOpt !== undefined ? bucketMsOpt : 1;
+  let buckets = bucketsOpt !== undefined ? bucketsOpt : 34;
+  let maxEvents = maxEventsOpt !== undefined ? maxEventsOpt : 100000;
+  return {
+    k: k,
+    enabled: false,
+    updates: makeHistogram(window, bucketMs, buckets),
+    frame: -1,
+    frameUpdateMs: 0,
+    events: [],
+    maxEvents: maxEvents,
+    nextEvent: 0
+  };
+}
+
+let profilers = new WeakMap();
+
+function forContext(k) {
+  let profiler = profilers.get(k);
+  if (profiler !== undefined) {
+    return profiler;
+  }
+  let profiler$1 = make(k, undefined, undefined, undefined, undefined);
+  profilers.set(k, profiler$1);
+  return profiler$1;
+}
+
+function record(profiler, name, category, start, duration) {
+  if (!profiler.enabled) {
+    return;
+  }
+  let event = {
+    name: name,
+    cat: category,
+    ph: "X",
+    ts: start * 1000,
+    dur: duration * 1000,
+    pid: 1,
+    tid: 1
+  };
+  if (profiler.events.length < profiler.maxEvents) {
+    profiler.events.push(event);
+  } else {
+    profiler.events[profiler.nextEvent] = event;
+  }
+  profiler.nextEvent = Primitive_int.mod_(profiler.nextEvent + 1 | 0, profiler.maxEvents);
+}
+
+function addUpdateTime(profiler, ms) {
+  let frame = profiler.k.debug.numFrames();
+  if (frame !== profiler.frame) {
+    if (profiler.frame >= 0) {
+      addSample(profiler.updates, profiler.frameUpdateMs);
+    }
+    profiler.frame = frame;
+    profiler.frameUpdateMs = 0;
+  }
+  profiler.frameUpdateMs = profiler.frameUpdateMs + ms;
+}
+
+function measureUpdate(profiler, nameOpt, action) {
+  let name = nameOpt !== undefined ? nameOpt : "onUpdate";
+  return () => {
+    if (!profiler.enabled) {
+      return action();
+    }
+    let start = performance.now();
+    action();
+    let duration = performance.now() - start;
+    addUpdateTime(profiler, duration);
+    record(profiler, name, "update", start, duration);
+  };
+}
+
+function start(profiler) {
+  profiler.enabled = true;
+}
+
+function stop(profiler) {
+  profiler.enabled = false;
+}
+
+function clear(profiler) {
+  profiler.updates.counts.fill(0);
+  profiler.updates.next = 0;
+  profiler.updates.size = 0;
+  profiler.frame = -1;
+  profiler.frameUpdateMs = 0;
+  profiler.events.splice(0, profiler.events.length);
+  profiler.nextEvent = 0;
+}
+
+function chromeTrace(profiler) {
+  let traceEvents = profiler.events.length < profiler.maxEvents ? profiler.events.slice() : profiler.events.slice(profiler.nextEvent).concat(profiler.events.slice(0, profiler.nextEvent));
+  return {
+    traceEvents: traceEvents,
+    displayTimeUnit: "ms"
+  };
+}
+
+let download = (function (fileName, text) {
+    const url = URL.createObjectURL(new Blob([text], { type: "application/json" }));
+    const anchor = document.createElement("a");
+    anchor.href = url;
+    anchor.download = fileName;
+    anchor.click();
+    URL.revokeObjectURL(url);
+  });
+
+function downloadChromeTrace(profiler, fileNameOpt) {
+  let fileName = fileNameOpt !== undefined ? fileNameOpt : "trace.json";
+  download(fileName, JSON.stringify(chromeTrace(profiler)));
+}
+
+export {
+  makeHistogram,
+  bucketOf,
+  addSample,
+  percentile,
+  maxSample,
+  make,
+  profilers,
+  forContext,
+  record,
+  addUpdateTime,
+  measureUpdate,
+  start,
+  stop,
+  clear,
+  chromeTrace,
+  download,
+  downloadChromeTrace,
+}
+/* profilers Not a pure module */
@@ -50,6 +50,10 @@ type salience = Salience(float)
  * - **`agenda`**: Array of all rules in the system, sorted by salience during execution
  * - **`state`**: Free-form state object where you can store any game state
  * - **`facts`**: Map of facts to their current grades
+ *
+ * Use `make` for Kaplay's implementation or `makeCompiled` for the ReScript engine.
+ * Both expose the same fields and work with every function in this module that takes a `t`,
+ * a compiled rule system is passed to them with `toRuleSystem`.
  */
 type rec t<'state> = {
   //
@@ -80,6 +84,7 @@ and predicate<'state> = t<'state> => bool
  */
 and action<'state> = t<'state> => unit
 
+/** Creates a rule system backed by Kaplay's `RuleSystem` class. */
 let make: Context.t => t<'state> = %raw(`function (k) { return new k.RuleSystem(); }`)
 
 module Rule = {
@@ -211,3 +216,865 @@ external maximumGradeForFacts: (t<'state>, array<fact>) => grade = "maximumGrade
  */
 @send
 external reset: t<'state> => unit = "reset"
+
+/**
+ * A fact whose grade differs between the last two `execute` cycles.
+ */
+type factChange = {
+  fact: fact,
+  /** The grade at the end of the previous cycle. */
+  previous: grade,
+  /** The grade at the end of the latest cycle. */
+  current: grade,
+}
+
+/**
+ * Where one rule spent its time while profiling, see `profile`.
+ */
+type ruleProfile = {
+  /** Position of the rule in the agenda, rules run in this order. */
+  index: int,
+  salience: salience,
+  /** Number of times the predicate ran. */
+  evaluations: int,
+  /** Number of times the predicate was true and the action ran. */
+  hits: int,
+  /** Number of times a derived rule was skipped and the facts of its last run were replayed. */
+  replays: int,
+  predicateMs: float,
+  actionMs: float,
+}
+
+/**
+ * How often a fact was written while profiling, replayed writes of derived rules included.
+ */
+type factProfile = {
+  fact: fact,
+  asserts: int,
+  retracts: int,
+}
+
+type profile = {
+  /** Number of `execute` cycles since `startProfiling`. */
+  executions: int,
+  /** Total time spent in those `execute` cycles. */
+  executeMs: float,
+  /** Every rule, in agenda order. */
+  rules: array<ruleProfile>,
+  /** Facts that were asserted or retracted at least once. */
+  facts: array<factProfile>,
+}
+
+/**
+ * A rule engine written in ReScript that follows the same protocol as Kaplay's `RuleSystem`.
+ *
+ * It is tuned for rule systems that are reset and executed every frame:
+ * - Facts are interned to integer slots the first time they are used.
+ * - Grades live in a `Float64Array` that is zeroed by `reset`, so no map entries are churned.
+ * - The agenda is kept sorted by salience when rules are added, `execute` never sorts.
+ * - Derived rules (see `addDerivedRule`) are only re-run when the facts they read changed.
+ * - Profiling (see `startProfiling`) runs a separate copy of `execute`, the regular one has no timers.
+ *
+ * `facts` is a read-only, `Map`-like view over the slots. `has`, `get`, `size`, `entries`,
+ * `keys`, `values` and `forEach` behave like they do on the `Map` used by Kaplay.
+ */
+module Compiled = {
+  @get_index external getUnsafe: (TypedArray.t<'a>, int) => 'a = ""
+  @set_index external setUnsafe: (TypedArray.t<'a>, int, 'a) => unit = ""
+  @send external fill: (TypedArray.t<'a>, 'a) => unit = "fill"
+  @send external copyFrom: (TypedArray.t<'a>, TypedArray.t<'a>) => unit = "set"
+  @set external setLength: (array<'a>, int) => unit = "length"
+
+  type rec facts = {
+    /** Number of facts asserted or retracted since the last `reset`. */
+    mutable size: int,
+    slots: Map.t<fact, int>,
+    names: array<fact>,
+    mutable grades: Float64Array.t,
+    /** `1` when the slot was asserted or retracted since the last `reset`, `0` otherwise. */
+    mutable touched: Uint8Array.t,
+    /** Grades at the end of the latest `execute`. */
+    mutable committed: Float64Array.t,
+    /** Grades at the end of the `execute` before the latest one. */
+    mutable previous: Float64Array.t,
+    has: @this ((facts, fact) => bool),
+    get: @this ((facts, fact) => option<grade>),
+    entries: @this (facts => Iterator.t<(fact, grade)>),
+    keys: @this (facts => Iterator.t<fact>),
+    values: @this (facts => Iterator.t<grade>),
+    forEach: @this ((facts, (grade, fact) => unit) => unit),
+  }
+
+  /** Grade functions that take their facts as rest arguments, see `minimumGradeForFacts`. */
+  type variadicGrade
+
+  /**
+   * Every rule in the agenda is a `compiledRule`, `evaluate` and `execute` match Kaplay's `Rule`.
+   *
+   * Derived rules remember the grades they read and the facts they wrote during their last run.
+   */
+  type rec compiledRule<'state> = {
+    predicate: predicate<'state>,
+    salience: salience,
+    action: action<'state>,
+    evaluate: @this ((compiledRule<'state>, t<'state>) => bool),
+    execute: @this ((compiledRule<'state>, t<'state>) => unit),
+    derived: bool,
+    /** `true` when the reads were passed to `addDerivedRule`, `false` when they are recorded. */
+    declaredReads: bool,
+    mutable memoized: bool,
+    reads: array<int>,
+    readGrades: array<float>,
+    writes: array<int>,
+    writeGrades: array<float>,
+    retracts: array<bool>,
+    /** Profiling counters, only updated while profiling. */
+    mutable evaluations: int,
+    mutable hits: int,
+    mutable replays: int,
+    mutable predicateMs: float,
+    mutable actionMs: float,
+  }
+
+  type profiling = {
+    mutable enabled: bool,
+    trace: option<Profiler.t>,
+    mutable executions: int,
+    mutable executeMs: float,
+    /** Number of asserts per fact slot. */
+    asserts: array<int>,
+    /** Number of retracts per fact slot. */
+    retracts: array<int>,
+  }
+
+  type rec engine<'state> = {
+    agenda: array<rule<'state>>,
+    mutable state: 'state,
+    facts: facts,
+    /** The derived rule that is currently running, its reads and writes are recorded. */
+    mutable recording: option<compiledRule<'state>>,
+    mutable profiling: option<profiling>,
+    addRule: @this ((engine<'state>, rule<'state>) => unit),
+    addRuleExecutingAction: @this (
+      (engine<'state>, predicate<'state>, action<'state>, option<salience>) => unit
+    ),
+    addRuleAssertingFact: @this ((engine<'state>, predicate<'state>, fact, option<grade>) => unit),
+    addRuleRetractingFact: @this (
+      (engine<'state>, predicate<'state>, fact, option<grade>, option<salience>) => unit
+    ),
+    addDerivedRule: @this (
+      (
+        engine<'state>,
+        predicate<'state>,
+        action<'state>,
+        option<array<fact>>,
+        option<salience>,
+      ) => unit
+    ),
+    removeAllRules: @this (engine<'state> => unit),
+    execute: @this (engine<'state> => unit),
+    assertFact: @this ((engine<'state>, fact, option<grade>) => unit),
+    retractFact: @this ((engine<'state>, fact, option<grade>) => unit),
+    gradeForFact: @this ((engine<'state>, fact) => grade),
+    minimumGradeForFacts: variadicGrade,
+    maximumGradeForFacts: variadicGrade,
+    reset: @this (engine<'state> => unit),
+    changedFacts: @this (engine<'state> => array<factChange>),
+    hasFactChanged: @this ((engine<'state>, fact) => bool),
+    startProfiling: @this ((engine<'state>, option<Profiler.t>) => unit),
+    stopProfiling: @this (engine<'state> => unit),
+    profile: @this (engine<'state> => profile),
+  }
+
+  external asRuleSystem: engine<'state> => t<'state> = "%identity"
+  external asEngine: t<'state> => engine<'state> = "%identity"
+  external asRule: compiledRule<'state> => rule<'state> = "%identity"
+  external fromRule: rule<'state> => compiledRule<'state> = "%identity"
+
+  let initialCapacity = 16
+
+  let grow = (array: Float64Array.t, capacity: int): Float64Array.t => {
+    let grown = Float64Array.fromLength(capacity)
+    grown->copyFrom(array)
+    grown
+  }
+
+  /** Returns the slot of a fact, or `-1` when the fact was never interned. */
+  let slotOf = (facts: facts, fact: fact): int => {
+    switch facts.slots->Map.get(fact) {
+    | Some(slot) => slot
+    | None => -1
+    }
+  }
+
+  /** Returns the slot of a fact, allocating a new one (and growing the storage) if needed. */
+  let intern = (facts: facts, fact: fact): int => {
+    switch facts.slots->Map.get(fact) {
+    | Some(slot) => slot
+    | None => {
+        let slot = facts.names->Array.length
+        let capacity = facts.grades->TypedArray.length
+        if slot == capacity {
+          facts.grades = grow(facts.grades, capacity * 2)
+          facts.committed = grow(facts.committed, capacity * 2)
+          facts.previous = grow(facts.previous, capacity * 2)
+          let touched = Uint8Array.fromLength(capacity * 2)
+          touched->copyFrom(facts.touched)
+          facts.touched = touched
+        }
+        facts.slots->Map.set(fact, slot)
+        facts.names->Array.push(fact)
+        slot
+      }
+    }
+  }
+
+  let isTouched = (facts: facts, slot: int): bool => slot >= 0 && facts.touched->getUnsafe(slot) == 1
+
+  let readGrade = (facts: facts, slot: int): float =>
+    isTouched(facts, slot) ? facts.grades->getUnsafe(slot) : 0.0
+
+  let writeGrade = (facts: facts, slot: int, value: float): unit => {
+    if facts.touched->getUnsafe(slot) == 0 {
+      facts.touched->setUnsafe(slot, 1)
+      facts.size = facts.size + 1
+    }
+    facts.grades->setUnsafe(slot, value)
+  }
+
+  /** `min(1.0, currentGrade + grade)`, see `assertFact`. */
+  let addToSlot = (facts: facts, slot: int, grade: float): unit =>
+    writeGrade(facts, slot, Stdlib_Math.min(1.0, readGrade(facts, slot) + grade))
+
+  /** `max(0.0, currentGrade - grade)`, see `retractFact`. */
+  let subtractFromSlot = (facts: facts, slot: int, grade: float): unit =>
+    writeGrade(facts, slot, Stdlib_Math.max(0.0, readGrade(facts, slot) - grade))
+
+  /** Copies the touched slots into a fresh `Map`, in the order the facts were interned. */
+  let snapshot = (facts: facts): Map.t<fact, grade> => {
+    let map = Map.make()
+    facts.names->Array.forEachWithIndex((fact, slot) => {
+      if isTouched(facts, slot) {
+        map->Map.set(fact, Grade(facts.grades->getUnsafe(slot)))
+      }
+    })
+    map
+  }
+
+  let has =
+    @this
+    (facts: facts, fact: fact) => isTouched(facts, slotOf(facts, fact))
+
+  let get =
+    @this
+    (facts: facts, fact: fact) => {
+      let slot = slotOf(facts, fact)
+      isTouched(facts, slot) ? Some(Grade(facts.grades->getUnsafe(slot))) : None
+    }
+
+  let entries =
+    @this
+    (facts: facts) => snapshot(facts)->Map.entries
+
+  let keys =
+    @this
+    (facts: facts) => snapshot(facts)->Map.keys
+
+  let values =
+    @this
+    (facts: facts) => snapshot(facts)->Map.values
+
+  let forEach =
+    @this
+    (facts: facts, callback: (grade, fact) => unit) => {
+      facts.names->Array.forEachWithIndex((fact, slot) => {
+        if isTouched(facts, slot) {
+          callback(Grade(facts.grades->getUnsafe(slot)), fact)
+        }
+      })
+    }
+
+  /** Reads a grade, recording the read when a derived rule is running. */
+  let readFact = (rs: engine<'state>, fact: fact): float => {
+    switch rs.recording {
+    | Some(rule) if !rule.declaredReads => {
+        let slot = intern(rs.facts, fact)
+        let grade = readGrade(rs.facts, slot)
+        rule.reads->Array.push(slot)
+        rule.readGrades->Array.push(grade)
+        grade
+      }
+    | _ => readGrade(rs.facts, slotOf(rs.facts, fact))
+    }
+  }
+
+  let countWrite = (profiling: profiling, slot: int, ~retract: bool): unit => {
+    let counts = retract ? profiling.retracts : profiling.asserts
+    while counts->Array.length <= slot {
+      counts->Array.push(0)
+    }
+    counts->Array.setUnsafe(slot, counts->Array.getUnsafe(slot) + 1)
+  }
+
+  /** Asserts or retracts a fact, recording the write when a derived rule is running. */
+  let writeFact = (rs: engine<'state>, fact: fact, grade: option<grade>, ~retract: bool): unit => {
+    let Grade(grade) = grade->Option.getOr(Grade(1.0))
+    let slot = intern(rs.facts, fact)
+    if retract {
+      subtractFromSlot(rs.facts, slot, grade)
+    } else {
+      addToSlot(rs.facts, slot, grade)
+    }
+    switch rs.recording {
+    | Some(rule) => {
+        rule.writes->Array.push(slot)
+        rule.writeGrades->Array.push(grade)
+        rule.retracts->Array.push(retract)
+      }
+    | None => ()
+    }
+    switch rs.profiling {
+    | Some(profiling) if profiling.enabled => countWrite(profiling, slot, ~retract)
+    | _ => ()
+    }
+  }
+
+  let evaluateRule =
+    @this
+    (rule: compiledRule<'state>, rs: t<'state>) => rule.predicate(rs)
+
+  let executeRule =
+    @this
+    (rule: compiledRule<'state>, rs: t<'state>) => rule.action(rs)
+
+  /** Inserts a rule after every rule with a lower or equal salience, keeping the agenda sorted. */
+  let insertRule = (agenda: array<rule<'state>>, rule: rule<'state>): unit => {
+    let Salience(salience) = rule.salience
+    let index = ref(agenda->Array.length)
+    while (
+      index.contents > 0 && {
+          let Salience(previous) = (agenda->Array.getUnsafe(index.contents - 1)).salience
+          previous > salience
+        }
+    ) {
+      index := index.contents - 1
+    }
+    agenda->Array.splice(~start=index.contents, ~remove=0, ~insert=[rule])
+  }
+
+  let makeRule = (
+    predicate: predicate<'state>,
+    action: action<'state>,
+    salience: option<salience>,
+    ~derived=false,
+    ~reads: array<int>=[],
+    ~declaredReads=false,
+  ): rule<'state> =>
+    asRule({
+      predicate,
+      salience: salience->Option.getOr(Salience(0.0)),
+      action,
+      evaluate: evaluateRule,
+      execute: executeRule,
+      derived,
+      declaredReads,
+      memoized: false,
+      reads,
+      readGrades: reads->Array.map(_ => 0.0),
+      writes: [],
+      writeGrades: [],
+      retracts: [],
+      evaluations: 0,
+      hits: 0,
+      replays: 0,
+      predicateMs: 0.0,
+      actionMs: 0.0,
+    })
+
+  /** Custom rules are wrapped so the agenda only holds `compiledRule`s. */
+  let addRule =
+    @this
+    (rs: engine<'state>, rule: rule<'state>) =>
+      insertRule(
+        rs.agenda,
+        makeRule(
+          system => rule->Rule.evaluate(system),
+          system => rule->Rule.execute(system),
+          Some(rule.salience),
+        ),
+      )
+
+  let addRuleExecutingAction =
+    @this
+    (
+      rs: engine<'state>,
+      predicate: predicate<'state>,
+      action: action<'state>,
+      salience: option<salience>,
+    ) => insertRule(rs.agenda, makeRule(predicate, action, salience))
+
+  let addRuleAssertingFact =
+    @this
+    (rs: engine<'state>, predicate: predicate<'state>, fact: fact, grade: option<grade>) =>
+      insertRule(
+        rs.agenda,
+        makeRule(predicate, system => writeFact(system->asEngine, fact, grade, ~retract=false), None),
+      )
+
+  let addRuleRetractingFact =
+    @this
+    (
+      rs: engine<'state>,
+      predicate: predicate<'state>,
+      fact: fact,
+      grade: option<grade>,
+      salience: option<salience>,
+    ) =>
+      insertRule(
+        rs.agenda,
+        makeRule(
+          predicate,
+          system => writeFact(system->asEngine, fact, grade, ~retract=true),
+          salience,
+        ),
+      )
+
+  let addDerivedRule =
+    @this
+    (
+      rs: engine<'state>,
+      predicate: predicate<'state>,
+      action: action<'state>,
+      reads: option<array<fact>>,
+      salience: option<salience>,
+    ) => {
+      let rule = switch reads {
+      | None => makeRule(predicate, action, salience, ~derived=true)
+      | Some(reads) =>
+        makeRule(
+          predicate,
+          action,
+          salience,
+          ~derived=true,
+          ~reads=reads->Array.map(fact => intern(rs.facts, fact)),
+          ~declaredReads=true,
+        )
+      }
+      insertRule(rs.agenda, rule)
+    }
+
+  let removeAllRules =
+    @this
+    (rs: engine<'state>) =>
+      rs.agenda->Array.splice(~start=0, ~remove=rs.agenda->Array.length, ~insert=[])
+
+  /** `true` when every fact the derived rule read still has the grade it had during its last run. */
+  let inputsUnchanged = (facts: facts, rule: compiledRule<'state>): bool => {
+    let unchanged = ref(true)
+    let index = ref(0)
+    while unchanged.contents && index.contents < rule.reads->Array.length {
+      let slot = rule.reads->Array.getUnsafe(index.contents)
+      unchanged := readGrade(facts, slot) == rule.readGrades->Array.getUnsafe(index.contents)
+      index := index.contents + 1
+    }
+    unchanged.contents
+  }
+
+  /** Applies the writes of the last run of a derived rule again. */
+  let replay = (facts: facts, rule: compiledRule<'state>): unit => {
+    for index in 0 to rule.writes->Array.length - 1 {
+      let slot = rule.writes->Array.getUnsafe(index)
+      let grade = rule.writeGrades->Array.getUnsafe(index)
+      if rule.retracts->Array.getUnsafe(index) {
+        subtractFromSlot(facts, slot, grade)
+      } else {
+        addToSlot(facts, slot, grade)
+      }
+    }
+  }
+
+  /** Clears what a derived rule recorded during its last run and starts recording. */
+  let startRecording = (rs: engine<'state>, rule: compiledRule<'state>): unit => {
+    if rule.declaredReads {
+      rule.reads->Array.forEachWithIndex((slot, index) =>
+        rule.readGrades->Array.setUnsafe(index, readGrade(rs.facts, slot))
+      )
+    } else {
+      rule.reads->setLength(0)
+      rule.readGrades->setLength(0)
+    }
+    rule.writes->setLength(0)
+    rule.writeGrades->setLength(0)
+    rule.retracts->setLength(0)
+    rs.recording = Some(rule)
+  }
+
+  let stopRecording = (rs: engine<'state>, rule: compiledRule<'state>): unit => {
+    rs.recording = None
+    rule.memoized = true
+  }
+
+  /** Runs a derived rule while recording its reads and writes. */
+  let recordRun = (rs: engine<'state>, rule: compiledRule<'state>): unit => {
+    let system = rs->asRuleSystem
+    startRecording(rs, rule)
+    if rule.predicate(system) {
+      rule.action(system)
+    }
+    stopRecording(rs, rule)
+  }
+
+  let commitGrades = (facts: facts): unit => {
+    facts.previous->copyFrom(facts.committed)
+    facts.committed->copyFrom(facts.grades)
+  }
+
+  let ruleLabel = (index: int, Salience(salience)): string =>
+    `rule #${index->Int.toString} (salience ${salience->Float.toString})`
+
+  /** `execute` with timers and counters around every rule, see `startProfiling`. */
+  let executeProfiled = (rs: engine<'state>, profiling: profiling): unit => {
+    let system = rs->asRuleSystem
+    let agenda = rs.agenda
+    let executeStart = Profiler.now()
+    for index in 0 to agenda->Array.length - 1 {
+      let rule = agenda->Array.getUnsafe(index)->fromRule
+      let start = Profiler.now()
+      if rule.derived && rule.memoized && inputsUnchanged(rs.facts, rule) {
+        replay(rs.facts, rule)
+        rule.writes->Array.forEachWithIndex((slot, write) =>
+          countWrite(profiling, slot, ~retract=rule.retracts->Array.getUnsafe(write))
+        )
+        rule.replays = rule.replays + 1
+      } else {
+        if rule.derived {
+          startRecording(rs, rule)
+        }
+        let hit = rule.predicate(system)
+        let predicateEnd = Profiler.now()
+        rule.evaluations = rule.evaluations + 1
+        rule.predicateMs = rule.predicateMs + predicateEnd - start
+        if hit {
+          rule.action(system)
+          rule.hits = rule.hits + 1
+          rule.actionMs = rule.actionMs + Profiler.now() - predicateEnd
+        }
+        if rule.derived {
+          stopRecording(rs, rule)
+        }
+      }
+      switch profiling.trace {
+      | Some(trace) =>
+        trace->Profiler.record(
+          ~name=ruleLabel(index, rule.salience),
+          ~category="RuleSystem",
+          ~start,
+          ~duration=Profiler.now() - start,
+        )
+      | None => ()
+      }
+    }
+    commitGrades(rs.facts)
+
+    let duration = Profiler.now() - executeStart
+    profiling.executions = profiling.executions + 1
+    profiling.executeMs = profiling.executeMs + duration
+    switch profiling.trace {
+    | Some(trace) =>
+      trace->Profiler.record(
+        ~name="RuleSystem.execute",
+        ~category="RuleSystem",
+        ~start=executeStart,
+        ~duration,
+      )
+    | None => ()
+    }
+  }
+
+  let execute =
+    @this
+    (rs: engine<'state>) => {
+      switch rs.profiling {
+      | Some(profiling) if profiling.enabled => executeProfiled(rs, profiling)
+      | _ => {
+          let system = rs->asRuleSystem
+          let agenda = rs.agenda
+          for index in 0 to agenda->Array.length - 1 {
+            let rule = agenda->Array.getUnsafe(index)->fromRule
+            if !rule.derived {
+              if rule.predicate(system) {
+                rule.action(system)
+              }
+            } else if rule.memoized && inputsUnchanged(rs.facts, rule) {
+              replay(rs.facts, rule)
+            } else {
+              recordRun(rs, rule)
+            }
+          }
+          commitGrades(rs.facts)
+        }
+      }
+    }
+
+  let assertFact =
+    @this
+    (rs: engine<'state>, fact: fact, grade: option<grade>) =>
+      writeFact(rs, fact, grade, ~retract=false)
+
+  let retractFact =
+    @this
+    (rs: engine<'state>, fact: fact, grade: option<grade>) =>
+      writeFact(rs, fact, grade, ~retract=true)
+
+  let gradeForFact =
+    @this
+    (rs: engine<'state>, fact: fact) => Grade(readFact(rs, fact))
+
+  /** Missing facts count as `0.0`, an empty list of facts yields `1.0`. */
+  let minimumGradeForFacts: variadicGrade = %raw(`
+function (...facts) {
+    let grade = 1.0;
+    for (const fact of facts) {
+        grade = Math.min(grade, this.gradeForFact(fact));
+    }
+    return grade;
+}
+`)
+
+  /** Missing facts count as `0.0`, an empty list of facts yields `0.0`. */
+  let maximumGradeForFacts: variadicGrade = %raw(`
+function (...facts) {
+    let grade = 0.0;
+    for (const fact of facts) {
+        grade = Math.max(grade, this.gradeForFact(fact));
+    }
+    return grade;
+}
+`)
+
+  let reset =
+    @this
+    (rs: engine<'state>) => {
+      rs.facts.grades->fill(0.0)
+      rs.facts.touched->fill(0)
+      rs.facts.size = 0
+    }
+
+  let changedFacts =
+    @this
+    (rs: engine<'state>) => {
+      let changes: array<factChange> = []
+      rs.facts.names->Array.forEachWithIndex((fact, slot) => {
+        let previous = rs.facts.previous->getUnsafe(slot)
+        let current = rs.facts.committed->getUnsafe(slot)
+        if previous != current {
+          changes->Array.push({fact, previous: Grade(previous), current: Grade(current)})
+        }
+      })
+      changes
+    }
+
+  let hasFactChanged =
+    @this
+    (rs: engine<'state>, fact: fact) => {
+      let slot = slotOf(rs.facts, fact)
+      slot >= 0 && rs.facts.previous->getUnsafe(slot) != rs.facts.committed->getUnsafe(slot)
+    }
+
+  let startProfiling =
+    @this
+    (rs: engine<'state>, trace: option<Profiler.t>) => {
+      rs.agenda->Array.forEach(rule => {
+        let rule = rule->fromRule
+        rule.evaluations = 0
+        rule.hits = 0
+        rule.replays = 0
+        rule.predicateMs = 0.0
+        rule.actionMs = 0.0
+      })
+      rs.profiling = Some({
+        enabled: true,
+        trace,
+        executions: 0,
+        executeMs: 0.0,
+        asserts: [],
+        retracts: [],
+      })
+    }
+
+  let stopProfiling =
+    @this
+    (rs: engine<'state>) =>
+      switch rs.profiling {
+      | Some(profiling) => profiling.enabled = false
+      | None => ()
+      }
+
+  let countAt = (counts: array<int>, slot: int): int =>
+    slot < counts->Array.length ? counts->Array.getUnsafe(slot) : 0
+
+  let profile =
+    @this
+    (rs: engine<'state>): profile =>
+      switch rs.profiling {
+      | None => {executions: 0, executeMs: 0.0, rules: [], facts: []}
+      | Some(profiling) => {
+          let facts: array<factProfile> = []
+          rs.facts.names->Array.forEachWithIndex((fact, slot) => {
+            let asserts = countAt(profiling.asserts, slot)
+            let retracts = countAt(profiling.retracts, slot)
+            if asserts > 0 || retracts > 0 {
+              facts->Array.push({fact, asserts, retracts})
+            }
+          })
+          {
+            executions: profiling.executions,
+            executeMs: profiling.executeMs,
+            rules: rs.agenda->Array.mapWithIndex((rule, index): ruleProfile => {
+              let rule = rule->fromRule
+              {
+                index,
+                salience: rule.salience,
+                evaluations: rule.evaluations,
+                hits: rule.hits,
+                replays: rule.replays,
+                predicateMs: rule.predicateMs,
+                actionMs: rule.actionMs,
+              }
+            }),
+            facts,
+          }
+        }
+      }
+
+  /**
+   * A rule system created with `makeCompiled`.
+   *
+   * Use `toRuleSystem` to pass it to the functions that work on every rule system. The functions
+   * that only the compiled engine implements, like `addDerivedRule` or `profile`, take this type.
+   */
+  type t<'state>
+
+  external asCompiled: engine<'state> => t<'state> = "%identity"
+
+  let make = (): t<'state> => {
+    let facts = {
+      size: 0,
+      slots: Map.make(),
+      names: [],
+      grades: Float64Array.fromLength(initialCapacity),
+      touched: Uint8Array.fromLength(initialCapacity),
+      committed: Float64Array.fromLength(initialCapacity),
+      previous: Float64Array.fromLength(initialCapacity),
+      has,
+      get,
+      entries,
+      keys,
+      values,
+      forEach,
+    }
+    asCompiled({
+      agenda: [],
+      state: Obj.magic(Dict.make()),
+      facts,
+      recording: None,
+      profiling: None,
+      addRule,
+      addRuleExecutingAction,
+      addRuleAssertingFact,
+      addRuleRetractingFact,
+      addDerivedRule,
+      removeAllRules,
+      execute,
+      assertFact,
+      retractFact,
+      gradeForFact,
+      minimumGradeForFacts,
+      maximumGradeForFacts,
+      reset,
+      changedFacts,
+      hasFactChanged,
+      startProfiling,
+      stopProfiling,
+      profile,
+    })
+  }
+}
+
+/**
+ * Creates a rule system backed by the ReScript engine in `Compiled`.
+ *
+ * Prefer this over `make` for rule systems that are reset and executed every frame.
+ * All functions in this module that take a `t` behave the same for both implementations.
+ * `addDerivedRule`, `changedFacts`, `hasFactChanged` and the profiling functions take a
+ * `Compiled.t`, Kaplay's `RuleSystem` doesn't have them.
+ */
+let makeCompiled: unit => Compiled.t<'state> = Compiled.make
+
+/** A compiled rule system works with every function in this module that takes a `t`. */
+external toRuleSystem: Compiled.t<'state> => t<'state> = "%identity"
+
+/**
+ * Adds a derived rule: a rule whose predicate and action **only** read and write facts.
+ *
+ * Because a derived rule cannot observe anything but facts, its outcome is fully determined
+ * by the grades it reads. When none of those grades changed since the rule last ran,
+ * `execute` skips the predicate and action and replays the facts the rule asserted or
+ * retracted instead. A salience tier that only holds derived rules with unchanged inputs
+ * therefore costs a few float comparisons.
+ *
+ * - **`~reads`**: The facts the rule depends on. When omitted, every fact read through
+ *   `gradeForFact`, `minimumGradeForFacts` or `maximumGradeForFacts` during a run is recorded.
+ * - Writes are always recorded from `assertFact` and `retractFact` calls during a run.
+ *
+ * **Important**: Do not read or mutate `state` in a derived rule, use `addRuleExecutingAction`
+ * for rules that depend on game state or have side effects.
+ */
+@send
+external addDerivedRule: (
+  Compiled.t<'state>,
+  predicate<'state>,
+  action<'state>,
+  ~reads: array<fact>=?,
+  ~salience: salience=?,
+) => unit = "addDerivedRule"
+
+/**
+ * Returns the facts whose grade changed between the last two `execute` cycles.
+ *
+ * Grades are captured at the end of each `execute`, so this is the "diff since last frame"
+ * when the rule system is reset and executed every frame. Facts that were not asserted count
+ * as `Grade(0.0)`.
+ */
+@send
+external changedFacts: Compiled.t<'state> => array<factChange> = "changedFacts"
+
+/**
+ * Returns `true` when the grade of the fact changed between the last two `execute` cycles.
+ */
+@send
+external hasFactChanged: (Compiled.t<'state>, fact) => bool = "hasFactChanged"
+
+/**
+ * Starts profiling `execute`: the time spent in the predicate and action of every rule, how often
+ * rules fire and how often facts are written. Starting again clears the previous profile.
+ *
+ * With `~trace`, every rule run and every `execute` is also recorded as a span in the trace of the
+ * profiler, see `Profiler.chromeTrace`.
+ *
+ * When profiling is stopped, or was never started, `execute` only checks a flag.
+ */
+@send
+external startProfiling: (Compiled.t<'state>, ~trace: Profiler.t=?) => unit = "startProfiling"
+
+/**
+ * Stops profiling, the profile collected so far is kept.
+ */
+@send
+external stopProfiling: Compiled.t<'state> => unit = "stopProfiling"
+
+/**
+ * Returns the profile collected since `startProfiling`, empty when profiling was never started.
+ */
+@send
+external profile: Compiled.t<'state> => profile = "profile"
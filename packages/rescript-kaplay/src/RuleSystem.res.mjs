@@ -1,12 +1,617 @@
 // Generated by ReScript, PLEASE EDIT WITH CARE
 
+import * as Stdlib_Option from "@rescript/runtime/lib/es6/Stdlib_Option.mjs";
+import * as Profiler$Kaplay from "./Profiler.res.mjs";
 
 let make = (function (k) { return new k.RuleSystem(); });
 
 let Rule = {};
 
+function grow(array, capacity) {
+  let grown = new Float64Array(capacity);
+  grown.set(array);
+  return grown;
+}
+
+function slotOf(facts, fact) {
+  let slot = facts.slots.get(fact);
+  if (slot !== undefined) {
+    return slot;
+  } else {
+    return -1;
+  }
+}
+
+function intern(facts, fact) {
+  let slot = facts.slots.get(fact);
+  if (slot !== undefined) {
+    return slot;
+  }
+  let slot$1 = facts.names.length;
+  let capacity = facts.grades.length;
+  if (slot$1 === capacity) {
+    facts.grades = grow(facts.grades, (capacity << 1));
+    facts.committed = grow(facts.committed, (capacity << 1));
+    facts.previous = grow(facts.previous, (capacity << 1));
+    let touched = new Uint8Array((capacity << 1));
+    touched.set(facts.touched);
+    facts.touched = touched;
+  }
+  facts.slots.set(fact, slot$1);
+  facts.names.push(fact);
+  return slot$1;
+}
+
+function isTouched(facts, slot) {
+  if (slot >= 0) {
+    return facts.touched[slot] === 1;
+  } else {
+    return false;
+  }
+}
+
+function readGrade(facts, slot) {
+  if (isTouched(facts, slot)) {
+    return facts.grades[slot];
+  } else {
+    return 0.0;
+  }
+}
+
+function writeGrade(facts, slot, value) {
+  if (facts.touched[slot] === 0) {
+    facts.touched[slot] = 1;
+    facts.size = facts.size + 1 | 0;
+  }
+  facts.grades[slot] = value;
+}
+
+function addToSlot(facts, slot, grade) {
+  writeGrade(facts, slot, Math.min(1.0, readGrade(facts, slot) + grade));
+}
+
+function subtractFromSlot(facts, slot, grade) {
+  writeGrade(facts, slot, Math.max(0.0, readGrade(facts, slot) - grade));
+}
+
+function snapshot(facts) {
+  let map = new Map();
+  facts.names.forEach((fact, slot) => {
+    if (isTouched(facts, slot)) {
+      map.set(fact, facts.grades[slot]);
+      return;
+    }
+  });
+  return map;
+}
+
+function has(fact) {
+  let facts = this ;
+  return isTouched(facts, slotOf(facts, fact));
+}
+
+function get(fact) {
+  let facts = this ;
+  let slot = slotOf(facts, fact);
+  if (isTouched(facts, slot)) {
+    return facts.grades[slot];
+  }
+}
+
+function entries() {
+  let facts = this ;
+  return snapshot(facts).entries();
+}
+
+function keys() {
+  let facts = this ;
+  return snapshot(facts).keys();
+}
+
+function values() {
+  let facts = this ;
+  return snapshot(facts).values();
+}
+
+function forEach(callback) {
+  let facts = this ;
+  facts.names.forEach((fact, slot) => {
+    if (isTouched(facts, slot)) {
+      return callback(facts.grades[slot], fact);
+    }
+  });
+}
+
+function readFact(rs, fact) {
+  let rule = rs.recording;
+  if (rule === undefined) {
+    return readGrade(rs.facts, slotOf(rs.facts, fact));
+  }
+  if (rule.declaredReads) {
+    return readGrade(rs.facts, slotOf(rs.facts, fact));
+  }
+  let slot = intern(rs.facts, fact);
+  let grade = readGrade(rs.facts, slot);
+  rule.reads.push(slot);
+  rule.readGrades.push(grade);
+  return grade;
+}
+
+function countWrite(profiling, slot, retract) {
+  let counts = retract ? profiling.retracts : profiling.asserts;
+  while (counts.length <= slot) {
+    counts.push(0);
+  };
+  counts[slot] = counts[slot] + 1 | 0;
+}
+
+function writeFact(rs, fact, grade, retract) {
+  let grade$1 = Stdlib_Option.getOr(grade, 1.0);
+  let slot = intern(rs.facts, fact);
+  if (retract) {
+    subtractFromSlot(rs.facts, slot, grade$1);
+  } else {
+    addToSlot(rs.facts, slot, grade$1);
+  }
+  let rule = rs.recording;
+  if (rule !== undefined) {
+    rule.writes.push(slot);
+    rule.writeGrades.push(grade$1);
+    rule.retracts.push(retract);
+  }
+  let profiling = rs.profiling;
+  if (profiling !== undefined && profiling.enabled) {
+    return countWrite(profiling, slot, retract);
+  }
+}
+
+function evaluateRule(rs) {
+  let rule = this ;
+  return rule.predicate(rs);
+}
+
+function executeRule(rs) {
+  let rule = this ;
+  rule.action(rs);
+}
+
+function insertRule(agenda, rule) {
+  let salience = rule.salience;
+  let index = agenda.length;
+  while (index > 0 && agenda[index - 1 | 0].salience > salience) {
+    index = index - 1 | 0;
+  };
+  agenda.splice(index, 0, rule);
+}
+
+function makeRule(predicate, action, salience, derivedOpt, readsOpt, declaredReadsOpt) {
+  let derived = derivedOpt !== undefined ? derivedOpt : false;
+  let reads = readsOpt !== undefined ? readsOpt : [];
+  let declaredReads = declaredReadsOpt !== undefined ? declaredReadsOpt : false;
+  return {
+    predicate: predicate,
+    salience: Stdlib_Option.getOr(salience, 0.0),
+    action: action,
+    evaluate: evaluateRule,
+    execute: executeRule,
+    derived: derived,
+    declaredReads: declaredReads,
+    memoized: false,
+    reads: reads,
+    readGrades: reads.map(param => 0.0),
+    writes: [],
+    writeGrades: [],
+    retracts: [],
+    evaluations: 0,
+    hits: 0,
+    replays: 0,
+    predicateMs: 0.0,
+    actionMs: 0.0
+  };
+}
+
+function addRule(rule) {
+  let rs = this ;
+  insertRule(rs.agenda, makeRule(system => rule.evaluate(system), system => {
+    rule.execute(system);
+  }, rule.salience, undefined, undefined, undefined));
+}
+
+function addRuleExecutingAction(predicate, action, salience) {
+  let rs = this ;
+  insertRule(rs.agenda, makeRule(predicate, action, salience, undefined, undefined, undefined));
+}
+
+function addRuleAssertingFact(predicate, fact, grade) {
+  let rs = this ;
+  insertRule(rs.agenda, makeRule(predicate, system => writeFact(system, fact, grade, false), undefined, undefined, undefined, undefined));
+}
+
+function addRuleRetractingFact(predicate, fact, grade, salience) {
+  let rs = this ;
+  insertRule(rs.agenda, makeRule(predicate, system => writeFact(system, fact, grade, true), salience, undefined, undefined, undefined));
+}
+
+function addDerivedRule(predicate, action, reads, salience) {
+  let rs = this ;
+  let rule = reads !== undefined ? makeRule(predicate, action, salience, true, reads.map(fact => intern(rs.facts, fact)), true) : makeRule(predicate, action, salience, true, undefined, undefined);
+  insertRule(rs.agenda, rule);
+}
+
+function removeAllRules() {
+  let rs = this ;
+  rs.agenda.splice(0, rs.agenda.length);
+}
+
+function inputsUnchanged(facts, rule) {
+  let unchanged = true;
+  let index = 0;
+  while (unchanged && index < rule.reads.length) {
+    let slot = rule.reads[index];
+    unchanged = readGrade(facts, slot) === rule.readGrades[index];
+    index = index + 1 | 0;
+  };
+  return unchanged;
+}
+
+function replay(facts, rule) {
+  for (let index = 0, index_finish = rule.writes.length; index < index_finish; ++index) {
+    let slot = rule.writes[index];
+    let grade = rule.writeGrades[index];
+    if (rule.retracts[index]) {
+      subtractFromSlot(facts, slot, grade);
+    } else {
+      addToSlot(facts, slot, grade);
+    }
+  }
+}
+
+function startRecording(rs, rule) {
+  if (rule.declaredReads) {
+    rule.reads.forEach((slot, index) => {
+      rule.readGrades[index] = readGrade(rs.facts, slot);
+    });
+  } else {
+    rule.reads.length = 0;
+    rule.readGrades.length = 0;
+  }
+  rule.writes.length = 0;
+  rule.writeGrades.length = 0;
+  rule.retracts.length = 0;
+  rs.recording = rule;
+}
+
+function stopRecording(rs, rule) {
+  rs.recording = undefined;
+  rule.memoized = true;
+}
+
+function recordRun(rs, rule) {
+  startRecording(rs, rule);
+  if (rule.predicate(rs)) {
+    rule.action(rs);
+  }
+  stopRecording(rs, rule);
+}
+
+function commitGrades(facts) {
+  facts.previous.set(facts.committed);
+  facts.committed.set(facts.grades);
+}
+
+function ruleLabel(index, salience) {
+  return `rule #` + index.toString() + ` (salience ` + salience.toString() + `)`;
+}
+
+function executeProfiled(rs, profiling) {
+  let agenda = rs.agenda;
+  let executeStart = performance.now();
+  for (let index = 0, index_finish = agenda.length; index < index_finish; ++index) {
+    let rule = agenda[index];
+    let start = performance.now();
+    if (rule.derived && rule.memoized && inputsUnchanged(rs.facts, rule)) {
+      replay(rs.facts, rule);
+      rule.writes.forEach((slot, write) => countWrite(profiling, slot, rule.retracts[write]));
+      rule.replays = rule.replays + 1 | 0;
+    } else {
+      if (rule.derived) {
+        startRecording(rs, rule);
+      }
+      let hit = rule.predicate(rs);
+      let predicateEnd = performance.now();
+      rule.evaluations = rule.evaluations + 1 | 0;
+      rule.predicateMs = rule.predicateMs + predicateEnd - start;
+      if (hit) {
+        rule.action(rs);
+        rule.hits = rule.hits + 1 | 0;
+        rule.actionMs = rule.actionMs + performance.now() - predicateEnd;
+      }
+      if (rule.derived) {
+        stopRecording(rs, rule);
+      }
+    }
+    let trace = profiling.trace;
+    if (trace !== undefined) {
+      Profiler$Kaplay.record(trace, ruleLabel(index, rule.salience), "RuleSystem", start, performance.now() - start);
+    }
+  }
+  commitGrades(rs.facts);
+  let duration = performance.now() - executeStart;
+  profiling.executions = profiling.executions + 1 | 0;
+  profiling.executeMs = profiling.executeMs + duration;
+  let trace$1 = profiling.trace;
+  if (trace$1 !== undefined) {
+    return Profiler$Kaplay.record(trace$1, "RuleSystem.execute", "RuleSystem", executeStart, duration);
+  }
+}
+
+function execute() {
+  let rs = this ;
+  let profiling = rs.profiling;
+  if (profiling !== undefined && profiling.enabled) {
+    return executeProfiled(rs, profiling);
+  }
+  let agenda = rs.agenda;
+  for (let index = 0, index_finish = agenda.length; index < index_finish; ++index) {
+    let rule = agenda[index];
+    if (rule.derived) {
+      if (rule.memoized && inputsUnchanged(rs.facts, rule)) {
+        replay(rs.facts, rule);
+      } else {
+        recordRun(rs, rule);
+      }
+    } else if (rule.predicate(rs)) {
+      rule.action(rs);
+    }
+  }
+  commitGrades(rs.facts);
+}
+
+function assertFact(fact, grade) {
+  let rs = this ;
+  writeFact(rs, fact, grade, false);
+}
+
+function retractFact(fact, grade) {
+  let rs = this ;
+  writeFact(rs, fact, grade, true);
+}
+
+function gradeForFact(fact) {
+  let rs = this ;
+  return readFact(rs, fact);
+}
+
+let minimumGradeForFacts = (function (...facts) {
+    let grade = 1.0;
+    for (const fact of facts) {
+        grade = Math.min(grade, this.gradeForFact(fact));
+    }
+    return grade;
+});
+
+let maximumGradeForFacts = (function (...facts) {
+    let grade = 0.0;
+    for (const fact of facts) {
+        grade = Math.max(grade, this.gradeForFact(fact));
+    }
+    return grade;
+});
+
+function reset() {
+  let rs = this ;
+  rs.facts.grades.fill(0.0);
+  rs.facts.touched.fill(0);
+  rs.facts.size = 0;
+}
+
+function changedFacts() {
+  let rs = this ;
+  let changes = [];
+  rs.facts.names.forEach((fact, slot) => {
+    let previous = rs.facts.previous[slot];
+    let current = rs.facts.committed[slot];
+    if (previous !== current) {
+      changes.push({
+        fact: fact,
+        previous: previous,
+        current: current
+      });
+      return;
+    }
+  });
+  return changes;
+}
+
+function hasFactChanged(fact) {
+  let rs = this ;
+  let slot = slotOf(rs.facts, fact);
+  if (slot >= 0) {
+    return rs.facts.previous[slot] !== rs.facts.committed[slot];
+  } else {
+    return false;
+  }
+}
+
+function startProfiling(trace) {
+  let rs = this ;
+  rs.agenda.forEach(rule => {
+    rule.evaluations = 0;
+    rule.hits = 0;
+    rule.replays = 0;
+    rule.predicateMs = 0.0;
+    rule.actionMs = 0.0;
+  });
+  rs.profiling = {
+    enabled: true,
+    trace: trace,
+    executions: 0,
+    executeMs: 0.0,
+    asserts: [],
+    retracts: []
+  };
+}
+
+function stopProfiling() {
+  let rs = this ;
+  let profiling = rs.profiling;
+  if (profiling !== undefined) {
+    profiling.enabled = false;
+    return;
+  }
+}
+
+function countAt(counts, slot) {
+  if (slot < counts.length) {
+    return counts[slot];
+  } else {
+    return 0;
+  }
+}
+
+function profile() {
+  let rs = this ;
+  let profiling = rs.profiling;
+  if (profiling === undefined) {
+    return {
+      executions: 0,
+      executeMs: 0.0,
+      rules: [],
+      facts: []
+    };
+  }
+  let facts = [];
+  rs.facts.names.forEach((fact, slot) => {
+    let asserts = countAt(profiling.asserts, slot);
+    let retracts = countAt(profiling.retracts, slot);
+    if (asserts > 0 || retracts > 0) {
+      facts.push({
+        fact: fact,
+        asserts: asserts,
+        retracts: retracts
+      });
+      return;
+    }
+  });
+  return {
+    executions: profiling.executions,
+    executeMs: profiling.executeMs,
+    rules: rs.agenda.map((rule, index) => ({
+      index: index,
+      salience: rule.salience,
+      evaluations: rule.evaluations,
+      hits: rule.hits,
+      replays: rule.replays,
+      predicateMs: rule.predicateMs,
+      actionMs: rule.actionMs
+    })),
+    facts: facts
+  };
+}
+
+function make$1() {
+  let facts = {
+    size: 0,
+    slots: new Map(),
+    names: [],
+    grades: new Float64Array(16),
+    touched: new Uint8Array(16),
+    committed: new Float64Array(16),
+    previous: new Float64Array(16),
+    has: has,
+    get: get,
+    entries: entries,
+    keys: keys,
+    values: values,
+    forEach: forEach
+  };
+  return {
+    agenda: [],
+    state: {},
+    facts: facts,
+    recording: undefined,
+    profiling: undefined,
+    addRule: addRule,
+    addRuleExecutingAction: addRuleExecutingAction,
+    addRuleAssertingFact: addRuleAssertingFact,
+    addRuleRetractingFact: addRuleRetractingFact,
+    addDerivedRule: addDerivedRule,
+    removeAllRules: removeAllRules,
+    execute: execute,
+    assertFact: assertFact,
+    retractFact: retractFact,
+    gradeForFact: gradeForFact,
+    minimumGradeForFacts: minimumGradeForFacts,
+    maximumGradeForFacts: maximumGradeForFacts,
+    reset: reset,
+    changedFacts: changedFacts,
+    hasFactChanged: hasFactChanged,
+    startProfiling: startProfiling,
+    stopProfiling: stopProfiling,
+    profile: profile
+  };
+}
+
+let Compiled = {
+  initialCapacity: 16,
+  grow: grow,
+  slotOf: slotOf,
+  intern: intern,
+  isTouched: isTouched,
+  readGrade: readGrade,
+  writeGrade: writeGrade,
+  addToSlot: addToSlot,
+  subtractFromSlot: subtractFromSlot,
+  snapshot: snapshot,
+  has: has,
+  get: get,
+  entries: entries,
+  keys: keys,
+  values: values,
+  forEach: forEach,
+  readFact: readFact,
+  countWrite: countWrite,
+  writeFact: writeFact,
+  evaluateRule: evaluateRule,
+  executeRule: executeRule,
+  insertRule: insertRule,
+  makeRule: makeRule,
+  addRule: addRule,
+  addRuleExecutingAction: addRuleExecutingAction,
+  addRuleAssertingFact: addRuleAssertingFact,
+  addRuleRetractingFact: addRuleRetractingFact,
+  addDerivedRule: addDerivedRule,
+  removeAllRules: removeAllRules,
+  inputsUnchanged: inputsUnchanged,
+  replay: replay,
+  startRecording: startRecording,
+  stopRecording: stopRecording,
+  recordRun: recordRun,
+  commitGrades: commitGrades,
+  ruleLabel: ruleLabel,
+  executeProfiled: executeProfiled,
+  execute: execute,
+  assertFact: assertFact,
+  retractFact: retractFact,
+  gradeForFact: gradeForFact,
+  minimumGradeForFacts: minimumGradeForFacts,
+  maximumGradeForFacts: maximumGradeForFacts,
+  reset: reset,
+  changedFacts: changedFacts,
+  hasFactChanged: hasFactChanged,
+  startProfiling: startProfiling,
+  stopProfiling: stopProfiling,
+  countAt: countAt,
+  profile: profile,
+  make: make$1
+};
+
+let makeCompiled = make$1;
+
 export {
   make,
   Rule,
+  Compiled,
+  makeCompiled,
 }
 /* No side effect */
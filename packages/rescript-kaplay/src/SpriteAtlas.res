@@ -0,0 +1,51 @@
+/***
+ A packed sprite atlas: one image with many sprites, and the region of each sprite in that image.
+
+ Loading sprites one by one means one fetch, one decode and one texture upload per image.
+ An atlas loads all of them with a single image. The `t` record matches the JSON written by an
+ atlas packer, so it can be imported straight from the JSON file.
+
+ ## Examples
+
+ ```rescript
+ @module("./atlas.json")
+ external atlas: SpriteAtlas.t = "default"
+
+ k->SpriteAtlas.load(atlas, ~url="/atlas.png")
+ // Every frame is now a sprite
+ k->Context.add([k->addSprite("pokemon-25-back")])
+ ```
+ */
+
+type t = {
+  /** Hash of the packed images, a packer uses it to skip packing when nothing changed. */
+  hash: string,
+  width: int,
+  height: int,
+  /** Sprite name to its region in the image. */
+  frames: Dict.t<Context.spriteAtlasEntry>,
+}
+
+let loadedUrls: WeakMap.t<Context.t, Set.t<string>> = WeakMap.make()
+
+/**
+ `load(k, atlas, ~url)` registers every frame of the atlas as a sprite, from the image at `url`.
+ The image is only loaded once per context, loading the same url again does nothing.
+ */
+let load = (k: Context.t, atlas: t, ~url: string): unit => {
+  let urls = switch loadedUrls->WeakMap.get(k) {
+  | Some(urls) => urls
+  | None => {
+      let urls = Set.make()
+      loadedUrls->WeakMap.set(k, urls)->ignore
+      urls
+    }
+  }
+  if !(urls->Set.has(url)) {
+    urls->Set.add(url)
+    k->Context.loadSpriteAtlas(url, atlas.frames)
+  }
+}
+
+/** `has(atlas, name)` checks if the atlas contains a sprite called `name`. */
+let has = (atlas: t, name: string): bool => atlas.frames->Dict.get(name)->Option.isSome
@@ -0,0 +1,33 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Stdlib_Option from "@rescript/runtime/lib/es6/Stdlib_Option.mjs";
+
+let loadedUrls = new WeakMap();
+
+function load(k, atlas, url) {
+  let urls = loadedUrls.get(k);
+  let urls$1;
+  if (urls !== undefined) {
+    urls$1 = urls;
+  } else {
+    let urls$2 = new Set();
+    loadedUrls.set(k, urls$2);
+    urls$1 = urls$2;
+  }
+  if (!urls$1.has(url)) {
+    urls$1.add(url);
+    k.loadSpriteAtlas(url, atlas.frames);
+    return;
+  }
+}
+
+function has(atlas, name) {
+  return Stdlib_Option.isSome(atlas.frames[name]);
+}
+
+export {
+  loadedUrls,
+  load,
+  has,
+}
+/* loadedUrls Not a pure module */
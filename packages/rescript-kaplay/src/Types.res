@@ -221,8 +221,8 @@ type textAlign =
 type shape<'vec2>
 type rect<'vec2> = {
   pos: 'vec2,
-  width: float,
-  height: float,
+  mutable width: float,
+  mutable height: float,
 }
 type circle<'vec2> = {
   radius: float,
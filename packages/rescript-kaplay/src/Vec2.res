@@ -72,6 +72,124 @@ This is the same as `vec2.y` but more convenient to use when piping.
 
   @send
   external clone: T.t => T.t = "clone"
+
+  // In-place operations mutate their first argument instead of returning a new vector.
+  // Use them in code that runs every frame to avoid allocating temporaries.
+
+  @set
+  external setX: (T.t, float) => unit = "x"
+
+  @set
+  external setY: (T.t, float) => unit = "y"
+
+  /**
+  `setXY(vec2, x, y)` overwrites both coordinates of the vector.
+   */
+  let setXY = (vec2: T.t, newX: float, newY: float): unit => {
+    vec2->setX(newX)
+    vec2->setY(newY)
+  }
+
+  /**
+  `copyInto(out, vec2)` copies the coordinates of `vec2` into `out`.
+   */
+  let copyInto = (out: T.t, vec2: T.t): unit => setXY(out, vec2->x, vec2->y)
+
+  /**
+  `addInPlace(vec2, other)` adds `other` to `vec2`.
+
+   ## Examples
+   ```rescript
+   let velocity = k->Context.vec2World(10., 20.)
+   velocity->Vec2.World.addInPlace(k->Context.vec2World(1., 1.))
+   // velocity is {x: 11., y: 21.}
+   ```
+   */
+  let addInPlace = (vec2: T.t, other: T.t): unit =>
+    setXY(vec2, vec2->x + other->x, vec2->y + other->y)
+
+  let addXYInPlace = (vec2: T.t, dx: float, dy: float): unit =>
+    setXY(vec2, vec2->x + dx, vec2->y + dy)
+
+  let subInPlace = (vec2: T.t, other: T.t): unit =>
+    setXY(vec2, vec2->x - other->x, vec2->y - other->y)
+
+  /**
+  `scaleInPlace(vec2, s)` multiplies both coordinates of `vec2` by `s`.
+   */
+  let scaleInPlace = (vec2: T.t, s: float): unit => setXY(vec2, vec2->x * s, vec2->y * s)
+
+  /**
+  `unitInPlace(vec2)` normalizes `vec2`, a zero vector stays zero. Same as `unit`.
+   */
+  let unitInPlace = (vec2: T.t): unit => {
+    let length = Stdlib_Math.sqrt(vec2->x * vec2->x + vec2->y * vec2->y)
+    if length == 0. {
+      setXY(vec2, 0., 0.)
+    } else {
+      scaleInPlace(vec2, 1. / length)
+    }
+  }
+
+  /**
+  `lerpInto(out, a, b, t)` writes the linear interpolation between `a` and `b` into `out`.
+  `out` may be `a` or `b`.
+
+   ## Examples
+   ```rescript
+   // Steer the velocity towards the desired velocity
+   velocity->Vec2.World.lerpInto(velocity, desired, 0.1)
+   ```
+   */
+  let lerpInto = (out: T.t, a: T.t, b: T.t, t: float): unit =>
+    setXY(out, a->x + (b->x - a->x) * t, a->y + (b->y - a->y) * t)
+
+  /** Get squared distance between the vector and the point `(x, y)` */
+  let sdistXY = (vec2: T.t, otherX: float, otherY: float): float => {
+    let dx = vec2->x - otherX
+    let dy = vec2->y - otherY
+    dx * dx + dy * dy
+  }
+
+  /**
+  A pool of scratch vectors for temporaries in hot loops.
+  Borrowed vectors are only valid until the scratch is released, don't store them.
+
+   ## Examples
+   ```rescript
+   let scratch = Vec2.World.makeScratch(() => k->Context.vec2World(0., 0.))
+
+   k->Context.onUpdate(() => {
+     let toTarget = scratch->Vec2.World.borrow(target.x - pos.x, target.y - pos.y)
+     toTarget->Vec2.World.unitInPlace
+     // ...
+     scratch->Vec2.World.releaseScratch
+   })
+   ```
+   */
+  type scratch = {
+    vectors: array<T.t>,
+    mutable used: int,
+    create: unit => T.t,
+  }
+
+  let makeScratch = (create: unit => T.t): scratch => {vectors: [], used: 0, create}
+
+  /** Borrow a vector set to `(x, y)` from the scratch, it grows when all vectors are in use. */
+  let borrow = (scratch: scratch, newX: float, newY: float): T.t => {
+    if scratch.used == scratch.vectors->Array.length {
+      scratch.vectors->Array.push(scratch.create())
+    }
+    let vec2 = scratch.vectors->Array.getUnsafe(scratch.used)
+    scratch.used = scratch.used + 1
+    setXY(vec2, newX, newY)
+    vec2
+  }
+
+  /** Return all borrowed vectors to the scratch. */
+  let releaseScratch = (scratch: scratch): unit => {
+    scratch.used = 0
+  }
 }
 
 /**
@@ -2,18 +2,478 @@
 
 
 function Impl(T) {
-  return {};
+  let setXY = (vec2, newX, newY) => {
+    vec2.x = newX;
+    vec2.y = newY;
+  };
+  let copyInto = (out, vec2) => {
+    setXY(out, vec2.x, vec2.y);
+  };
+  let addInPlace = (vec2, other) => {
+    setXY(vec2, vec2.x + other.x, vec2.y + other.y);
+  };
+  let addXYInPlace = (vec2, dx, dy) => {
+    setXY(vec2, vec2.x + dx, vec2.y + dy);
+  };
+  let subInPlace = (vec2, other) => {
+    setXY(vec2, vec2.x - other.x, vec2.y - other.y);
+  };
+  let scaleInPlace = (vec2, s) => {
+    setXY(vec2, vec2.x * s, vec2.y * s);
+  };
+  let unitInPlace = vec2 => {
+    let length = Math.sqrt(vec2.x * vec2.x + vec2.y * vec2.y);
+    if (length === 0) {
+      return setXY(vec2, 0, 0);
+    } else {
+      return scaleInPlace(vec2, 1 / length);
+    }
+  };
+  let lerpInto = (out, a, b, t) => {
+    setXY(out, a.x + (b.x - a.x) * t, a.y + (b.y - a.y) * t);
+  };
+  let sdistXY = (vec2, otherX, otherY) => {
+    let dx = vec2.x - otherX;
+    let dy = vec2.y - otherY;
+    return dx * dx + dy * dy;
+  };
+  let makeScratch = create => ({
+    vectors: [],
+    used: 0,
+    create: create
+  });
+  let borrow = (scratch, newX, newY) => {
+    if (scratch.used === scratch.vectors.length) {
+      scratch.vectors.push(scratch.create());
+    }
+    let vec2 = scratch.vectors[scratch.used];
+    scratch.used = scratch.used + 1 | 0;
+    setXY(vec2, newX, newY);
+    return vec2;
+  };
+  let releaseScratch = scratch => {
+    scratch.used = 0;
+  };
+  return {
+    setXY: setXY,
+    copyInto: copyInto,
+    addInPlace: addInPlace,
+    addXYInPlace: addXYInPlace,
+    subInPlace: subInPlace,
+    scaleInPlace: scaleInPlace,
+    unitInPlace: unitInPlace,
+    lerpInto: lerpInto,
+    sdistXY: sdistXY,
+    makeScratch: makeScratch,
+    borrow: borrow,
+    releaseScratch: releaseScratch
+  };
 }
 
-let World = {};
+function setXY(vec2, newX, newY) {
+  vec2.x = newX;
+  vec2.y = newY;
+}
+
+function copyInto(out, vec2) {
+  setXY(out, vec2.x, vec2.y);
+}
+
+function addInPlace(vec2, other) {
+  setXY(vec2, vec2.x + other.x, vec2.y + other.y);
+}
+
+function addXYInPlace(vec2, dx, dy) {
+  setXY(vec2, vec2.x + dx, vec2.y + dy);
+}
+
+function subInPlace(vec2, other) {
+  setXY(vec2, vec2.x - other.x, vec2.y - other.y);
+}
+
+function scaleInPlace(vec2, s) {
+  setXY(vec2, vec2.x * s, vec2.y * s);
+}
+
+function unitInPlace(vec2) {
+  let length = Math.sqrt(vec2.x * vec2.x + vec2.y * vec2.y);
+  if (length === 0) {
+    return setXY(vec2, 0, 0);
+  } else {
+    return scaleInPlace(vec2, 1 / length);
+  }
+}
+
+function lerpInto(out, a, b, t) {
+  setXY(out, a.x + (b.x - a.x) * t, a.y + (b.y - a.y) * t);
+}
+
+function sdistXY(vec2, otherX, otherY) {
+  let dx = vec2.x - otherX;
+  let dy = vec2.y - otherY;
+  return dx * dx + dy * dy;
+}
+
+function makeScratch(create) {
+  return {
+    vectors: [],
+    used: 0,
+    create: create
+  };
+}
+
+function borrow(scratch, newX, newY) {
+  if (scratch.used === scratch.vectors.length) {
+    scratch.vectors.push(scratch.create());
+  }
+  let vec2 = scratch.vectors[scratch.used];
+  scratch.used = scratch.used + 1 | 0;
+  setXY(vec2, newX, newY);
+  return vec2;
+}
+
+function releaseScratch(scratch) {
+  scratch.used = 0;
+}
+
+let World = {
+  setXY: setXY,
+  copyInto: copyInto,
+  addInPlace: addInPlace,
+  addXYInPlace: addXYInPlace,
+  subInPlace: subInPlace,
+  scaleInPlace: scaleInPlace,
+  unitInPlace: unitInPlace,
+  lerpInto: lerpInto,
+  sdistXY: sdistXY,
+  makeScratch: makeScratch,
+  borrow: borrow,
+  releaseScratch: releaseScratch
+};
+
+function setXY$1(vec2, newX, newY) {
+  vec2.x = newX;
+  vec2.y = newY;
+}
+
+function copyInto$1(out, vec2) {
+  setXY$1(out, vec2.x, vec2.y);
+}
+
+function addInPlace$1(vec2, other) {
+  setXY$1(vec2, vec2.x + other.x, vec2.y + other.y);
+}
+
+function addXYInPlace$1(vec2, dx, dy) {
+  setXY$1(vec2, vec2.x + dx, vec2.y + dy);
+}
+
+function subInPlace$1(vec2, other) {
+  setXY$1(vec2, vec2.x - other.x, vec2.y - other.y);
+}
+
+function scaleInPlace$1(vec2, s) {
+  setXY$1(vec2, vec2.x * s, vec2.y * s);
+}
+
+function unitInPlace$1(vec2) {
+  let length = Math.sqrt(vec2.x * vec2.x + vec2.y * vec2.y);
+  if (length === 0) {
+    return setXY$1(vec2, 0, 0);
+  } else {
+    return scaleInPlace$1(vec2, 1 / length);
+  }
+}
+
+function lerpInto$1(out, a, b, t) {
+  setXY$1(out, a.x + (b.x - a.x) * t, a.y + (b.y - a.y) * t);
+}
+
+function sdistXY$1(vec2, otherX, otherY) {
+  let dx = vec2.x - otherX;
+  let dy = vec2.y - otherY;
+  return dx * dx + dy * dy;
+}
+
+function makeScratch$1(create) {
+  return {
+    vectors: [],
+    used: 0,
+    create: create
+  };
+}
+
+function borrow$1(scratch, newX, newY) {
+  if (scratch.used === scratch.vectors.length) {
+    scratch.vectors.push(scratch.create());
+  }
+  let vec2 = scratch.vectors[scratch.used];
+  scratch.used = scratch.used + 1 | 0;
+  setXY$1(vec2, newX, newY);
+  return vec2;
+}
+
+function releaseScratch$1(scratch) {
+  scratch.used = 0;
+}
+
+let Screen = {
+  setXY: setXY$1,
+  copyInto: copyInto$1,
+  addInPlace: addInPlace$1,
+  addXYInPlace: addXYInPlace$1,
+  subInPlace: subInPlace$1,
+  scaleInPlace: scaleInPlace$1,
+  unitInPlace: unitInPlace$1,
+  lerpInto: lerpInto$1,
+  sdistXY: sdistXY$1,
+  makeScratch: makeScratch$1,
+  borrow: borrow$1,
+  releaseScratch: releaseScratch$1
+};
+
+function setXY$2(vec2, newX, newY) {
+  vec2.x = newX;
+  vec2.y = newY;
+}
+
+function copyInto$2(out, vec2) {
+  setXY$2(out, vec2.x, vec2.y);
+}
+
+function addInPlace$2(vec2, other) {
+  setXY$2(vec2, vec2.x + other.x, vec2.y + other.y);
+}
+
+function addXYInPlace$2(vec2, dx, dy) {
+  setXY$2(vec2, vec2.x + dx, vec2.y + dy);
+}
+
+function subInPlace$2(vec2, other) {
+  setXY$2(vec2, vec2.x - other.x, vec2.y - other.y);
+}
+
+function scaleInPlace$2(vec2, s) {
+  setXY$2(vec2, vec2.x * s, vec2.y * s);
+}
+
+function unitInPlace$2(vec2) {
+  let length = Math.sqrt(vec2.x * vec2.x + vec2.y * vec2.y);
+  if (length === 0) {
+    return setXY$2(vec2, 0, 0);
+  } else {
+    return scaleInPlace$2(vec2, 1 / length);
+  }
+}
+
+function lerpInto$2(out, a, b, t) {
+  setXY$2(out, a.x + (b.x - a.x) * t, a.y + (b.y - a.y) * t);
+}
+
+function sdistXY$2(vec2, otherX, otherY) {
+  let dx = vec2.x - otherX;
+  let dy = vec2.y - otherY;
+  return dx * dx + dy * dy;
+}
+
+function makeScratch$2(create) {
+  return {
+    vectors: [],
+    used: 0,
+    create: create
+  };
+}
+
+function borrow$2(scratch, newX, newY) {
+  if (scratch.used === scratch.vectors.length) {
+    scratch.vectors.push(scratch.create());
+  }
+  let vec2 = scratch.vectors[scratch.used];
+  scratch.used = scratch.used + 1 | 0;
+  setXY$2(vec2, newX, newY);
+  return vec2;
+}
+
+function releaseScratch$2(scratch) {
+  scratch.used = 0;
+}
+
+let Local = {
+  setXY: setXY$2,
+  copyInto: copyInto$2,
+  addInPlace: addInPlace$2,
+  addXYInPlace: addXYInPlace$2,
+  subInPlace: subInPlace$2,
+  scaleInPlace: scaleInPlace$2,
+  unitInPlace: unitInPlace$2,
+  lerpInto: lerpInto$2,
+  sdistXY: sdistXY$2,
+  makeScratch: makeScratch$2,
+  borrow: borrow$2,
+  releaseScratch: releaseScratch$2
+};
+
+function setXY$3(vec2, newX, newY) {
+  vec2.x = newX;
+  vec2.y = newY;
+}
+
+function copyInto$3(out, vec2) {
+  setXY$3(out, vec2.x, vec2.y);
+}
+
+function addInPlace$3(vec2, other) {
+  setXY$3(vec2, vec2.x + other.x, vec2.y + other.y);
+}
+
+function addXYInPlace$3(vec2, dx, dy) {
+  setXY$3(vec2, vec2.x + dx, vec2.y + dy);
+}
+
+function subInPlace$3(vec2, other) {
+  setXY$3(vec2, vec2.x - other.x, vec2.y - other.y);
+}
+
+function scaleInPlace$3(vec2, s) {
+  setXY$3(vec2, vec2.x * s, vec2.y * s);
+}
+
+function unitInPlace$3(vec2) {
+  let length = Math.sqrt(vec2.x * vec2.x + vec2.y * vec2.y);
+  if (length === 0) {
+    return setXY$3(vec2, 0, 0);
+  } else {
+    return scaleInPlace$3(vec2, 1 / length);
+  }
+}
+
+function lerpInto$3(out, a, b, t) {
+  setXY$3(out, a.x + (b.x - a.x) * t, a.y + (b.y - a.y) * t);
+}
 
-let Screen = {};
+function sdistXY$3(vec2, otherX, otherY) {
+  let dx = vec2.x - otherX;
+  let dy = vec2.y - otherY;
+  return dx * dx + dy * dy;
+}
+
+function makeScratch$3(create) {
+  return {
+    vectors: [],
+    used: 0,
+    create: create
+  };
+}
+
+function borrow$3(scratch, newX, newY) {
+  if (scratch.used === scratch.vectors.length) {
+    scratch.vectors.push(scratch.create());
+  }
+  let vec2 = scratch.vectors[scratch.used];
+  scratch.used = scratch.used + 1 | 0;
+  setXY$3(vec2, newX, newY);
+  return vec2;
+}
+
+function releaseScratch$3(scratch) {
+  scratch.used = 0;
+}
+
+let Tile = {
+  setXY: setXY$3,
+  copyInto: copyInto$3,
+  addInPlace: addInPlace$3,
+  addXYInPlace: addXYInPlace$3,
+  subInPlace: subInPlace$3,
+  scaleInPlace: scaleInPlace$3,
+  unitInPlace: unitInPlace$3,
+  lerpInto: lerpInto$3,
+  sdistXY: sdistXY$3,
+  makeScratch: makeScratch$3,
+  borrow: borrow$3,
+  releaseScratch: releaseScratch$3
+};
+
+function setXY$4(vec2, newX, newY) {
+  vec2.x = newX;
+  vec2.y = newY;
+}
+
+function copyInto$4(out, vec2) {
+  setXY$4(out, vec2.x, vec2.y);
+}
+
+function addInPlace$4(vec2, other) {
+  setXY$4(vec2, vec2.x + other.x, vec2.y + other.y);
+}
+
+function addXYInPlace$4(vec2, dx, dy) {
+  setXY$4(vec2, vec2.x + dx, vec2.y + dy);
+}
+
+function subInPlace$4(vec2, other) {
+  setXY$4(vec2, vec2.x - other.x, vec2.y - other.y);
+}
+
+function scaleInPlace$4(vec2, s) {
+  setXY$4(vec2, vec2.x * s, vec2.y * s);
+}
+
+function unitInPlace$4(vec2) {
+  let length = Math.sqrt(vec2.x * vec2.x + vec2.y * vec2.y);
+  if (length === 0) {
+    return setXY$4(vec2, 0, 0);
+  } else {
+    return scaleInPlace$4(vec2, 1 / length);
+  }
+}
 
-let Local = {};
+function lerpInto$4(out, a, b, t) {
+  setXY$4(out, a.x + (b.x - a.x) * t, a.y + (b.y - a.y) * t);
+}
 
-let Tile = {};
+function sdistXY$4(vec2, otherX, otherY) {
+  let dx = vec2.x - otherX;
+  let dy = vec2.y - otherY;
+  return dx * dx + dy * dy;
+}
+
+function makeScratch$4(create) {
+  return {
+    vectors: [],
+    used: 0,
+    create: create
+  };
+}
+
+function borrow$4(scratch, newX, newY) {
+  if (scratch.used === scratch.vectors.length) {
+    scratch.vectors.push(scratch.create());
+  }
+  let vec2 = scratch.vectors[scratch.used];
+  scratch.used = scratch.used + 1 | 0;
+  setXY$4(vec2, newX, newY);
+  return vec2;
+}
+
+function releaseScratch$4(scratch) {
+  scratch.used = 0;
+}
 
-let Unit = {};
+let Unit = {
+  setXY: setXY$4,
+  copyInto: copyInto$4,
+  addInPlace: addInPlace$4,
+  addXYInPlace: addXYInPlace$4,
+  subInPlace: subInPlace$4,
+  scaleInPlace: scaleInPlace$4,
+  unitInPlace: unitInPlace$4,
+  lerpInto: lerpInto$4,
+  sdistXY: sdistXY$4,
+  makeScratch: makeScratch$4,
+  borrow: borrow$4,
+  releaseScratch: releaseScratch$4
+};
 
 export {
   Impl,
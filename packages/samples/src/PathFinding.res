@@ -50,6 +50,25 @@ module WallTile = {
   }
 }
 
+/** The walls of the flow field level, the field routes around obstacles. */
+module ObstacleTile = {
+  type t
+
+  include Rect.Comp({type t = t})
+  include Outline.Comp({type t = t})
+  include Color.Comp({type t = t})
+  include Tile.Comp({type t = t})
+
+  let make = () => {
+    [
+      addRect(k, tileSize, tileSize),
+      addTile(k, ~options={isObstacle: true}),
+      addOutline(k, ~width=1., ~color=k->Color.fromHex("#0AC0B0"), ~opacity=1.),
+      addColor(k, k->Color.fromHex("#46ecd5")),
+    ]
+  }
+}
+
 module SquirtleTile = {
   type t
 
@@ -93,6 +112,28 @@ module CharmanderTile = {
   }
 }
 
+/** Follows the shared flow field instead of searching its own path like `CharmanderTile`. */
+module FlowCharmander = {
+  type t = {mutable velocity: Vec2.World.t}
+
+  include Sprite.Comp({type t = t})
+  include Anchor.Comp({type t = t})
+  include Pos.Comp({type t = t})
+  include Color.Comp({type t = t})
+
+  external initialState: t => Types.comp = "%identity"
+
+  let make = () => {
+    [
+      addSprite(k, "charmander", ~options={width: tileSize / 2., height: tileSize / 2.}),
+      addAnchorCenter(k),
+      addPos(k, tileSize / 2., tileSize / 2.),
+      addColor(k, k->Color.fromHex("#FFB3AE")),
+      initialState({velocity: k->vec2World(0., 0.)}),
+    ]
+  }
+}
+
 module Text = {
   type t
 
@@ -132,6 +173,46 @@ let onLoad = () => {
   let squirtle = level->Level.spawn(SquirtleTile.make(), k->vec2Tile(1., 1.))
   let charmander = level->Level.spawn(CharmanderTile.make(), k->vec2Tile(7., 4.))
 
+  // The flow field demo gets its own level below the Agent one
+  let flowLevel = k->addLevel(
+    [
+      //
+      "############",
+      "#          #",
+      "############",
+    ],
+    {
+      tileWidth: tileSize,
+      tileHeight: tileSize,
+      pos: k->vec2World(0., 5. * tileSize),
+      tiles: dict{
+        " ": EmptyTile.make,
+        "#": ObstacleTile.make,
+      },
+    },
+  )
+  flowLevel->Level.spawn(SquirtleTile.make(), k->vec2Tile(1., 1.))->ignore
+
+  // All of these share one flow field to squirtle, a single pass over the level
+  let started = ref(false)
+  let field = FlowField.forLevel(k, flowLevel)->FlowField.toGoal(k->vec2Tile(1., 1.))
+  for x in 7 to 10 {
+    let flowCharmander =
+      flowLevel->Level.spawn(FlowCharmander.make(), k->vec2Tile(Int.toFloat(x), 1.))
+    flowCharmander->FlowCharmander.onUpdate(() => {
+      if (
+        started.contents &&
+        field->FlowField.directionInto(
+          flowCharmander->FlowCharmander.worldPos,
+          flowCharmander.velocity,
+        )
+      ) {
+        flowCharmander.velocity->Vec2.World.scaleInPlace(100.)
+        flowCharmander->FlowCharmander.move(flowCharmander.velocity)
+      }
+    })
+  }
+
   let _text = Text.make()
   let audio = ref(None)
 
@@ -140,6 +221,7 @@ let onLoad = () => {
     | Space => {
         let target = squirtle->SquirtleTile.worldPos
         charmander->CharmanderTile.setTarget(target)
+        started := true
         switch audio.contents {
         | None => audio := Some(k->play("beast-in-black"))
         | Some(audio) =>
@@ -5,12 +5,14 @@ import * as Pos$Kaplay from "@nojaf/rescript-kaplay/src/Components/Pos.res.mjs";
 import * as Rect$Kaplay from "@nojaf/rescript-kaplay/src/Components/Rect.res.mjs";
 import * as Text$Kaplay from "@nojaf/rescript-kaplay/src/Components/Text.res.mjs";
 import * as Tile$Kaplay from "@nojaf/rescript-kaplay/src/Components/Tile.res.mjs";
+import * as Vec2$Kaplay from "@nojaf/rescript-kaplay/src/Vec2.res.mjs";
 import * as Agent$Kaplay from "@nojaf/rescript-kaplay/src/Components/Agent.res.mjs";
 import * as Color$Kaplay from "@nojaf/rescript-kaplay/src/Components/Color.res.mjs";
 import * as Anchor$Kaplay from "@nojaf/rescript-kaplay/src/Components/Anchor.res.mjs";
 import * as Sprite$Kaplay from "@nojaf/rescript-kaplay/src/Components/Sprite.res.mjs";
 import * as Outline$Kaplay from "@nojaf/rescript-kaplay/src/Components/Outline.res.mjs";
 import * as Primitive_float from "@rescript/runtime/lib/es6/Primitive_float.mjs";
+import * as FlowField$Kaplay from "@nojaf/rescript-kaplay/src/FlowField.res.mjs";
 
 let width = 12 * 64;
 
@@ -64,6 +66,29 @@ let WallTile = {
   make: make$1
 };
 
+Rect$Kaplay.Comp({});
+
+Outline$Kaplay.Comp({});
+
+Color$Kaplay.Comp({});
+
+Tile$Kaplay.Comp({});
+
+function make$2() {
+  return [
+    k.rect(64, 64),
+    k.tile({
+      isObstacle: true
+    }),
+    k.outline(1, k.Color.fromHex("#0AC0B0"), 1),
+    k.color(k.Color.fromHex("#46ecd5"))
+  ];
+}
+
+let ObstacleTile = {
+  make: make$2
+};
+
 Sprite$Kaplay.Comp({});
 
 Tile$Kaplay.Comp({});
@@ -74,7 +99,7 @@ Anchor$Kaplay.Comp({});
 
 Pos$Kaplay.Comp({});
 
-function make$2() {
+function make$3() {
   return [
     k.tile(),
     k.sprite("squirtle", {
@@ -89,7 +114,7 @@ function make$2() {
 }
 
 let SquirtleTile = {
-  make: make$2
+  make: make$3
 };
 
 Sprite$Kaplay.Comp({});
@@ -104,7 +129,7 @@ Agent$Kaplay.Comp({});
 
 Color$Kaplay.Comp({});
 
-function make$3() {
+function make$4() {
   return [
     k.sprite("charmander", {
       width: 64,
@@ -122,7 +147,34 @@ function make$3() {
 }
 
 let CharmanderTile = {
-  make: make$3
+  make: make$4
+};
+
+Sprite$Kaplay.Comp({});
+
+Anchor$Kaplay.Comp({});
+
+Pos$Kaplay.Comp({});
+
+Color$Kaplay.Comp({});
+
+function make$5() {
+  return [
+    k.sprite("charmander", {
+      width: 64 / 2,
+      height: 64 / 2
+    }),
+    k.anchor("center"),
+    k.pos(64 / 2, 64 / 2),
+    k.color(k.Color.fromHex("#FFB3AE")),
+    {
+      velocity: k.vec2(0, 0)
+    }
+  ];
+}
+
+let FlowCharmander = {
+  make: make$5
 };
 
 Text$Kaplay.Comp({});
@@ -131,7 +183,7 @@ Pos$Kaplay.Comp({});
 
 Anchor$Kaplay.Comp({});
 
-function make$4() {
+function make$6() {
   return k.add([
     k.text("Press space to start", {
       size: 20
@@ -142,7 +194,7 @@ function make$4() {
 }
 
 let Text = {
-  make: make$4
+  make: make$6
 };
 
 function onLoad() {
@@ -160,9 +212,37 @@ function onLoad() {
       "#": make$1
     }
   });
-  let squirtle = level.spawn(make$2(), k.vec2(1, 1));
-  let charmander = level.spawn(make$3(), k.vec2(7, 4));
-  make$4();
+  let squirtle = level.spawn(make$3(), k.vec2(1, 1));
+  let charmander = level.spawn(make$4(), k.vec2(7, 4));
+  let flowLevel = k.addLevel([
+    "############",
+    "#          #",
+    "############"
+  ], {
+    tileWidth: 64,
+    tileHeight: 64,
+    pos: k.vec2(0, 5 * 64),
+    tiles: {
+      " ": make,
+      "#": make$2
+    }
+  });
+  flowLevel.spawn(make$3(), k.vec2(1, 1));
+  let started = {
+    contents: false
+  };
+  let field = FlowField$Kaplay.toGoal(FlowField$Kaplay.forLevel(k, flowLevel), k.vec2(1, 1), undefined);
+  for (let x = 7; x <= 10; ++x) {
+    let flowCharmander = flowLevel.spawn(make$5(), k.vec2(x, 1));
+    flowCharmander.onUpdate(() => {
+      if (started.contents && FlowField$Kaplay.directionInto(field, flowCharmander.worldPos(), flowCharmander.velocity)) {
+        Vec2$Kaplay.World.scaleInPlace(flowCharmander.velocity, 100);
+        flowCharmander.move(flowCharmander.velocity);
+        return;
+      }
+    });
+  }
+  make$6();
   let audio = {
     contents: undefined
   };
@@ -175,6 +255,7 @@ function onLoad() {
     }
     let target = squirtle.worldPos();
     charmander.setTarget(target);
+    started.contents = true;
     let audio$1 = audio.contents;
     if (audio$1 !== undefined) {
       if (audio$1.paused) {
@@ -206,8 +287,10 @@ export {
   k,
   EmptyTile,
   WallTile,
+  ObstacleTile,
   SquirtleTile,
   CharmanderTile,
+  FlowCharmander,
   Text,
   onLoad,
 }
@@ -179,6 +179,8 @@ module Bubble = {
   type t = {
     mutable homingTimer: float,
     mutable homingVelocity: Vec2.World.t,
+    /** The enemy the bubble was fired at, `None` while the bubble is in the pool. */
+    mutable target: option<Charmander.t>,
   }
 
   include GameObjRaw.Comp({type t = t})
@@ -194,16 +196,16 @@ module Bubble = {
     k->Color.fromHex("#155dfc"),
   ]
 
-  let make = (homingVelocity: Vec2.World.t, homingTimer: float) => {
-    let bubbleColor = bubbleColors->Array.getUnsafe(k->randi(0, 2))
+  // Color, radius and velocity are set each time the bubble is fired, see `Tower.makeBubblePool`
+  let make = () => {
     [
       k->addPos(0., 0.),
-      k->addColor(bubbleColor),
+      k->addColor(bubbleColors->Array.getUnsafe(0)),
       tag(Tags.bubble),
       k->addZ(11),
-      k->addCircle(k->randf(4., 6.), ~options={fill: true}),
+      k->addCircle(5., ~options={fill: true}),
       // default values for t, so it is at least defined
-      Obj.magic({homingTimer, homingVelocity}),
+      Obj.magic({homingTimer: 0., homingVelocity: k->Context.vec2World(0., 0.), target: None}),
       k->addArea,
     ]
   }
@@ -218,56 +220,92 @@ module Tower = {
   include Color.Comp({type t = t})
   include Body.Comp({type t = t})
 
-  let fireHomingBullet = (tower: t, viewport: Viewport.t, target: Charmander.t) => {
-    let maxDistance = viewport->Viewport.getRadius
-    let bulletSpeed = 500.
-    let homingStrength = 0.1
-    let homingVelocity: Vec2.World.t =
-      target
-      ->Charmander.worldPos
-      ->Vec2.World.sub(tower->worldPos)
-      ->Vec2.World.unit
-      ->Vec2.World.scaleWith(bulletSpeed)
-    let homingTimer = 0.2
-
-    let bubble: Bubble.t = tower->addChild(Bubble.make(homingVelocity, homingTimer))
-
-    bubble
-    ->Bubble.onUpdate(() => {
-      if bubble.homingTimer > 0. {
-        let toTarget =
-          target->Charmander.worldPos->Vec2.World.sub(bubble->Bubble.worldPos)->Vec2.World.unit
-        bubble.homingVelocity =
-          bubble.homingVelocity->Vec2.World.lerp(
-            toTarget->Vec2.World.scaleWith(bulletSpeed),
-            homingStrength,
-          )
-        bubble.homingTimer = bubble.homingTimer - k->dt
-      }
+  // Shared by all bullets, onUpdate handlers run one after another
+  let scratch = Vec2.World.makeScratch(() => k->Context.vec2World(0., 0.))
 
-      bubble->Bubble.move(bubble.homingVelocity)
+  let bulletSpeed = 500.
+  let homingStrength = 0.1
+  let homingTimer = 0.2
 
-      if bubble->Bubble.worldPos->Vec2.World.dist(tower->worldPos) >= maxDistance {
-        bubble->Bubble.destroy
-      }
-    })
-    ->ignore
+  /** Puts the bubble back in the pool and forgets its target, which may be destroyed while the bubble waits. */
+  let releaseBubble = (pool: Pool.t<Bubble.t, Charmander.t>, bubble: Bubble.t) => {
+    bubble.target = None
+    pool->Pool.release(bubble)
+  }
 
-    bubble->Bubble.onCollide(Tags.enemy, (enemy: Charmander.t, _) => {
-      bubble->Bubble.destroy
-      let newHp = enemy->Charmander.getHp - 1
-      if newHp == 0 {
-        viewport.inSight->Map.delete(enemy->Charmander.getId)->ignore
-      }
-      enemy->Charmander.setHp(newHp)
-      switch enemy->Charmander.get(Tags.solidHeart)->Array.at(0) {
-      | None => ()
-      | Some(heart) => {
-          heart->Heart.play("empty")
-          heart->Heart.untag(Tags.solidHeart)
-        }
-      }
-    })
+  // Bubbles are reused, a tower fires twice a second and a bubble lives for less than a second.
+  let makeBubblePool = (tower: t, viewport: Viewport.t): Pool.t<Bubble.t, Charmander.t> => {
+    let maxDistance = viewport->Viewport.getRadius
+    let maxDistanceSquared = maxDistance * maxDistance
+
+    Pool.make(
+      k,
+      ~size=4,
+      ~components=Bubble.make,
+      ~listen=(pool, bubble) => [
+        bubble->Bubble.onUpdateWithController(() => {
+          switch bubble.target {
+          | None => ()
+          | Some(target) => {
+              if bubble.homingTimer > 0. {
+                // Steer the velocity in place, every bullet updates each frame
+                let targetPos = target->Charmander.worldPos
+                let bubblePos = bubble->Bubble.worldPos
+                let toTarget =
+                  scratch->Vec2.World.borrow(targetPos.x - bubblePos.x, targetPos.y - bubblePos.y)
+                toTarget->Vec2.World.unitInPlace
+                toTarget->Vec2.World.scaleInPlace(bulletSpeed)
+                bubble.homingVelocity->Vec2.World.lerpInto(
+                  bubble.homingVelocity,
+                  toTarget,
+                  homingStrength,
+                )
+                scratch->Vec2.World.releaseScratch
+                bubble.homingTimer = bubble.homingTimer - k->dt
+              }
+
+              bubble->Bubble.move(bubble.homingVelocity)
+
+              let towerPos = tower->worldPos
+              if (
+                bubble->Bubble.worldPos->Vec2.World.sdistXY(towerPos.x, towerPos.y) >=
+                  maxDistanceSquared
+              ) {
+                releaseBubble(pool, bubble)
+              }
+            }
+          }
+        }),
+        bubble->Bubble.onCollideWithController(Tags.enemy, (enemy: Charmander.t, _) => {
+          releaseBubble(pool, bubble)
+          let newHp = enemy->Charmander.getHp - 1
+          if newHp == 0 {
+            viewport.inSight->Map.delete(enemy->Charmander.getId)->ignore
+          }
+          enemy->Charmander.setHp(newHp)
+          switch enemy->Charmander.get(Tags.solidHeart)->Array.at(0) {
+          | None => ()
+          | Some(heart) => {
+              heart->Heart.play("empty")
+              heart->Heart.untag(Tags.solidHeart)
+            }
+          }
+        }),
+      ],
+      ~init=(bubble, target) => {
+        // Fire from the tower, straight at the target
+        let towerPos = tower->worldPos
+        let targetPos = target->Charmander.worldPos
+        bubble->Bubble.setWorldPos(towerPos)
+        bubble.homingVelocity->Vec2.World.setXY(targetPos.x - towerPos.x, targetPos.y - towerPos.y)
+        bubble.homingVelocity->Vec2.World.unitInPlace
+        bubble.homingVelocity->Vec2.World.scaleInPlace(bulletSpeed)
+        bubble.homingTimer = homingTimer
+        bubble.target = Some(target)
+        bubble->Bubble.setColor(Bubble.bubbleColors->Array.getUnsafe(k->randi(0, 2)))
+        bubble->Bubble.setRadius(k->randf(4., 6.))
+      },
+    )
   }
 
   let make = () => {
@@ -291,13 +329,15 @@ module Tower = {
     })
     ->ignore
 
+    let bubbles = makeBubblePool(tower, viewport)
+
     let coolDown = 0.5
     k
     ->Context.loop(coolDown, () => {
       // Find the best suited enemy in sight to fire on.
       switch viewport.inSight->tryHeadOfMap {
       | None => ()
-      | Some(enemy) => fireHomingBullet(tower, viewport, enemy)
+      | Some(enemy) => bubbles->Pool.acquire(enemy)->ignore
       }
     })
     ->ignore
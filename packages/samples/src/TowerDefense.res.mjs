@@ -7,6 +7,8 @@ import * as Pos$Kaplay from "@nojaf/rescript-kaplay/src/Components/Pos.res.mjs";
 import * as Area$Kaplay from "@nojaf/rescript-kaplay/src/Components/Area.res.mjs";
 import * as Body$Kaplay from "@nojaf/rescript-kaplay/src/Components/Body.res.mjs";
 import * as Math$Kaplay from "@nojaf/rescript-kaplay/src/Math.res.mjs";
+import * as Pool$Kaplay from "@nojaf/rescript-kaplay/src/Pool.res.mjs";
+import * as Vec2$Kaplay from "@nojaf/rescript-kaplay/src/Vec2.res.mjs";
 import * as Move$Kaplay from "@nojaf/rescript-kaplay/src/Components/Move.res.mjs";
 import * as Rect$Kaplay from "@nojaf/rescript-kaplay/src/Components/Rect.res.mjs";
 import * as Color$Kaplay from "@nojaf/rescript-kaplay/src/Components/Color.res.mjs";
@@ -222,19 +224,19 @@ let bubbleColors = [
   k.Color.fromHex("#155dfc")
 ];
 
-function make$5(homingVelocity, homingTimer) {
-  let bubbleColor = bubbleColors[k.randi(0, 2)];
+function make$5() {
   return [
     k.pos(0, 0),
-    k.color(bubbleColor),
+    k.color(bubbleColors[0]),
     bubble,
     k.z(11),
-    k.circle(k.rand(4, 6), {
+    k.circle(5, {
       fill: true
     }),
     {
-      homingTimer: homingTimer,
-      homingVelocity: homingVelocity
+      homingTimer: 0,
+      homingVelocity: k.vec2(0, 0),
+      target: undefined
     },
     k.area()
   ];
@@ -255,36 +257,65 @@ Color$Kaplay.Comp({});
 
 Body$Kaplay.Comp({});
 
-function fireHomingBullet(tower, viewport, target) {
+let scratch = Vec2$Kaplay.World.makeScratch(() => k.vec2(0, 0));
+
+function releaseBubble(pool, bubble) {
+  bubble.target = undefined;
+  Pool$Kaplay.release(pool, bubble);
+}
+
+function makeBubblePool(tower, viewport) {
   let maxDistance = viewport.radius;
-  let homingVelocity = target.worldPos().sub(tower.worldPos()).unit().scale(500);
-  let bubble = tower.add(make$5(homingVelocity, 0.2));
-  bubble.onUpdate(() => {
-    if (bubble.homingTimer > 0) {
-      let toTarget = target.worldPos().sub(bubble.worldPos()).unit();
-      bubble.homingVelocity = bubble.homingVelocity.lerp(toTarget.scale(500), 0.1);
-      bubble.homingTimer = bubble.homingTimer - k.dt();
-    }
-    bubble.move(bubble.homingVelocity);
-    if (bubble.worldPos().dist(tower.worldPos()) >= maxDistance) {
-      bubble.destroy();
-      return;
-    }
-  });
-  bubble.onCollide(enemy, (enemy, param) => {
-    bubble.destroy();
-    let newHp = enemy.hp - 1 | 0;
-    if (newHp === 0) {
-      viewport.inSight.delete(enemy.id);
-    }
-    enemy.hp = newHp;
-    let heart = enemy.get(solidHeart).at(0);
-    if (heart === undefined) {
-      return;
-    }
-    let heart$1 = Primitive_option.valFromOption(heart);
-    heart$1.play("empty");
-    heart$1.untag(solidHeart);
+  let maxDistanceSquared = maxDistance * maxDistance;
+  return Pool$Kaplay.make(k, 4, make$5, (pool, bubble) => [
+    bubble.onUpdate(() => {
+      let target = bubble.target;
+      if (target === undefined) {
+        return;
+      }
+      let target$1 = Primitive_option.valFromOption(target);
+      if (bubble.homingTimer > 0) {
+        let targetPos = target$1.worldPos();
+        let bubblePos = bubble.worldPos();
+        let toTarget = Vec2$Kaplay.World.borrow(scratch, targetPos.x - bubblePos.x, targetPos.y - bubblePos.y);
+        Vec2$Kaplay.World.unitInPlace(toTarget);
+        Vec2$Kaplay.World.scaleInPlace(toTarget, 500);
+        Vec2$Kaplay.World.lerpInto(bubble.homingVelocity, bubble.homingVelocity, toTarget, 0.1);
+        Vec2$Kaplay.World.releaseScratch(scratch);
+        bubble.homingTimer = bubble.homingTimer - k.dt();
+      }
+      bubble.move(bubble.homingVelocity);
+      let towerPos = tower.worldPos();
+      if (Vec2$Kaplay.World.sdistXY(bubble.worldPos(), towerPos.x, towerPos.y) >= maxDistanceSquared) {
+        return releaseBubble(pool, bubble);
+      }
+    }),
+    bubble.onCollide(enemy, (enemy, param) => {
+      releaseBubble(pool, bubble);
+      let newHp = enemy.hp - 1 | 0;
+      if (newHp === 0) {
+        viewport.inSight.delete(enemy.id);
+      }
+      enemy.hp = newHp;
+      let heart = enemy.get(solidHeart).at(0);
+      if (heart === undefined) {
+        return;
+      }
+      let heart$1 = Primitive_option.valFromOption(heart);
+      heart$1.play("empty");
+      heart$1.untag(solidHeart);
+    })
+  ], (bubble, target) => {
+    let towerPos = tower.worldPos();
+    let targetPos = target.worldPos();
+    bubble.worldPos(towerPos);
+    Vec2$Kaplay.World.setXY(bubble.homingVelocity, targetPos.x - towerPos.x, targetPos.y - towerPos.y);
+    Vec2$Kaplay.World.unitInPlace(bubble.homingVelocity);
+    Vec2$Kaplay.World.scaleInPlace(bubble.homingVelocity, 500);
+    bubble.homingTimer = 0.2;
+    bubble.target = Primitive_option.some(target);
+    bubble.color = bubbleColors[k.randi(0, 2)];
+    bubble.radius = k.rand(4, 6);
   });
 }
 
@@ -304,10 +335,12 @@ function make$6() {
   viewport.onCollideEnd(enemy, enemy => {
     viewport.inSight.delete(enemy.id);
   });
+  let bubbles = makeBubblePool(tower, viewport);
   k.loop(0.5, () => {
     let enemy = viewport.inSight.values().find(param => true);
     if (enemy !== undefined) {
-      return fireHomingBullet(tower, viewport, Primitive_option.valFromOption(enemy));
+      Pool$Kaplay.acquire(bubbles, Primitive_option.valFromOption(enemy));
+      return;
     }
   });
   tower.add(make$4());
@@ -315,7 +348,12 @@ function make$6() {
 }
 
 let Tower = {
-  fireHomingBullet: fireHomingBullet,
+  scratch: scratch,
+  bulletSpeed: 500,
+  homingStrength: 0.1,
+  homingTimer: 0.2,
+  releaseBubble: releaseBubble,
+  makeBubblePool: makeBubblePool,
   make: make$6
 };
 
@@ -0,0 +1,25 @@
+open Kaplay
+
+/***
+ * The sprites of `public/sprites`, packed into a single image by `PackSprites`.
+ * Loading from the atlas is one fetch and one texture for every Pokemon and move.
+ */
+
+@module("./atlas.json")
+external atlas: SpriteAtlas.t = "default"
+
+let url = "/atlas.png"
+
+/**
+ * Loads the atlas when it has a sprite for each of `names`, the image is only loaded once.
+ * Returns false when a sprite is missing, for example when the atlas wasn't packed again after
+ * downloading a sprite, the caller should load its sprites one by one instead.
+ */
+let load = (k: Context.t, names: array<string>): bool => {
+  if names->Array.every(name => atlas->SpriteAtlas.has(name)) {
+    k->SpriteAtlas.load(atlas, ~url)
+    true
+  } else {
+    false
+  }
+}
@@ -0,0 +1,24 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import AtlasJson from "./atlas.json";
+import * as SpriteAtlas$Kaplay from "@nojaf/rescript-kaplay/src/SpriteAtlas.res.mjs";
+
+function load(k, names) {
+  if (names.every(name => SpriteAtlas$Kaplay.has(AtlasJson, name))) {
+    SpriteAtlas$Kaplay.load(k, AtlasJson, url);
+    return true;
+  } else {
+    return false;
+  }
+}
+
+let atlas = AtlasJson;
+
+let url = "/atlas.png";
+
+export {
+  atlas,
+  url,
+  load,
+}
+/* AtlasJson Not a pure module */
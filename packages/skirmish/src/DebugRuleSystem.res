@@ -4,28 +4,143 @@ type t
 
 include Pos.Comp({type t = t})
 
-let make = (k: Context.t, rs: RuleSystem.t<_>) => {
+let textSize = 12.
+let lineHeight = 16.
+let histogramHeight = 40.
+let barWidth = 5.
+let topRules = 5
+
+let formatMs = (ms: float) => Float.toFixed(ms, ~digits=3) ++ "ms"
+
+/** Total time of each salience tier, the agenda is sorted so a tier is a run of rules. */
+let tierTimes = (profile: RuleSystem.profile): array<(float, float)> => {
+  let tiers: array<(float, float)> = []
+  profile.rules->Array.forEach(rule => {
+    let RuleSystem.Salience(salience) = rule.salience
+    let time = rule.predicateMs + rule.actionMs
+    let last = tiers->Array.length - 1
+    switch tiers[last] {
+    | Some((tier, total)) if tier == salience => tiers->Array.setUnsafe(last, (tier, total + time))
+    | _ => tiers->Array.push((salience, time))
+    }
+  })
+  tiers
+}
+
+let profileLines = (rs: RuleSystem.Compiled.t<_>, profiler: Profiler.t): array<string> => {
+  let profile = rs->RuleSystem.profile
+  let executions = profile.executions == 0 ? 1. : Int.toFloat(profile.executions)
+  let updates = profiler.updates
+  let lines = [
+    `onUpdate p50 ${updates->Profiler.percentile(0.5)->formatMs} p95 ${updates
+      ->Profiler.percentile(0.95)
+      ->formatMs} max ${updates->Profiler.maxSample->formatMs}`,
+    `execute ${formatMs(profile.executeMs / executions)} per frame`,
+  ]
+  tierTimes(profile)->Array.forEach(((salience, total)) => {
+    lines->Array.push(`  salience ${salience->Float.toString}: ${formatMs(total / executions)}`)
+  })
+  profile.rules
+  ->Array.toSorted((a, b) => b.predicateMs + b.actionMs - (a.predicateMs + a.actionMs))
+  ->Array.slice(~start=0, ~end=topRules)
+  ->Array.forEach(rule => {
+    let RuleSystem.Salience(salience) = rule.salience
+    let time = formatMs((rule.predicateMs + rule.actionMs) / executions)
+    let hits = `${rule.hits->Int.toString}/${rule.evaluations->Int.toString} hits`
+    lines->Array.push(
+      `  #${rule.index->Int.toString} (${salience->Float.toString}) ${time} ${hits}, ${rule.replays->Int.toString} replays`,
+    )
+  })
+  profile.facts
+  ->Array.toSorted((a, b) => Int.toFloat(b.asserts + b.retracts - (a.asserts + a.retracts)))
+  ->Array.slice(~start=0, ~end=topRules)
+  ->Array.forEach(({fact: RuleSystem.Fact(fact), asserts, retracts}) => {
+    lines->Array.push(
+      `  ${fact}: ${asserts->Int.toString} asserts, ${retracts->Int.toString} retracts`,
+    )
+  })
+  lines->Array.push("Press T to download a Chrome trace")
+  lines
+}
+
+/** Frame times of the `onUpdate` handlers, one bar per bucket of the histogram. */
+let drawHistogram = (k: Context.t, profiler: Profiler.t) => {
+  let size = Int.toFloat(profiler.updates.size)
+  profiler.updates.counts->Array.forEachWithIndex((count, bucket) => {
+    if count > 0 {
+      let height = histogramHeight * Int.toFloat(count) / size
+      k->Context.drawRect({
+        pos: k->Context.vec2Local(Int.toFloat(bucket) * barWidth, histogramHeight - height),
+        color: k->Color.yellow,
+        width: barWidth - 1.,
+        height,
+      })
+    }
+  })
+}
+
+/** Shows the facts and the profile of the rule system while the debug inspector is open. */
+let make = (k: Context.t, rs: RuleSystem.Compiled.t<_>) => {
+  let profiler = Profiler.forContext(k)
+
   k
   ->Context.add([
     addPos(k, 15., k->Context.height - 15.),
     CustomComponent.make({
       id: "debug-rule-system",
       draw: @this
-      _ => {
-        rs.facts
-        ->Map.entries
-        ->Iterator.toArray
-        ->Array.forEachWithIndex(((RuleSystem.Fact(fact), RuleSystem.Grade(grade)), index) => {
-          let posY = -20. * Int.toFloat(index)
-          let gradeText = Float.toFixed(grade * 100., ~digits=2)
-          let text = `${fact}: ${gradeText}%`
-          Context.drawText(
-            k,
-            {text, size: 15., color: k->Color.white, pos: k->Context.vec2Local(0., posY)},
-          )
-        })
-      },
+      _ =>
+        if k.debug.inspect {
+          (rs->RuleSystem.toRuleSystem).facts
+          ->Map.entries
+          ->Iterator.toArray
+          ->Array.forEachWithIndex(((RuleSystem.Fact(fact), RuleSystem.Grade(grade)), index) => {
+            let posY = -20. * Int.toFloat(index)
+            let gradeText = Float.toFixed(grade * 100., ~digits=2)
+            let text = `${fact}: ${gradeText}%`
+            // Highlight facts whose grade changed since the previous frame
+            let color = rs->RuleSystem.hasFactChanged(RuleSystem.Fact(fact))
+              ? k->Color.yellow
+              : k->Color.white
+            Context.drawText(k, {text, size: 15., color, pos: k->Context.vec2Local(0., posY)})
+          })
+        },
     }),
   ])
   ->ignore
+
+  // Where the frame time goes, see `RuleSystem.startProfiling` and `Profiler.measureUpdate`
+  k
+  ->Context.add([
+    addPos(k, k->Context.width - 300., 15.),
+    CustomComponent.make({
+      id: "debug-rule-system-profile",
+      draw: @this
+      _ =>
+        if k.debug.inspect {
+          drawHistogram(k, profiler)
+          profileLines(rs, profiler)->Array.forEachWithIndex((text, index) => {
+            Context.drawText(
+              k,
+              {
+                text,
+                size: textSize,
+                color: k->Color.white,
+                pos: k->Context.vec2Local(
+                  0.,
+                  histogramHeight + 5. + lineHeight * Int.toFloat(index),
+                ),
+              },
+            )
+          })
+        },
+    }),
+  ])
+  ->ignore
+
+  k->Context.onKeyPress(key => {
+    if k.debug.inspect && key == Types.T {
+      profiler->Profiler.downloadChromeTrace
+    }
+  })
 }
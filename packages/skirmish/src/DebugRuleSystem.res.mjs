@@ -1,22 +1,96 @@
 // Generated by ReScript, PLEASE EDIT WITH CARE
 
 import * as Pos$Kaplay from "@nojaf/rescript-kaplay/src/Components/Pos.res.mjs";
+import * as Profiler$Kaplay from "@nojaf/rescript-kaplay/src/Profiler.res.mjs";
 
 Pos$Kaplay.Comp({});
 
+function formatMs(ms) {
+  return ms.toFixed(3) + "ms";
+}
+
+function tierTimes(profile) {
+  let tiers = [];
+  profile.rules.forEach(rule => {
+    let time = rule.predicateMs + rule.actionMs;
+    let last = tiers.length - 1 | 0;
+    let match = tiers[last];
+    if (match !== undefined) {
+      let tier = match[0];
+      if (tier === rule.salience) {
+        tiers[last] = [
+          tier,
+          match[1] + time
+        ];
+        return;
+      }
+    }
+    tiers.push([
+      rule.salience,
+      time
+    ]);
+  });
+  return tiers;
+}
+
+function profileLines(rs, profiler) {
+  let profile = rs.profile();
+  let executions = profile.executions === 0 ? 1 : profile.executions;
+  let updates = profiler.updates;
+  let lines = [
+    `onUpdate p50 ` + formatMs(Profiler$Kaplay.percentile(updates, 0.5)) + ` p95 ` + formatMs(Profiler$Kaplay.percentile(updates, 0.95)) + ` max ` + formatMs(Profiler$Kaplay.maxSample(updates)),
+    `execute ` + formatMs(profile.executeMs / executions) + ` per frame`
+  ];
+  tierTimes(profile).forEach(param => {
+    lines.push(`  salience ` + param[0].toString() + `: ` + formatMs(param[1] / executions));
+  });
+  profile.rules.toSorted((a, b) => b.predicateMs + b.actionMs - (a.predicateMs + a.actionMs)).slice(0, 5).forEach(rule => {
+    let time = formatMs((rule.predicateMs + rule.actionMs) / executions);
+    let hits = rule.hits.toString() + `/` + rule.evaluations.toString() + ` hits`;
+    lines.push(`  #` + rule.index.toString() + ` (` + rule.salience.toString() + `) ` + time + ` ` + hits + `, ` + rule.replays.toString() + ` replays`);
+  });
+  profile.facts.toSorted((a, b) => (b.asserts + b.retracts | 0) - (a.asserts + a.retracts | 0) | 0).slice(0, 5).forEach(param => {
+    lines.push(`  ` + param.fact + `: ` + param.asserts.toString() + ` asserts, ` + param.retracts.toString() + ` retracts`);
+  });
+  lines.push("Press T to download a Chrome trace");
+  return lines;
+}
+
+function drawHistogram(k, profiler) {
+  let size = profiler.updates.size;
+  profiler.updates.counts.forEach((count, bucket) => {
+    if (count <= 0) {
+      return;
+    }
+    let height = 40 * count / size;
+    k.drawRect({
+      pos: k.vec2(bucket * 5, 40 - height),
+      color: k.YELLOW,
+      width: 5 - 1,
+      height: height
+    });
+  });
+}
+
 function make(k, rs) {
+  let profiler = Profiler$Kaplay.forContext(k);
   k.add([
     k.pos(15, k.height() - 15),
     {
       id: "debug-rule-system",
       draw: function () {
+        if (!k.debug.inspect) {
+          return;
+        }
         rs.facts.entries().toArray().forEach((param, index) => {
           let posY = -20 * index;
           let gradeText = (param[1] * 100).toFixed(2);
-          let text = param[0] + `: ` + gradeText + `%`;
+          let fact = param[0];
+          let text = fact + `: ` + gradeText + `%`;
+          let color = rs.hasFactChanged(fact) ? k.YELLOW : k.WHITE;
           k.drawText({
             pos: k.vec2(0, posY),
-            color: k.WHITE,
+            color: color,
             text: text,
             size: 15
           });
@@ -24,9 +98,53 @@ function make(k, rs) {
       }
     }
   ]);
+  k.add([
+    k.pos(k.width() - 300, 15),
+    {
+      id: "debug-rule-system-profile",
+      draw: function () {
+        if (!k.debug.inspect) {
+          return;
+        }
+        drawHistogram(k, profiler);
+        profileLines(rs, profiler).forEach((text, index) => {
+          k.drawText({
+            pos: k.vec2(0, 40 + 5 + 16 * index),
+            color: k.WHITE,
+            text: text,
+            size: 12
+          });
+        });
+      }
+    }
+  ]);
+  k.onKeyPress(key => {
+    if (k.debug.inspect && key === "t") {
+      return Profiler$Kaplay.downloadChromeTrace(profiler, undefined);
+    }
+  });
 }
 
+let textSize = 12;
+
+let lineHeight = 16;
+
+let histogramHeight = 40;
+
+let barWidth = 5;
+
+let topRules = 5;
+
 export {
+  textSize,
+  lineHeight,
+  histogramHeight,
+  barWidth,
+  topRules,
+  formatMs,
+  tierTimes,
+  profileLines,
+  drawHistogram,
   make,
 }
 /*  Not a pure module */
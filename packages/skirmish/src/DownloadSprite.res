@@ -107,6 +107,7 @@ let main = async (identifier: string): unit => {
           await downloadSprite(front, `${trimmedIdentifier}-front.png`)
           await downloadSprite(back, `${trimmedIdentifier}-back.png`)
           Console.log(`Created sprites for ${trimmedIdentifier}`)
+          Console.log("Run `bun run pack-sprites` to add them to the sprite atlas")
         } catch {
         | exn => {
             Console.error(`Error during image processing`)
@@ -76,6 +76,7 @@ async function main(identifier) {
           await downloadSprite(match.front, trimmedIdentifier + `-front.png`);
           await downloadSprite(match.back, trimmedIdentifier + `-back.png`);
           console.log(`Created sprites for ` + trimmedIdentifier);
+          console.log("Run `bun run pack-sprites` to add them to the sprite atlas");
           return;
         } catch (raw_exn) {
           let exn = Primitive_exceptions.internalToException(raw_exn);
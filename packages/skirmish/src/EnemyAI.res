@@ -17,19 +17,20 @@ module AttackFacts = {
   * Instead, use `addRuleAssertingFact` or `addRuleExecutingAction` with `assertFact`
   * to compute facts fresh each frame based on current game state.
   */
-let makeRuleSystem = (k: Context.t, ~enemy: Pokemon.t, ~player: Pokemon.t): RuleSystem.t<
+let makeRuleSystem = (k: Context.t, ~enemy: Pokemon.t, ~player: Pokemon.t): RuleSystem.Compiled.t<
   RuleSystemState.t,
 > => {
-  let rs = RuleSystem.make(k)
-  rs.state = {
+  let rs = RuleSystem.makeCompiled()
+  let ruleSystem = rs->RuleSystem.toRuleSystem
+  ruleSystem.state = {
     RuleSystemState.enemy,
     player,
-    playerAttacks: [],
+    attacks: AttackIndex.forContext(k),
     horizontalMovement: None,
     lastAttackAt: 0.,
   }
 
-  BaseFacts.addRules(k, rs)
+  BaseFacts.addRules(k, ruleSystem)
   DerivedFacts.addRules(rs)
   DefensiveFacts.addRules(rs)
   MoveFacts.addRules(k, rs)
@@ -37,20 +38,8 @@ let makeRuleSystem = (k: Context.t, ~enemy: Pokemon.t, ~player: Pokemon.t): Rule
   rs
 }
 
-let getPlayerAttacks = (k: Context.t): array<Attack.Unit.t> => {
-  k
-  ->Context.query({
-    include_: [Attack.tag, Team.player],
-    hierarchy: Descendants,
-  })
-  ->Array.filterMap(Attack.Unit.fromGameObj)
-}
-
-let update = (k: Context.t, rs: RuleSystem.t<RuleSystemState.t>, ()) => {
-  rs->RuleSystem.reset
-  rs.state.playerAttacks = getPlayerAttacks(k)
-  rs->RuleSystem.execute
-
+/** Applies the decisions of the last `execute`: horizontal movement and casting a move. */
+let act = (k: Context.t, rs: RuleSystem.t<RuleSystemState.t>) => {
   // Move in the horizontal movement direction if set
   switch rs.state.horizontalMovement {
   | None => ()
@@ -69,12 +58,33 @@ let update = (k: Context.t, rs: RuleSystem.t<RuleSystemState.t>, ()) => {
   }
 }
 
+let update = (k: Context.t, rs: RuleSystem.t<RuleSystemState.t>, ()) => {
+  rs->RuleSystem.reset
+  rs->RuleSystem.execute
+  act(k, rs)
+}
+
 let make = (k: Context.t, ~enemy: Pokemon.t, ~player: Pokemon.t): unit => {
   let rs = makeRuleSystem(k, ~enemy, ~player)
+  let ruleSystem = rs->RuleSystem.toRuleSystem
+  let profiler = Profiler.forContext(k)
 
-  enemy->Pokemon.onUpdate(update(k, rs, ...))
+  // Profile while the debug inspector is open, it can be opened and closed at any time
+  let profiling = ref(false)
+  enemy->Pokemon.onUpdate(() => {
+    if k.debug.inspect != profiling.contents {
+      profiling := k.debug.inspect
+      if profiling.contents {
+        profiler->Profiler.start
+        rs->RuleSystem.startProfiling(~trace=profiler)
+      } else {
+        profiler->Profiler.stop
+        rs->RuleSystem.stopProfiling
+      }
+    }
+  })
 
-  if k.debug.inspect {
-    DebugRuleSystem.make(k, rs)
-  }
+  enemy->Pokemon.onUpdate(profiler->Profiler.measureUpdate(~name="EnemyAI", update(k, ruleSystem, ...)))
+
+  DebugRuleSystem.make(k, rs)
 }
@@ -1,11 +1,10 @@
 // Generated by ReScript, PLEASE EDIT WITH CARE
 
-import * as Stdlib_Array from "@rescript/runtime/lib/es6/Stdlib_Array.mjs";
-import * as Team$Skirmish from "./Team.res.mjs";
-import * as Attack$Skirmish from "./Moves/Attack.res.mjs";
 import * as AIFacts$Skirmish from "./EnemyAI/AIFacts.res.mjs";
 import * as Pokemon$Skirmish from "./Pokemon.res.mjs";
+import * as Profiler$Kaplay from "@nojaf/rescript-kaplay/src/Profiler.res.mjs";
 import * as RuleSystem$Kaplay from "@nojaf/rescript-kaplay/src/RuleSystem.res.mjs";
+import * as AttackIndex$Skirmish from "./Moves/AttackIndex.res.mjs";
 import * as BaseFacts$Skirmish from "./EnemyAI/BaseFacts.res.mjs";
 import * as MoveFacts$Skirmish from "./EnemyAI/MoveFacts.res.mjs";
 import * as DerivedFacts$Skirmish from "./EnemyAI/DerivedFacts.res.mjs";
@@ -17,11 +16,11 @@ let AttackFacts = {
 };
 
 function makeRuleSystem(k, enemy, player) {
-  let rs = RuleSystem$Kaplay.make(k);
+  let rs = RuleSystem$Kaplay.makeCompiled();
   rs.state = {
     enemy: enemy,
     player: player,
-    playerAttacks: [],
+    attacks: AttackIndex$Skirmish.forContext(k),
     horizontalMovement: undefined,
     lastAttackAt: 0
   };
@@ -32,20 +31,7 @@ function makeRuleSystem(k, enemy, player) {
   return rs;
 }
 
-function getPlayerAttacks(k) {
-  return Stdlib_Array.filterMap(k.query({
-    include: [
-      Attack$Skirmish.tag,
-      Team$Skirmish.player
-    ],
-    hierarchy: "descendants"
-  }), Attack$Skirmish.Unit.fromGameObj);
-}
-
-function update(k, rs, param) {
-  rs.reset();
-  rs.state.playerAttacks = getPlayerAttacks(k);
-  rs.execute();
+function act(k, rs) {
   let match = rs.state.horizontalMovement;
   if (match !== undefined) {
     if (match === true) {
@@ -64,12 +50,33 @@ function update(k, rs, param) {
   }
 }
 
+function update(k, rs, param) {
+  rs.reset();
+  rs.execute();
+  act(k, rs);
+}
+
 function make(k, enemy, player) {
   let rs = makeRuleSystem(k, enemy, player);
-  enemy.onUpdate(extra => update(k, rs, extra));
-  if (k.debug.inspect) {
-    return DebugRuleSystem$Skirmish.make(k, rs);
-  }
+  let profiler = Profiler$Kaplay.forContext(k);
+  let profiling = {
+    contents: false
+  };
+  enemy.onUpdate(() => {
+    if (k.debug.inspect === profiling.contents) {
+      return;
+    }
+    profiling.contents = k.debug.inspect;
+    if (profiling.contents) {
+      Profiler$Kaplay.start(profiler);
+      rs.startProfiling(profiler);
+    } else {
+      Profiler$Kaplay.stop(profiler);
+      rs.stopProfiling();
+    }
+  });
+  enemy.onUpdate(Profiler$Kaplay.measureUpdate(profiler, "EnemyAI", extra => update(k, rs, extra)));
+  DebugRuleSystem$Skirmish.make(k, rs);
 }
 
 let BaseFacts = {
@@ -96,6 +103,7 @@ export {
   MoveFacts,
   make,
   makeRuleSystem,
+  act,
   update,
 }
-/* Attack-Skirmish Not a pure module */
+/* Pokemon-Skirmish Not a pure module */
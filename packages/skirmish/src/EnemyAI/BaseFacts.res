@@ -9,87 +9,88 @@ open Kaplay
 
 let salience = RuleSystem.Salience(0.0)
 
-let overlapX = ((ax1, ax2), (bx1, bx2)) => {
-  Stdlib_Math.max(ax1, bx1) <= Stdlib_Math.min(ax2, bx2)
-}
-
 let addRules = (k: Context.t, rs: RuleSystem.t<RuleSystemState.t>) => {
   // Base fact: Attack positions
   rs->RuleSystem.addRuleExecutingAction(
-    rs => rs.state.playerAttacks->Array.length > 0,
+    rs => rs.state.attacks->AttackIndex.count(Team.Player) > 0,
     rs => {
-      // Track maximum grades for each fact type
-      let leftGrade = ref(RuleSystem.Grade(0.))
-      let rightGrade = ref(RuleSystem.Grade(0.))
-      let centerGrade = ref(RuleSystem.Grade(0.))
+      // Track the smallest squared distance for each fact type, the closest attack sets the grade
+      let leftDistance = ref(Float.Constants.positiveInfinity)
+      let rightDistance = ref(Float.Constants.positiveInfinity)
+      let centerDistance = ref(Float.Constants.positiveInfinity)
 
       let enemyWorldPos = rs.state.enemy->Pokemon.worldPos
       let enemyStartX = enemyWorldPos.x - rs.state.enemy.halfSize
       let enemyEndX = enemyWorldPos.x + rs.state.enemy.halfSize
 
-      rs.state.playerAttacks->Array.forEach(attack => {
-        let attackWorldRect = attack->Attack.Unit.getWorldRect
-        let closestCorner = attack->Attack.Unit.getClosestCorner(k, ~pokemonPosition=enemyWorldPos)
-
-        // Check is attack is in center of enemy
-        if (
-          overlapX(
-            (enemyStartX, enemyEndX),
-            (attackWorldRect.pos.x, attackWorldRect.pos.x + attackWorldRect.width),
-          )
-        ) {
-          let squaredDistance = Vec2.World.sdist(
-            enemyWorldPos,
-            attackWorldRect->Kaplay.Math.Rect.centerWorld,
-          )
-          let currentGrade =
-            squaredDistance == 0.
-              ? RuleSystem.Grade(1.)
-              : RuleSystem.Grade(rs.state.enemy.squaredPersonalSpace / squaredDistance)
+      // Squared distance between the enemy and the closest corner of an attack next to it
+      let cornerDistance = (cornerX, bounds: AttackIndex.bounds) => {
+        let isAttackOnTopOfEnemy = bounds.minY + bounds.height / 2. < enemyWorldPos.y
+        let cornerY = isAttackOnTopOfEnemy ? bounds.maxY : bounds.minY
+        let dx = cornerX - enemyWorldPos.x
+        let dy = cornerY - enemyWorldPos.y
+        dx * dx + dy * dy
+      }
 
-          // replace current grade is higher
-          if centerGrade.contents < currentGrade {
-            centerGrade.contents = currentGrade
+      // Check attacks in center of enemy
+      rs.state.attacks->AttackIndex.forEachOverlappingX(
+        Team.Player,
+        ~minX=enemyStartX,
+        ~maxX=enemyEndX,
+        (_attack, bounds) => {
+          let dx = bounds.minX + bounds.width / 2. - enemyWorldPos.x
+          let dy = bounds.minY + bounds.height / 2. - enemyWorldPos.y
+          let squaredDistance = dx * dx + dy * dy
+          if squaredDistance < centerDistance.contents {
+            centerDistance := squaredDistance
           }
-        } // Check if attack is on the left
-        else if closestCorner.x < enemyStartX {
-          // calculate grade based on the distance between the attack and the enemy
-          let squaredDistance = closestCorner->Vec2.World.sdist(enemyWorldPos)
+        },
+      )
 
-          let currentGrade =
-            squaredDistance == 0.
-              ? RuleSystem.Grade(1.)
-              : RuleSystem.Grade(rs.state.enemy.squaredPersonalSpace / squaredDistance)
+      // Check attacks on the left, nearest first.
+      // Stop once the horizontal gap alone is further away than the closest attack so far.
+      rs.state.attacks->AttackIndex.forEachLeftOf(Team.Player, ~x=enemyStartX, (_attack, bounds) => {
+        let dx = enemyWorldPos.x - bounds.maxX
+        if dx * dx >= leftDistance.contents {
+          false
+        } else {
+          let squaredDistance = cornerDistance(bounds.maxX, bounds)
+          if squaredDistance < leftDistance.contents {
+            leftDistance := squaredDistance
+          }
+          true
+        }
+      })
 
-          // replace current grade is higher
-          if leftGrade.contents < currentGrade {
-            leftGrade.contents = currentGrade
+      // Check attacks on the right, nearest first
+      rs.state.attacks->AttackIndex.forEachRightOf(Team.Player, ~x=enemyEndX, (_attack, bounds) => {
+        let dx = bounds.minX - enemyWorldPos.x
+        if dx * dx >= rightDistance.contents {
+          false
+        } else {
+          let squaredDistance = cornerDistance(bounds.minX, bounds)
+          if squaredDistance < rightDistance.contents {
+            rightDistance := squaredDistance
           }
-        } else if closestCorner.x > enemyEndX {
-          // calculate grade based on the distance between the attack and the enemy
-          let squaredDistance = closestCorner->Vec2.World.sdist(enemyWorldPos)
+          true
+        }
+      })
 
-          let currentGrade =
+      // calculate grade based on the distance between the attack and the enemy
+      let assertGrade = (fact, squaredDistance) =>
+        if squaredDistance < Float.Constants.positiveInfinity {
+          let grade =
             squaredDistance == 0.
               ? RuleSystem.Grade(1.)
               : RuleSystem.Grade(rs.state.enemy.squaredPersonalSpace / squaredDistance)
-
-          // replace current grade is higher
-          if rightGrade.contents < currentGrade {
-            rightGrade.contents = currentGrade
+          if grade > RuleSystem.Grade(0.) {
+            rs->RuleSystem.assertFact(fact, ~grade)
           }
         }
-      })
 
-      if leftGrade.contents > RuleSystem.Grade(0.) {
-        rs->RuleSystem.assertFact(AIFacts.attackOnTheLeftOfEnemy, ~grade=leftGrade.contents)
-      }
-      if rightGrade.contents > RuleSystem.Grade(0.) {
-        rs->RuleSystem.assertFact(AIFacts.attackOnTheRightOfEnemy, ~grade=rightGrade.contents)
-      }
-      if centerGrade.contents > RuleSystem.Grade(0.) {
-        rs->RuleSystem.assertFact(AIFacts.attackInCenterOfEnemy, ~grade=centerGrade.contents)
-      }
+      assertGrade(AIFacts.attackOnTheLeftOfEnemy, leftDistance.contents)
+      assertGrade(AIFacts.attackOnTheRightOfEnemy, rightDistance.contents)
+      assertGrade(AIFacts.attackInCenterOfEnemy, centerDistance.contents)
     },
     ~salience,
   )
@@ -1,75 +1,73 @@
 // Generated by ReScript, PLEASE EDIT WITH CARE
 
-import * as Attack$Skirmish from "../Moves/Attack.res.mjs";
 import * as AIFacts$Skirmish from "./AIFacts.res.mjs";
-
-function overlapX(param, param$1) {
-  return Math.max(param[0], param$1[0]) <= Math.min(param[1], param$1[1]);
-}
+import * as AttackIndex$Skirmish from "../Moves/AttackIndex.res.mjs";
 
 function addRules(k, rs) {
-  rs.addRuleExecutingAction(rs => rs.state.playerAttacks.length !== 0, rs => {
-    let leftGrade = {
-      contents: 0
+  rs.addRuleExecutingAction(rs => AttackIndex$Skirmish.count(rs.state.attacks, true) > 0, rs => {
+    let leftDistance = {
+      contents: Number.POSITIVE_INFINITY
     };
-    let rightGrade = {
-      contents: 0
+    let rightDistance = {
+      contents: Number.POSITIVE_INFINITY
     };
-    let centerGrade = {
-      contents: 0
+    let centerDistance = {
+      contents: Number.POSITIVE_INFINITY
     };
     let enemyWorldPos = rs.state.enemy.worldPos();
     let enemyStartX = enemyWorldPos.x - rs.state.enemy.halfSize;
     let enemyEndX = enemyWorldPos.x + rs.state.enemy.halfSize;
-    rs.state.playerAttacks.forEach(attack => {
-      let attackWorldRect = attack.getWorldRect();
-      let closestCorner = Attack$Skirmish.Unit.getClosestCorner(attack, k, enemyWorldPos);
-      if (overlapX([
-          enemyStartX,
-          enemyEndX
-        ], [
-          attackWorldRect.pos.x,
-          attackWorldRect.pos.x + attackWorldRect.width
-        ])) {
-        let squaredDistance = enemyWorldPos.sdist(attackWorldRect.center());
-        let currentGrade = squaredDistance === 0 ? 1 : rs.state.enemy.squaredPersonalSpace / squaredDistance;
-        if (centerGrade.contents < currentGrade) {
-          centerGrade.contents = currentGrade;
-          return;
-        } else {
-          return;
-        }
+    let cornerDistance = (cornerX, bounds) => {
+      let isAttackOnTopOfEnemy = bounds.minY + bounds.height / 2 < enemyWorldPos.y;
+      let cornerY = isAttackOnTopOfEnemy ? bounds.maxY : bounds.minY;
+      let dx = cornerX - enemyWorldPos.x;
+      let dy = cornerY - enemyWorldPos.y;
+      return dx * dx + dy * dy;
+    };
+    AttackIndex$Skirmish.forEachOverlappingX(rs.state.attacks, true, enemyStartX, enemyEndX, (_attack, bounds) => {
+      let dx = bounds.minX + bounds.width / 2 - enemyWorldPos.x;
+      let dy = bounds.minY + bounds.height / 2 - enemyWorldPos.y;
+      let squaredDistance = dx * dx + dy * dy;
+      if (squaredDistance < centerDistance.contents) {
+        centerDistance.contents = squaredDistance;
+        return;
+      }
+    });
+    AttackIndex$Skirmish.forEachLeftOf(rs.state.attacks, true, enemyStartX, (_attack, bounds) => {
+      let dx = enemyWorldPos.x - bounds.maxX;
+      if (dx * dx >= leftDistance.contents) {
+        return false;
+      }
+      let squaredDistance = cornerDistance(bounds.maxX, bounds);
+      if (squaredDistance < leftDistance.contents) {
+        leftDistance.contents = squaredDistance;
+      }
+      return true;
+    });
+    AttackIndex$Skirmish.forEachRightOf(rs.state.attacks, true, enemyEndX, (_attack, bounds) => {
+      let dx = bounds.minX - enemyWorldPos.x;
+      if (dx * dx >= rightDistance.contents) {
+        return false;
       }
-      if (closestCorner.x < enemyStartX) {
-        let squaredDistance$1 = closestCorner.sdist(enemyWorldPos);
-        let currentGrade$1 = squaredDistance$1 === 0 ? 1 : rs.state.enemy.squaredPersonalSpace / squaredDistance$1;
-        if (leftGrade.contents < currentGrade$1) {
-          leftGrade.contents = currentGrade$1;
-          return;
-        } else {
-          return;
-        }
+      let squaredDistance = cornerDistance(bounds.minX, bounds);
+      if (squaredDistance < rightDistance.contents) {
+        rightDistance.contents = squaredDistance;
       }
-      if (closestCorner.x <= enemyEndX) {
+      return true;
+    });
+    let assertGrade = (fact, squaredDistance) => {
+      if (!(squaredDistance < Number.POSITIVE_INFINITY)) {
         return;
       }
-      let squaredDistance$2 = closestCorner.sdist(enemyWorldPos);
-      let currentGrade$2 = squaredDistance$2 === 0 ? 1 : rs.state.enemy.squaredPersonalSpace / squaredDistance$2;
-      if (rightGrade.contents < currentGrade$2) {
-        rightGrade.contents = currentGrade$2;
+      let grade = squaredDistance === 0 ? 1 : rs.state.enemy.squaredPersonalSpace / squaredDistance;
+      if (grade > 0) {
+        rs.assertFact(fact, grade);
         return;
       }
-    });
-    if (leftGrade.contents > 0) {
-      rs.assertFact(AIFacts$Skirmish.attackOnTheLeftOfEnemy, leftGrade.contents);
-    }
-    if (rightGrade.contents > 0) {
-      rs.assertFact(AIFacts$Skirmish.attackOnTheRightOfEnemy, rightGrade.contents);
-    }
-    if (centerGrade.contents > 0) {
-      rs.assertFact(AIFacts$Skirmish.attackInCenterOfEnemy, centerGrade.contents);
-      return;
-    }
+    };
+    assertGrade(AIFacts$Skirmish.attackOnTheLeftOfEnemy, leftDistance.contents);
+    assertGrade(AIFacts$Skirmish.attackOnTheRightOfEnemy, rightDistance.contents);
+    assertGrade(AIFacts$Skirmish.attackInCenterOfEnemy, centerDistance.contents);
   }, 0.0);
   rs.addRuleExecutingAction(_rs => true, rs => {
     let enemyWorldPos = rs.state.enemy.worldPos();
@@ -106,7 +104,6 @@ let salience = 0.0;
 
 export {
   salience,
-  overlapX,
   addRules,
 }
-/* Attack-Skirmish Not a pure module */
+/* AttackIndex-Skirmish Not a pure module */
@@ -8,9 +8,12 @@ open Kaplay
 
 let salience = RuleSystem.Salience(20.0)
 
-let addRules = (rs: RuleSystem.t<RuleSystemState.t>) => {
+let addRules = (rs: RuleSystem.Compiled.t<RuleSystemState.t>) => {
+  let ruleSystem = rs->RuleSystem.toRuleSystem
+
   // Decision fact: Preferred dodge direction based on threats
-  rs->RuleSystem.addRuleExecutingAction(
+  // Derived rule: the facts it reads are recorded and it only re-runs when they change
+  rs->RuleSystem.addDerivedRule(
     rs => {
       // Only compute preferred direction when we have threat information
       let RuleSystem.Grade(leftThreat) = RuleSystem.gradeForFact(rs, AIFacts.leftThreat)
@@ -40,7 +43,7 @@ let addRules = (rs: RuleSystem.t<RuleSystemState.t>) => {
   )
 
   // Decision: Dodge when there's a center attack
-  rs->RuleSystem.addRuleExecutingAction(
+  ruleSystem->RuleSystem.addRuleExecutingAction(
     rs => {
       // Only dodge when there's an attack in the center (or center + sides)
       // Side attacks alone don't require dodging
@@ -112,7 +115,7 @@ let addRules = (rs: RuleSystem.t<RuleSystemState.t>) => {
   // Rule: Reset horizontal movement when center attack is gone
   // We stop dodging once we've successfully dodged the center attack,
   // even if there are still attacks on the sides
-  rs->RuleSystem.addRuleExecutingAction(
+  ruleSystem->RuleSystem.addRuleExecutingAction(
     rs => {
       let RuleSystem.Grade(c) = RuleSystem.gradeForFact(rs, AIFacts.attackInCenterOfEnemy)
       c == 0.0
@@ -124,10 +127,10 @@ let addRules = (rs: RuleSystem.t<RuleSystemState.t>) => {
   )
 
   // Decision: Position in front of player when there are no attacks
-  rs->RuleSystem.addRuleExecutingAction(
+  ruleSystem->RuleSystem.addRuleExecutingAction(
     rs => {
       // Only position when there are no player attacks
-      rs.state.playerAttacks->Array.length == 0
+      rs.state.attacks->AttackIndex.count(Team.Player) == 0
     },
     rs => {
       // Read player position facts (computed at salience 0.0)
@@ -1,9 +1,10 @@
 // Generated by ReScript, PLEASE EDIT WITH CARE
 
 import * as AIFacts$Skirmish from "./AIFacts.res.mjs";
+import * as AttackIndex$Skirmish from "../Moves/AttackIndex.res.mjs";
 
 function addRules(rs) {
-  rs.addRuleExecutingAction(rs => {
+  rs.addDerivedRule(rs => {
     let leftThreat = rs.gradeForFact(AIFacts$Skirmish.leftThreat);
     let rightThreat = rs.gradeForFact(AIFacts$Skirmish.rightThreat);
     if (leftThreat > 0.0) {
@@ -25,7 +26,7 @@ function addRules(rs) {
     } else {
       rs.assertFact(AIFacts$Skirmish.preferredDodgeRight, 1.0);
     }
-  }, 20.0);
+  }, undefined, 20.0);
   rs.addRuleExecutingAction(rs => {
     let c = rs.gradeForFact(AIFacts$Skirmish.attackInCenterOfEnemy);
     return c > 0.0;
@@ -59,7 +60,7 @@ function addRules(rs) {
   }, rs => {
     rs.state.horizontalMovement = undefined;
   }, 20.0);
-  rs.addRuleExecutingAction(rs => rs.state.playerAttacks.length === 0, rs => {
+  rs.addRuleExecutingAction(rs => AttackIndex$Skirmish.count(rs.state.attacks, true) === 0, rs => {
     let playerLeft = rs.gradeForFact(AIFacts$Skirmish.isPlayerLeft);
     let playerRight = rs.gradeForFact(AIFacts$Skirmish.isPlayerRight);
     let leftSpace = rs.gradeForFact(AIFacts$Skirmish.hasSpaceOnTheLeft);
@@ -80,4 +81,4 @@ export {
   salience,
   addRules,
 }
-/* No side effect */
+/* AttackIndex-Skirmish Not a pure module */
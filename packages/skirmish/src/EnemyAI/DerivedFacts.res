@@ -9,9 +9,10 @@ open Kaplay
 
 let salience = RuleSystem.Salience(10.0)
 
-let addRules = (rs: RuleSystem.t<RuleSystemState.t>) => {
+let addRules = (rs: RuleSystem.Compiled.t<RuleSystemState.t>) => {
   // Derived fact: Threat levels (depends on attack facts)
-  rs->RuleSystem.addRuleExecutingAction(
+  // Only re-evaluated when one of the attack facts changed since the previous frame
+  rs->RuleSystem.addDerivedRule(
     rs => {
       // Compute threats when we have attack information
       let RuleSystem.Grade(centerAttack) = RuleSystem.gradeForFact(
@@ -48,6 +49,11 @@ let addRules = (rs: RuleSystem.t<RuleSystemState.t>) => {
         rs->RuleSystem.assertFact(AIFacts.rightThreat, ~grade=RuleSystem.Grade(rightThreatGrade))
       }
     },
+    ~reads=[
+      AIFacts.attackInCenterOfEnemy,
+      AIFacts.attackOnTheLeftOfEnemy,
+      AIFacts.attackOnTheRightOfEnemy,
+    ],
     ~salience,
   )
 }
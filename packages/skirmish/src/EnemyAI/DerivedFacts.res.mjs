@@ -3,7 +3,7 @@
 import * as AIFacts$Skirmish from "./AIFacts.res.mjs";
 
 function addRules(rs) {
-  rs.addRuleExecutingAction(rs => {
+  rs.addDerivedRule(rs => {
     let centerAttack = rs.gradeForFact(AIFacts$Skirmish.attackInCenterOfEnemy);
     let leftAttack = rs.gradeForFact(AIFacts$Skirmish.attackOnTheLeftOfEnemy);
     let rightAttack = rs.gradeForFact(AIFacts$Skirmish.attackOnTheRightOfEnemy);
@@ -25,7 +25,11 @@ function addRules(rs) {
       rs.assertFact(AIFacts$Skirmish.rightThreat, rightThreatGrade);
       return;
     }
-  }, 10.0);
+  }, [
+    AIFacts$Skirmish.attackInCenterOfEnemy,
+    AIFacts$Skirmish.attackOnTheLeftOfEnemy,
+    AIFacts$Skirmish.attackOnTheRightOfEnemy
+  ], 10.0);
 }
 
 let salience = 10.0;
@@ -1,20 +1,21 @@
 /** Module for move-related facts and selection logic */
 open Kaplay
 
-external toAbstractRuleSystem: RuleSystem.t<RuleSystemState.t> => RuleSystem.t<
+external toAbstractRuleSystem: RuleSystem.Compiled.t<RuleSystemState.t> => RuleSystem.Compiled.t<
   PkmnMove.enemyAIRuleSystemState,
 > = "%identity"
 
 // Add rules for all move slots
-let addRules = (k: Context.t, rs: RuleSystem.t<RuleSystemState.t>) => {
-  let enemy = rs.state.enemy
+let addRules = (k: Context.t, rs: RuleSystem.Compiled.t<RuleSystemState.t>) => {
+  let enemy = (rs->RuleSystem.toRuleSystem).state.enemy
   let abstractRs = rs->toAbstractRuleSystem
+  let defaultRs = abstractRs->RuleSystem.toRuleSystem
 
   // Add default availability rules for each move slot
-  PkmnMove.defaultAddRulesForAI(k, abstractRs, enemy.moveSlot1, PkmnMove.move0Facts)
-  PkmnMove.defaultAddRulesForAI(k, abstractRs, enemy.moveSlot2, PkmnMove.move1Facts)
-  PkmnMove.defaultAddRulesForAI(k, abstractRs, enemy.moveSlot3, PkmnMove.move2Facts)
-  PkmnMove.defaultAddRulesForAI(k, abstractRs, enemy.moveSlot4, PkmnMove.move3Facts)
+  PkmnMove.defaultAddRulesForAI(k, defaultRs, enemy.moveSlot1, PkmnMove.move0Facts)
+  PkmnMove.defaultAddRulesForAI(k, defaultRs, enemy.moveSlot2, PkmnMove.move1Facts)
+  PkmnMove.defaultAddRulesForAI(k, defaultRs, enemy.moveSlot3, PkmnMove.move2Facts)
+  PkmnMove.defaultAddRulesForAI(k, defaultRs, enemy.moveSlot4, PkmnMove.move3Facts)
 
   // Add move-specific rules (if any)
   enemy.moveSlot1.move.addRulesForAI(k, abstractRs, enemy.moveSlot1, PkmnMove.move0Facts)
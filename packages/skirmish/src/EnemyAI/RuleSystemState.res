@@ -4,7 +4,7 @@ type horizontalMovement = | @as(true) Left | @as(false) Right
 type t = {
   enemy: Pokemon.t,
   player: Pokemon.t,
-  mutable playerAttacks: array<Attack.Unit.t>,
+  attacks: AttackIndex.t,
   mutable horizontalMovement: option<horizontalMovement>,
   lastAttackAt: float,
 }
@@ -18,6 +18,8 @@ open Kaplay
  * - A simple sprite bounding box (for simple attacks like Ember)
  * - A calculated bounding box from points (for complex shapes like Thundershock)
  * - Any other shape representation that can be bounded by a rectangle
+ *
+ * Attacks are registered in the `AttackIndex` of their context, use it to query them.
  */
 
 let tag = "attack"
@@ -38,45 +40,53 @@ module Comp = (
   @send
   external getWorldRect: T.t => Types.rect<Kaplay.Vec2.World.t> = "getWorldRect"
 
-  let getClosestCorner = (
+  /** Writes the corner of the attack closest to the pokemon into `out`, without allocating. */
+  let getClosestCornerInto = (
     attack: T.t,
-    k: Context.t,
     ~pokemonPosition: Vec2.World.t,
-  ): Vec2.World.t => {
+    out: Vec2.World.t,
+  ): unit => {
     let attackRect = attack->getWorldRect
-    let attackCenter =
-      attackRect.pos->Vec2.World.add(
-        k->Context.vec2World(attackRect.width / 2., attackRect.height / 2.),
-      )
-    let isAttackOnTheLeftOfPokemon = attackCenter.x < pokemonPosition.x
-    let isAttackOnTopOfPokemon = attackCenter.y < pokemonPosition.y
+    let isAttackOnTheLeftOfPokemon = attackRect.pos.x + attackRect.width / 2. < pokemonPosition.x
+    let isAttackOnTopOfPokemon = attackRect.pos.y + attackRect.height / 2. < pokemonPosition.y
     let leftX = attackRect.pos.x
     let rightX = attackRect.pos.x + attackRect.width
     let topY = attackRect.pos.y
     let bottomY = attackRect.pos.y + attackRect.height
 
-    switch (isAttackOnTheLeftOfPokemon, isAttackOnTopOfPokemon) {
-    | (true, true) => k->Context.vec2World(rightX, bottomY)
-    | (true, false) => k->Context.vec2World(rightX, topY)
-    | (false, true) => k->Context.vec2World(leftX, bottomY)
-    | (false, false) => k->Context.vec2World(leftX, topY)
-    }
+    out->Vec2.World.setXY(
+      isAttackOnTheLeftOfPokemon ? rightX : leftX,
+      isAttackOnTopOfPokemon ? bottomY : topY,
+    )
   }
 
-  let addAttack = (getWorldRect: @this (T.t => Types.rect<Kaplay.Vec2.World.t>)): Types.comp =>
+  external asIndexed: T.t => AttackIndex.attack = "%identity"
+
+  /***
+   * The attack is kept in the `AttackIndex` of the context while the component is in the scene.
+   * Team tags are read when the index refreshes, so they can be added in any order.
+   */
+  let addAttack = (
+    k: Context.t,
+    getWorldRect: @this (T.t => Types.rect<Kaplay.Vec2.World.t>),
+  ): Types.comp =>
     asAttack({
       id,
       getWorldRect,
+      add: @this attack => AttackIndex.register(k, attack->asIndexed),
+      destroy: @this attack => AttackIndex.unregister(k, attack->asIndexed),
     })
 
   /***
    * Add an Attack component to a game object.
    * @param getWorldRect Function that returns the world-space bounding rectangle of the attack.
-   *                     This is called when the attack is queried (e.g., by rule systems).
+   *                     This is called once per frame by the `AttackIndex` when it is queried
+   *                     (e.g., by rule systems).
    */
-  let addAttackWithTag = (getWorldRectX: @this (T.t => Types.rect<Kaplay.Vec2.World.t>)): array<
-    Types.comp,
-  > => [addAttack(getWorldRectX), Context.tag(tag)]
+  let addAttackWithTag = (
+    k: Context.t,
+    getWorldRectX: @this (T.t => Types.rect<Kaplay.Vec2.World.t>),
+  ): array<Types.comp> => [addAttack(k, getWorldRectX), Context.tag(tag)]
 }
 
 module Unit = {
@@ -1,5 +1,7 @@
 // Generated by ReScript, PLEASE EDIT WITH CARE
 
+import * as Vec2$Kaplay from "@nojaf/rescript-kaplay/src/Vec2.res.mjs";
+import * as AttackIndex$Skirmish from "./AttackIndex.res.mjs";
 import * as Primitive_option from "@rescript/runtime/lib/es6/Primitive_option.mjs";
 import * as GameObjRaw$Kaplay from "@nojaf/rescript-kaplay/src/Components/GameObjRaw.res.mjs";
 
@@ -8,37 +10,34 @@ let tag = "attack";
 let id = "attack";
 
 function Comp(T) {
-  let getClosestCorner = (attack, k, pokemonPosition) => {
+  let getClosestCornerInto = (attack, pokemonPosition, out) => {
     let attackRect = attack.getWorldRect();
-    let attackCenter = attackRect.pos.add(k.vec2(attackRect.width / 2, attackRect.height / 2));
-    let isAttackOnTheLeftOfPokemon = attackCenter.x < pokemonPosition.x;
-    let isAttackOnTopOfPokemon = attackCenter.y < pokemonPosition.y;
+    let isAttackOnTheLeftOfPokemon = attackRect.pos.x + attackRect.width / 2 < pokemonPosition.x;
+    let isAttackOnTopOfPokemon = attackRect.pos.y + attackRect.height / 2 < pokemonPosition.y;
     let leftX = attackRect.pos.x;
     let rightX = attackRect.pos.x + attackRect.width;
     let topY = attackRect.pos.y;
     let bottomY = attackRect.pos.y + attackRect.height;
-    if (isAttackOnTheLeftOfPokemon) {
-      if (isAttackOnTopOfPokemon) {
-        return k.vec2(rightX, bottomY);
-      } else {
-        return k.vec2(rightX, topY);
-      }
-    } else if (isAttackOnTopOfPokemon) {
-      return k.vec2(leftX, bottomY);
-    } else {
-      return k.vec2(leftX, topY);
-    }
+    Vec2$Kaplay.World.setXY(out, isAttackOnTheLeftOfPokemon ? rightX : leftX, isAttackOnTopOfPokemon ? bottomY : topY);
   };
-  let addAttack = getWorldRect => ({
+  let addAttack = (k, getWorldRect) => ({
     id: id,
+    add: function () {
+      let attack = this ;
+      AttackIndex$Skirmish.register(k, attack);
+    },
+    destroy: function () {
+      let attack = this ;
+      AttackIndex$Skirmish.unregister(k, attack);
+    },
     getWorldRect: getWorldRect
   });
-  let addAttackWithTag = getWorldRectX => [
-    addAttack(getWorldRectX),
+  let addAttackWithTag = (k, getWorldRectX) => [
+    addAttack(k, getWorldRectX),
     tag
   ];
   return {
-    getClosestCorner: getClosestCorner,
+    getClosestCornerInto: getClosestCornerInto,
     addAttack: addAttack,
     addAttackWithTag: addAttackWithTag
   };
@@ -46,38 +45,35 @@ function Comp(T) {
 
 GameObjRaw$Kaplay.Comp({});
 
-function getClosestCorner(attack, k, pokemonPosition) {
+function getClosestCornerInto(attack, pokemonPosition, out) {
   let attackRect = attack.getWorldRect();
-  let attackCenter = attackRect.pos.add(k.vec2(attackRect.width / 2, attackRect.height / 2));
-  let isAttackOnTheLeftOfPokemon = attackCenter.x < pokemonPosition.x;
-  let isAttackOnTopOfPokemon = attackCenter.y < pokemonPosition.y;
+  let isAttackOnTheLeftOfPokemon = attackRect.pos.x + attackRect.width / 2 < pokemonPosition.x;
+  let isAttackOnTopOfPokemon = attackRect.pos.y + attackRect.height / 2 < pokemonPosition.y;
   let leftX = attackRect.pos.x;
   let rightX = attackRect.pos.x + attackRect.width;
   let topY = attackRect.pos.y;
   let bottomY = attackRect.pos.y + attackRect.height;
-  if (isAttackOnTheLeftOfPokemon) {
-    if (isAttackOnTopOfPokemon) {
-      return k.vec2(rightX, bottomY);
-    } else {
-      return k.vec2(rightX, topY);
-    }
-  } else if (isAttackOnTopOfPokemon) {
-    return k.vec2(leftX, bottomY);
-  } else {
-    return k.vec2(leftX, topY);
-  }
+  Vec2$Kaplay.World.setXY(out, isAttackOnTheLeftOfPokemon ? rightX : leftX, isAttackOnTopOfPokemon ? bottomY : topY);
 }
 
-function addAttack(getWorldRect) {
+function addAttack(k, getWorldRect) {
   return {
     id: id,
+    add: function () {
+      let attack = this ;
+      AttackIndex$Skirmish.register(k, attack);
+    },
+    destroy: function () {
+      let attack = this ;
+      AttackIndex$Skirmish.unregister(k, attack);
+    },
     getWorldRect: getWorldRect
   };
 }
 
-function addAttackWithTag(getWorldRectX) {
+function addAttackWithTag(k, getWorldRectX) {
   return [
-    addAttack(getWorldRectX),
+    addAttack(k, getWorldRectX),
     tag
   ];
 }
@@ -89,7 +85,7 @@ function fromGameObj(obj) {
 }
 
 let Unit = {
-  getClosestCorner: getClosestCorner,
+  getClosestCornerInto: getClosestCornerInto,
   addAttack: addAttack,
   addAttackWithTag: addAttackWithTag,
   fromGameObj: fromGameObj
@@ -0,0 +1,315 @@
+open Kaplay
+
+/***
+ * Spatial index of the attacks in a Kaplay context.
+ *
+ * Rule systems ask the same questions every frame: "which player attacks overlap this x-range?"
+ * and "what is the nearest attack on my left or right?". Querying the scene and scanning every
+ * attack for each enemy makes that linear in the number of attacks, and `getWorldRect` ends up
+ * being called several times per attack per frame.
+ *
+ * Instead, attacks register themselves when their Attack component is added to the scene and
+ * unregister when it is destroyed (see `Attack.Comp.addAttack`). The first query of a frame reads
+ * the world rect of every attack once, splits them per team and keeps them sorted along the x-axis.
+ * All other queries in that frame are answered with a binary search on the cached bounds.
+ */
+
+/** A game object with an Attack component. */
+type attack
+
+@send
+external getWorldRect: attack => Types.rect<Vec2.World.t> = "getWorldRect"
+
+@send
+external is: (attack, string) => bool = "is"
+
+@get
+external paused: attack => bool = "paused"
+
+@set
+external setLength: (array<'a>, int) => unit = "length"
+
+/** World-space bounds of an attack, valid for the current frame. */
+type bounds = {
+  mutable minX: float,
+  mutable minY: float,
+  mutable maxX: float,
+  mutable maxY: float,
+  mutable width: float,
+  mutable height: float,
+}
+
+type bucket = {
+  mutable count: int,
+  members: array<attack>,
+  /** Reused between frames, indexed like `members`. */
+  bounds: array<bounds>,
+  /** Slots ordered by `minX`. */
+  byMinX: array<int>,
+  /** Slots ordered by `maxX`. */
+  byMaxX: array<int>,
+  /** The largest `maxX` of `byMinX[0..i]`, lets overlap queries stop early. */
+  reachX: array<float>,
+}
+
+type t = {
+  k: Context.t,
+  attacks: array<attack>,
+  positions: Map.t<attack, int>,
+  mutable changed: bool,
+  mutable frame: int,
+  player: bucket,
+  opponent: bucket,
+}
+
+let makeBucket = (): bucket => {
+  count: 0,
+  members: [],
+  bounds: [],
+  byMinX: [],
+  byMaxX: [],
+  reachX: [],
+}
+
+let make = (k: Context.t): t => {
+  k,
+  attacks: [],
+  positions: Map.make(),
+  changed: false,
+  frame: -1,
+  player: makeBucket(),
+  opponent: makeBucket(),
+}
+
+let indices: WeakMap.t<Context.t, t> = WeakMap.make()
+
+/** The index shared by every attack and rule system of the context. */
+let forContext = (k: Context.t): t => {
+  switch indices->WeakMap.get(k) {
+  | Some(index) => index
+  | None => {
+      let index = make(k)
+      indices->WeakMap.set(k, index)->ignore
+      index
+    }
+  }
+}
+
+let register = (k: Context.t, attack: attack) => {
+  let index = forContext(k)
+  if !(index.positions->Map.has(attack)) {
+    index.positions->Map.set(attack, index.attacks->Array.length)
+    index.attacks->Array.push(attack)
+    index.changed = true
+  }
+}
+
+let unregister = (k: Context.t, attack: attack) => {
+  let index = forContext(k)
+  switch index.positions->Map.get(attack) {
+  | None => ()
+  | Some(position) => {
+      // Swap the last attack into the freed position
+      let last = index.attacks->Array.getUnsafe(index.attacks->Array.length - 1)
+      index.attacks->Array.setUnsafe(position, last)
+      index.positions->Map.set(last, position)
+      index.attacks->setLength(index.attacks->Array.length - 1)
+      index.positions->Map.delete(attack)->ignore
+      index.changed = true
+    }
+  }
+}
+
+let addToBucket = (bucket: bucket, attack: attack) => {
+  let slot = bucket.count
+  if slot == bucket.bounds->Array.length {
+    bucket.bounds->Array.push({minX: 0., minY: 0., maxX: 0., maxY: 0., width: 0., height: 0.})
+  }
+  let rect = attack->getWorldRect
+  let bounds = bucket.bounds->Array.getUnsafe(slot)
+  bounds.minX = rect.pos.x
+  bounds.minY = rect.pos.y
+  bounds.maxX = rect.pos.x + rect.width
+  bounds.maxY = rect.pos.y + rect.height
+  bounds.width = rect.width
+  bounds.height = rect.height
+  bucket.members->Array.setUnsafe(slot, attack)
+  bucket.count = slot + 1
+}
+
+/** Insertion sort, attacks barely move between frames so the previous order is almost sorted. */
+let sortSlots = (order: array<int>, count: int, key: int => float) => {
+  for i in 1 to count - 1 {
+    let slot = order->Array.getUnsafe(i)
+    let value = key(slot)
+    let j = ref(i - 1)
+    while j.contents >= 0 && key(order->Array.getUnsafe(j.contents)) > value {
+      order->Array.setUnsafe(j.contents + 1, order->Array.getUnsafe(j.contents))
+      j := j.contents - 1
+    }
+    order->Array.setUnsafe(j.contents + 1, slot)
+  }
+}
+
+let sortBucket = (bucket: bucket, ~reorder: bool) => {
+  let count = bucket.count
+  if reorder || bucket.byMinX->Array.length != count {
+    for slot in 0 to count - 1 {
+      bucket.byMinX->Array.setUnsafe(slot, slot)
+      bucket.byMaxX->Array.setUnsafe(slot, slot)
+    }
+    bucket.members->setLength(count)
+    bucket.byMinX->setLength(count)
+    bucket.byMaxX->setLength(count)
+    bucket.reachX->setLength(count)
+  }
+  sortSlots(bucket.byMinX, count, slot => (bucket.bounds->Array.getUnsafe(slot)).minX)
+  sortSlots(bucket.byMaxX, count, slot => (bucket.bounds->Array.getUnsafe(slot)).maxX)
+
+  let reach = ref(Float.Constants.negativeInfinity)
+  for position in 0 to count - 1 {
+    let bounds = bucket.bounds->Array.getUnsafe(bucket.byMinX->Array.getUnsafe(position))
+    if bounds.maxX > reach.contents {
+      reach := bounds.maxX
+    }
+    bucket.reachX->Array.setUnsafe(position, reach.contents)
+  }
+}
+
+/** Reads the world rect of every attack, at most once per frame. */
+let refresh = (index: t) => {
+  let frame = index.k.debug->Debug.numFrames
+  if index.changed || frame != index.frame {
+    index.player.count = 0
+    index.opponent.count = 0
+    index.attacks->Array.forEach(attack => {
+      // Pooled attacks stay in the scene, paused, while they wait to be reused
+      if attack->paused {
+        ()
+      } else if attack->is(Team.player) {
+        addToBucket(index.player, attack)
+      } else if attack->is(Team.opponent) {
+        addToBucket(index.opponent, attack)
+      }
+    })
+    sortBucket(index.player, ~reorder=index.changed)
+    sortBucket(index.opponent, ~reorder=index.changed)
+    index.changed = false
+    index.frame = frame
+  }
+}
+
+/**
+ * Forces the next query to read the world rects again.
+ * Needed when frames are stepped outside of Kaplay's loop, where `debug.numFrames` doesn't advance.
+ */
+let invalidate = (index: t) => {
+  index.frame = -1
+}
+
+let bucketOf = (index: t, team: Team.t): bucket => {
+  refresh(index)
+  switch team {
+  | Player => index.player
+  | Opponent => index.opponent
+  }
+}
+
+/** First position in `byMinX` of an attack that starts right of `x`. */
+let firstStartingAfter = (bucket: bucket, x: float): int => {
+  let low = ref(0)
+  let high = ref(bucket.count)
+  while low.contents < high.contents {
+    let middle = (low.contents + high.contents) / 2
+    let bounds = bucket.bounds->Array.getUnsafe(bucket.byMinX->Array.getUnsafe(middle))
+    if bounds.minX > x {
+      high := middle
+    } else {
+      low := middle + 1
+    }
+  }
+  low.contents
+}
+
+/** First position in `byMaxX` of an attack that ends at or right of `x`. */
+let firstEndingFrom = (bucket: bucket, x: float): int => {
+  let low = ref(0)
+  let high = ref(bucket.count)
+  while low.contents < high.contents {
+    let middle = (low.contents + high.contents) / 2
+    let bounds = bucket.bounds->Array.getUnsafe(bucket.byMaxX->Array.getUnsafe(middle))
+    if bounds.maxX >= x {
+      high := middle
+    } else {
+      low := middle + 1
+    }
+  }
+  low.contents
+}
+
+/** Number of attacks of the team. */
+let count = (index: t, team: Team.t): int => bucketOf(index, team).count
+
+/** Visits every attack of the team whose x-range overlaps `[minX, maxX]`, bounds included. */
+let forEachOverlappingX = (
+  index: t,
+  team: Team.t,
+  ~minX: float,
+  ~maxX: float,
+  visit: (attack, bounds) => unit,
+) => {
+  let bucket = bucketOf(index, team)
+  let position = ref(firstStartingAfter(bucket, maxX) - 1)
+  while position.contents >= 0 && bucket.reachX->Array.getUnsafe(position.contents) >= minX {
+    let slot = bucket.byMinX->Array.getUnsafe(position.contents)
+    let bounds = bucket.bounds->Array.getUnsafe(slot)
+    if bounds.maxX >= minX {
+      visit(bucket.members->Array.getUnsafe(slot), bounds)
+    }
+    position := position.contents - 1
+  }
+}
+
+/** Visits the attacks of the team that end left of `x`, nearest first, until `visit` returns false. */
+let forEachLeftOf = (index: t, team: Team.t, ~x: float, visit: (attack, bounds) => bool) => {
+  let bucket = bucketOf(index, team)
+  let position = ref(firstEndingFrom(bucket, x) - 1)
+  while position.contents >= 0 {
+    let slot = bucket.byMaxX->Array.getUnsafe(position.contents)
+    position :=
+      visit(bucket.members->Array.getUnsafe(slot), bucket.bounds->Array.getUnsafe(slot))
+        ? position.contents - 1
+        : -1
+  }
+}
+
+/** Visits the attacks of the team that start right of `x`, nearest first, until `visit` returns false. */
+let forEachRightOf = (index: t, team: Team.t, ~x: float, visit: (attack, bounds) => bool) => {
+  let bucket = bucketOf(index, team)
+  let position = ref(firstStartingAfter(bucket, x))
+  while position.contents < bucket.count {
+    let slot = bucket.byMinX->Array.getUnsafe(position.contents)
+    position :=
+      visit(bucket.members->Array.getUnsafe(slot), bucket.bounds->Array.getUnsafe(slot))
+        ? position.contents + 1
+        : bucket.count
+  }
+}
+
+/** The attack of the team that ends closest to `x` on its left. */
+let nearestLeftOf = (index: t, team: Team.t, ~x: float): option<attack> => {
+  let bucket = bucketOf(index, team)
+  let position = firstEndingFrom(bucket, x) - 1
+  position < 0
+    ? None
+    : Some(bucket.members->Array.getUnsafe(bucket.byMaxX->Array.getUnsafe(position)))
+}
+
+/** The attack of the team that starts closest to `x` on its right. */
+let nearestRightOf = (index: t, team: Team.t, ~x: float): option<attack> => {
+  let bucket = bucketOf(index, team)
+  let position = firstStartingAfter(bucket, x)
+  position < bucket.count
+    ? Some(bucket.members->Array.getUnsafe(bucket.byMinX->Array.getUnsafe(position)))
+    : None
+}
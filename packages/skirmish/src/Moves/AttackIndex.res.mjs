@@ -0,0 +1,268 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Team$Skirmish from "../Team.res.mjs";
+import * as Primitive_option from "@rescript/runtime/lib/es6/Primitive_option.mjs";
+
+function makeBucket() {
+  return {
+    count: 0,
+    members: [],
+    bounds: [],
+    byMinX: [],
+    byMaxX: [],
+    reachX: []
+  };
+}
+
+function make(k) {
+  return {
+    k: k,
+    attacks: [],
+    positions: new Map(),
+    changed: false,
+    frame: -1,
+    player: makeBucket(),
+    opponent: makeBucket()
+  };
+}
+
+let indices = new WeakMap();
+
+function forContext(k) {
+  let index = indices.get(k);
+  if (index !== undefined) {
+    return index;
+  }
+  let index$1 = make(k);
+  indices.set(k, index$1);
+  return index$1;
+}
+
+function register(k, attack) {
+  let index = forContext(k);
+  if (!index.positions.has(attack)) {
+    index.positions.set(attack, index.attacks.length);
+    index.attacks.push(attack);
+    index.changed = true;
+    return;
+  }
+}
+
+function unregister(k, attack) {
+  let index = forContext(k);
+  let position = index.positions.get(attack);
+  if (position === undefined) {
+    return;
+  }
+  let last = index.attacks[index.attacks.length - 1 | 0];
+  index.attacks[position] = last;
+  index.positions.set(last, position);
+  index.attacks.length = index.attacks.length - 1 | 0;
+  index.positions.delete(attack);
+  index.changed = true;
+}
+
+function addToBucket(bucket, attack) {
+  let slot = bucket.count;
+  if (slot === bucket.bounds.length) {
+    bucket.bounds.push({
+      minX: 0,
+      minY: 0,
+      maxX: 0,
+      maxY: 0,
+      width: 0,
+      height: 0
+    });
+  }
+  let rect = attack.getWorldRect();
+  let bounds = bucket.bounds[slot];
+  bounds.minX = rect.pos.x;
+  bounds.minY = rect.pos.y;
+  bounds.maxX = rect.pos.x + rect.width;
+  bounds.maxY = rect.pos.y + rect.height;
+  bounds.width = rect.width;
+  bounds.height = rect.height;
+  bucket.members[slot] = attack;
+  bucket.count = slot + 1 | 0;
+}
+
+function sortSlots(order, count, key) {
+  for (let i = 1; i < count; ++i) {
+    let slot = order[i];
+    let value = key(slot);
+    let j = i - 1 | 0;
+    while (j >= 0 && key(order[j]) > value) {
+      order[j + 1 | 0] = order[j];
+      j = j - 1 | 0;
+    };
+    order[j + 1 | 0] = slot;
+  }
+}
+
+function sortBucket(bucket, reorder) {
+  let count = bucket.count;
+  if (reorder || bucket.byMinX.length !== count) {
+    for (let slot = 0; slot < count; ++slot) {
+      bucket.byMinX[slot] = slot;
+      bucket.byMaxX[slot] = slot;
+    }
+    bucket.members.length = count;
+    bucket.byMinX.length = count;
+    bucket.byMaxX.length = count;
+    bucket.reachX.length = count;
+  }
+  sortSlots(bucket.byMinX, count, slot => bucket.bounds[slot].minX);
+  sortSlots(bucket.byMaxX, count, slot => bucket.bounds[slot].maxX);
+  let reach = Number.NEGATIVE_INFINITY;
+  for (let position = 0; position < count; ++position) {
+    let bounds = bucket.bounds[bucket.byMinX[position]];
+    if (bounds.maxX > reach) {
+      reach = bounds.maxX;
+    }
+    bucket.reachX[position] = reach;
+  }
+}
+
+function refresh(index) {
+  let frame = index.k.debug.numFrames();
+  if (!(index.changed || frame !== index.frame)) {
+    return;
+  }
+  index.player.count = 0;
+  index.opponent.count = 0;
+  index.attacks.forEach(attack => {
+    if (attack.paused) {
+      return;
+    } else if (attack.is(Team$Skirmish.player)) {
+      return addToBucket(index.player, attack);
+    } else if (attack.is(Team$Skirmish.opponent)) {
+      return addToBucket(index.opponent, attack);
+    } else {
+      return;
+    }
+  });
+  sortBucket(index.player, index.changed);
+  sortBucket(index.opponent, index.changed);
+  index.changed = false;
+  index.frame = frame;
+}
+
+function invalidate(index) {
+  index.frame = -1;
+}
+
+function bucketOf(index, team) {
+  refresh(index);
+  if (team) {
+    return index.player;
+  } else {
+    return index.opponent;
+  }
+}
+
+function firstStartingAfter(bucket, x) {
+  let low = 0;
+  let high = bucket.count;
+  while (low < high) {
+    let middle = (low + high | 0) / 2 | 0;
+    let bounds = bucket.bounds[bucket.byMinX[middle]];
+    if (bounds.minX > x) {
+      high = middle;
+    } else {
+      low = middle + 1 | 0;
+    }
+  };
+  return low;
+}
+
+function firstEndingFrom(bucket, x) {
+  let low = 0;
+  let high = bucket.count;
+  while (low < high) {
+    let middle = (low + high | 0) / 2 | 0;
+    let bounds = bucket.bounds[bucket.byMaxX[middle]];
+    if (bounds.maxX >= x) {
+      high = middle;
+    } else {
+      low = middle + 1 | 0;
+    }
+  };
+  return low;
+}
+
+function count(index, team) {
+  return bucketOf(index, team).count;
+}
+
+function forEachOverlappingX(index, team, minX, maxX, visit) {
+  let bucket = bucketOf(index, team);
+  let position = firstStartingAfter(bucket, maxX) - 1 | 0;
+  while (position >= 0 && bucket.reachX[position] >= minX) {
+    let slot = bucket.byMinX[position];
+    let bounds = bucket.bounds[slot];
+    if (bounds.maxX >= minX) {
+      visit(bucket.members[slot], bounds);
+    }
+    position = position - 1 | 0;
+  };
+}
+
+function forEachLeftOf(index, team, x, visit) {
+  let bucket = bucketOf(index, team);
+  let position = firstEndingFrom(bucket, x) - 1 | 0;
+  while (position >= 0) {
+    let slot = bucket.byMaxX[position];
+    position = visit(bucket.members[slot], bucket.bounds[slot]) ? position - 1 | 0 : -1;
+  };
+}
+
+function forEachRightOf(index, team, x, visit) {
+  let bucket = bucketOf(index, team);
+  let position = firstStartingAfter(bucket, x);
+  while (position < bucket.count) {
+    let slot = bucket.byMinX[position];
+    position = visit(bucket.members[slot], bucket.bounds[slot]) ? position + 1 | 0 : bucket.count;
+  };
+}
+
+function nearestLeftOf(index, team, x) {
+  let bucket = bucketOf(index, team);
+  let position = firstEndingFrom(bucket, x) - 1 | 0;
+  if (position < 0) {
+    return;
+  } else {
+    return Primitive_option.some(bucket.members[bucket.byMaxX[position]]);
+  }
+}
+
+function nearestRightOf(index, team, x) {
+  let bucket = bucketOf(index, team);
+  let position = firstStartingAfter(bucket, x);
+  if (position < bucket.count) {
+    return Primitive_option.some(bucket.members[bucket.byMinX[position]]);
+  }
+}
+
+export {
+  makeBucket,
+  make,
+  indices,
+  forContext,
+  register,
+  unregister,
+  addToBucket,
+  sortSlots,
+  sortBucket,
+  refresh,
+  invalidate,
+  bucketOf,
+  firstStartingAfter,
+  firstEndingFrom,
+  count,
+  forEachOverlappingX,
+  forEachLeftOf,
+  forEachRightOf,
+  nearestLeftOf,
+  nearestRightOf,
+}
+/* indices Not a pure module */
@@ -1,11 +1,15 @@
 open Kaplay
 
-type t
+type t = {
+  /** The Pokemon species that cast the flame, it doesn't hurt its own kind. */
+  mutable casterPokemonId: int,
+  /** Direction of the caster times the speed, updated in place when the flame is reused. */
+  velocity: Vec2.World.t,
+}
 
 include GameObjRaw.Comp({type t = t})
 include Sprite.Comp({type t = t})
 include Pos.Comp({type t = t})
-include Kaplay.Move.Comp({type t = t})
 include Anchor.Comp({type t = t})
 include Z.Comp({type t = t})
 include Area.Comp({type t = t})
@@ -14,53 +18,80 @@ include Attack.Comp({type t = t})
 let spriteName = "flame"
 
 let load = (k: Context.t) => {
-  k->Context.loadSprite(spriteName, "/sprites/moves/flame.png")
+  if !Atlas.load(k, [spriteName]) {
+    k->Context.loadSprite(spriteName, "/sprites/moves/flame.png")
+  }
 }
 
 let coolDown = 1.
+let speed = 120.
+let poolSize = 8
 
-let cast = (k: Context.t, pokemon: Pokemon.t) => {
-  // Use the pokemon's world position for the flame's position
-  // Because flame is using the move component, it will move based on a direction vector relative to the parent.
-  // That is why the pokemon cannot be the parent of the flame.
-  let pokemonWorldPos = pokemon->Pokemon.worldPos
+external initialState: t => Types.comp = "%identity"
 
-  let flame: t = k->Context.add(
-    [
+// Flames are reused, they are only added to the scene when every flame of the pool is in use.
+let makePool = (k: Context.t): Pool.t<t, Pokemon.t> =>
+  Pool.make(
+    k,
+    ~size=poolSize,
+    ~components=() => [
       addSprite(k, spriteName),
-      addPosFromWorldVec2(k, pokemonWorldPos),
-      addMove(k, pokemon.direction, 120.),
+      addPos(k, 0., 0.),
       addZ(k, -1),
       addArea(k),
-      pokemon.direction.y < 0. ? addAnchorBottom(k) : addAnchorTop(k),
-      Team.getTagComponent(pokemon.team),
-      ...addAttackWithTag(@this (flame: t) => {
+      addAnchorTop(k),
+      initialState({casterPokemonId: -1, velocity: k->Context.vec2World(0., 0.)}),
+      ...addAttackWithTag(k, @this (flame: t) => {
         Kaplay.Math.Rect.makeWorld(k, flame->worldPos, flame->getWidth, flame->getHeight)
       }),
     ],
+    ~listen=(pool, flame) => [
+      // The flame is not a child of the pokemon, it moves on its own.
+      flame->onUpdateWithController(() => flame->move(flame.velocity)),
+      flame->onCollideWithController(Pokemon.tag, (other: Pokemon.t, _collision) => {
+        if other.pokemonId != flame.casterPokemonId {
+          Console.log2("Ember hit", other.pokemonId)
+          other->Pokemon.setHp(other->Pokemon.getHp - 5)
+          pool->Pool.release(flame)
+        }
+      }),
+      flame->onCollideWithController(Wall.tag, (_: Wall.t, _collision) => {
+        pool->Pool.release(flame)
+      }),
+    ],
+    ~init=(flame, pokemon: Pokemon.t) => {
+      // Use the pokemon's world position for the flame's position
+      flame->setWorldPos(pokemon->Pokemon.worldPos)
+      flame.casterPokemonId = pokemon.pokemonId
+      flame.velocity->Vec2.World.setXY(pokemon.direction.x * speed, pokemon.direction.y * speed)
+      flame->setAnchor(pokemon.direction.y < 0. ? Bottom : Top)
+      flame->untag(Team.getTag(pokemon.team == Player ? Opponent : Player))
+      flame->addTag(Team.getTag(pokemon.team))
+    },
   )
 
-  flame->onCollide(Pokemon.tag, (other: Pokemon.t, _collision) => {
-    if other.pokemonId != pokemon.pokemonId {
-      Console.log2("Ember hit", other.pokemonId)
-      other->Pokemon.setHp(other->Pokemon.getHp - 5)
-      flame->destroy
-    }
-  })
+let pools: WeakMap.t<Context.t, Pool.t<t, Pokemon.t>> = WeakMap.make()
 
-  flame->onCollide(Wall.tag, (_: Wall.t, _collision) => {
-    flame->destroy
-  })
+let cast = (k: Context.t, pokemon: Pokemon.t) => {
+  let pool = switch pools->WeakMap.get(k) {
+  | Some(pool) => pool
+  | None => {
+      let pool = makePool(k)
+      pools->WeakMap.set(k, pool)->ignore
+      pool
+    }
+  }
+  pool->Pool.acquire(pokemon)->ignore
 }
 
 let addRulesForAI = (
   _k: Context.t,
-  rs: RuleSystem.t<PkmnMove.enemyAIRuleSystemState>,
+  rs: RuleSystem.Compiled.t<PkmnMove.enemyAIRuleSystemState>,
   _moveSlot: PkmnMove.moveSlot,
   factNames: PkmnMove.moveFactNames,
 ) => {
   // Ember attacks when safe: not under threat and move is available
-  rs->RuleSystem.addRuleExecutingAction(
+  rs->RuleSystem.addDerivedRule(
     rs => {
       // Check if not under threat (both preferred dodge facts should be 0.0)
       let RuleSystem.Grade(preferLeft) = rs->RuleSystem.gradeForFact(AIFacts.preferredDodgeLeft)
@@ -76,6 +107,7 @@ let addRulesForAI = (
     rs => {
       rs->RuleSystem.assertFact(AIFacts.shouldAttack)
     },
+    ~reads=[AIFacts.preferredDodgeLeft, AIFacts.preferredDodgeRight, factNames.available],
     ~salience=RuleSystem.Salience(30.0),
   )
 }
@@ -5,10 +5,12 @@ import * as Belt_Array from "@rescript/runtime/lib/es6/Belt_Array.mjs";
 import * as Pos$Kaplay from "@nojaf/rescript-kaplay/src/Components/Pos.res.mjs";
 import * as Area$Kaplay from "@nojaf/rescript-kaplay/src/Components/Area.res.mjs";
 import * as Math$Kaplay from "@nojaf/rescript-kaplay/src/Math.res.mjs";
-import * as Move$Kaplay from "@nojaf/rescript-kaplay/src/Components/Move.res.mjs";
+import * as Pool$Kaplay from "@nojaf/rescript-kaplay/src/Pool.res.mjs";
+import * as Vec2$Kaplay from "@nojaf/rescript-kaplay/src/Vec2.res.mjs";
 import * as Anchor$Kaplay from "@nojaf/rescript-kaplay/src/Components/Anchor.res.mjs";
 import * as Sprite$Kaplay from "@nojaf/rescript-kaplay/src/Components/Sprite.res.mjs";
 import * as Team$Skirmish from "../Team.res.mjs";
+import * as Atlas$Skirmish from "../Atlas.res.mjs";
 import * as Wall$Skirmish from "../Wall.res.mjs";
 import * as Attack$Skirmish from "./Attack.res.mjs";
 import * as AIFacts$Skirmish from "../EnemyAI/AIFacts.res.mjs";
@@ -21,8 +23,6 @@ Sprite$Kaplay.Comp({});
 
 Pos$Kaplay.Comp({});
 
-Move$Kaplay.Comp({});
-
 Anchor$Kaplay.Comp({});
 
 Z$Kaplay.Comp({});
@@ -36,41 +36,68 @@ let addAttackWithTag = include.addAttackWithTag;
 let spriteName = "flame";
 
 function load(k) {
-  k.loadSprite(spriteName, "/sprites/moves/flame.png");
+  if (!Atlas$Skirmish.load(k, [spriteName])) {
+    k.loadSprite(spriteName, "/sprites/moves/flame.png");
+    return;
+  }
 }
 
-function cast(k, pokemon) {
-  let pokemonWorldPos = pokemon.worldPos();
-  let flame = k.add(Belt_Array.concatMany([
+function makePool(k) {
+  return Pool$Kaplay.make(k, 8, () => Belt_Array.concatMany([
     [
       k.sprite(spriteName),
-      k.pos(pokemonWorldPos),
-      k.move(pokemon.direction, 120),
+      k.pos(0, 0),
       k.z(-1),
       k.area(),
-      pokemon.direction.y < 0 ? k.anchor("bot") : k.anchor("top"),
-      Team$Skirmish.getTagComponent(pokemon.team)
+      k.anchor("top"),
+      {
+        casterPokemonId: -1,
+        velocity: k.vec2(0, 0)
+      }
     ],
-    addAttackWithTag(function () {
+    addAttackWithTag(k, function () {
       let flame = this ;
       return Math$Kaplay.Rect.makeWorld(k, flame.worldPos(), flame.width, flame.height);
     })
-  ]));
-  flame.onCollide(Pokemon$Skirmish.tag, (other, _collision) => {
-    if (other.pokemonId !== pokemon.pokemonId) {
-      console.log("Ember hit", other.pokemonId);
-      other.hp = other.hp - 5 | 0;
-      flame.destroy();
-      return;
-    }
-  });
-  flame.onCollide(Wall$Skirmish.tag, (param, _collision) => {
-    flame.destroy();
+  ]), (pool, flame) => [
+    flame.onUpdate(() => {
+      flame.move(flame.velocity);
+    }),
+    flame.onCollide(Pokemon$Skirmish.tag, (other, _collision) => {
+      if (other.pokemonId !== flame.casterPokemonId) {
+        console.log("Ember hit", other.pokemonId);
+        other.hp = other.hp - 5 | 0;
+        return Pool$Kaplay.release(pool, flame);
+      }
+    }),
+    flame.onCollide(Wall$Skirmish.tag, (param, _collision) => Pool$Kaplay.release(pool, flame))
+  ], (flame, pokemon) => {
+    flame.worldPos(pokemon.worldPos());
+    flame.casterPokemonId = pokemon.pokemonId;
+    Vec2$Kaplay.World.setXY(flame.velocity, pokemon.direction.x * 120, pokemon.direction.y * 120);
+    flame.anchor = pokemon.direction.y < 0 ? "bot" : "top";
+    flame.untag(Team$Skirmish.getTag(pokemon.team !== true));
+    flame.tag(Team$Skirmish.getTag(pokemon.team));
   });
 }
 
+let pools = new WeakMap();
+
+function cast(k, pokemon) {
+  let pool = pools.get(k);
+  let pool$1;
+  if (pool !== undefined) {
+    pool$1 = pool;
+  } else {
+    let pool$2 = makePool(k);
+    pools.set(k, pool$2);
+    pool$1 = pool$2;
+  }
+  Pool$Kaplay.acquire(pool$1, pokemon);
+}
+
 function addRulesForAI(_k, rs, _moveSlot, factNames) {
-  rs.addRuleExecutingAction(rs => {
+  rs.addDerivedRule(rs => {
     let preferLeft = rs.gradeForFact(AIFacts$Skirmish.preferredDodgeLeft);
     let preferRight = rs.gradeForFact(AIFacts$Skirmish.preferredDodgeRight);
     let notUnderThreat = preferLeft === 0.0 && preferRight === 0.0;
@@ -83,7 +110,11 @@ function addRulesForAI(_k, rs, _moveSlot, factNames) {
     }
   }, rs => {
     rs.assertFact(AIFacts$Skirmish.shouldAttack);
-  }, 30.0);
+  }, [
+    AIFacts$Skirmish.preferredDodgeLeft,
+    AIFacts$Skirmish.preferredDodgeRight,
+    factNames.available
+  ], 30.0);
 }
 
 let move_cast = cast;
@@ -98,19 +129,27 @@ let move = {
   addRulesForAI: addRulesForAI
 };
 
-let getClosestCorner = include.getClosestCorner;
+let getClosestCornerInto = include.getClosestCornerInto;
 
 let addAttack = include.addAttack;
 
 let coolDown = 1;
 
+let speed = 120;
+
+let poolSize = 8;
+
 export {
-  getClosestCorner,
+  getClosestCornerInto,
   addAttack,
   addAttackWithTag,
   spriteName,
   load,
   coolDown,
+  speed,
+  poolSize,
+  makePool,
+  pools,
   cast,
   addRulesForAI,
   move,
@@ -70,7 +70,7 @@ let cast = (k: Context.t, pokemon: Pokemon.t) => {
   )
 
   pokemon->Pokemon.use(
-    Attack.Unit.addAttack(@this _ => {
+    Attack.Unit.addAttack(k, @this _ => {
       let pokemonWorldPos =
         pokemon->Pokemon.worldPos->Vec2.World.addWithXY(-pokemon.halfSize, -pokemon.halfSize)
       let rect = Kaplay.Math.Rect.makeWorld(
@@ -57,7 +57,7 @@ function cast(k, pokemon) {
     u_resolution: k.vec2(pokemon.width, pokemon.height),
     u_color: k.Color.fromHex("#f0f9ff")
   })));
-  pokemon.use(Attack$Skirmish.Unit.addAttack(function () {
+  pokemon.use(Attack$Skirmish.Unit.addAttack(k, function () {
     let pokemonWorldPos = pokemon.worldPos().add(- pokemon.halfSize, - pokemon.halfSize);
     return Math$Kaplay.Rect.makeWorld(k, pokemonWorldPos, pokemon.width, pokemon.height);
   }));
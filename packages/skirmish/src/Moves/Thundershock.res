@@ -2,10 +2,34 @@ open Kaplay
 open GameContext
 module Math = Kaplay.Math
 
+/** The rect a Pokemon had when it was last checked against the bolt. */
+type checkedPokemon = {
+  mutable minX: float,
+  mutable minY: float,
+  mutable maxX: float,
+  mutable maxY: float,
+  /** The segments of the bolt before this one were checked against the rect. */
+  mutable segments: int,
+}
+
 type t = {
+  /** Preallocated when the bolt is cast, only the first `pointCount` points are part of the bolt. */
   points: array<Vec2.World.t>,
-  timerRef: Kaplay.TimerController.t,
+  mutable pointCount: int,
+  /** Preallocated like `points`, the bolt in local coordinates is written into these every frame. */
+  localBuffer: array<Vec2.Local.t>,
+  /** The first `pointCount` vectors of `localBuffer`, the points passed to `drawLines`. */
+  localPoints: array<Vec2.Local.t>,
+  /** The Pokemon that cast the bolt, `None` while the bolt is in the pool. */
+  mutable caster: option<Pokemon.t>,
+  mutable direction: Vec2.World.t,
+  /** Seconds since the last part of the bolt was added, or since the bolt stopped. */
+  mutable elapsed: float,
+  /** The bolt stopped growing, it lingers for a moment before it goes back to the pool. */
+  mutable stopped: bool,
   mutable worldRect: Types.rect<Vec2.World.t>,
+  /** Per Pokemon id, cleared when the bolt is cast. */
+  checked: Map.t<int, checkedPokemon>,
 }
 
 include Pos.Comp({type t = t})
@@ -32,13 +56,25 @@ let load = (): unit => {
 
 let lighting = k->Color.fromHex("#fef9c2")
 
+@set
+external setLength: (array<'a>, int) => unit = "length"
+
 let draw =
   @this
   (t: t) => {
-    // Convert world coordinates to local coordinates for drawing
-    let localPoints = t.points->Array.map(point => t->fromWorld(point))
+    // Convert world coordinates to local coordinates for drawing.
+    // The bolt is not a child of another object, so a local point is the world point minus its position.
+    let posX = t->getPosX
+    let posY = t->getPosY
+    t.localPoints->setLength(t.pointCount)
+    for i in 0 to t.pointCount - 1 {
+      let point = t.points->Array.getUnsafe(i)
+      let localPoint = t.localBuffer->Array.getUnsafe(i)
+      localPoint->Vec2.Local.setXY(point.x - posX, point.y - posY)
+      t.localPoints->Array.setUnsafe(i, localPoint)
+    }
     k->Context.drawLines({
-      pts: localPoints,
+      pts: t.localPoints,
       width: 2.,
       color: lighting,
       cap: Square,
@@ -61,8 +97,9 @@ let drawInspect =
     })
   }
 
-// Add a new point at a fixed interval using a timer loop
+// Add a new point at a fixed interval
 let intervalSeconds = 0.050
+let lingerSeconds = 5. * intervalSeconds
 let coolDown = 1.
 let deviationOffset = 7.
 let distance = 40.
@@ -70,12 +107,14 @@ let distance = 40.
 let up: Vec2.World.t = k->Context.vec2Up->Vec2.Unit.asWorld->Vec2.World.scaleWith(distance)
 let down: Vec2.World.t = k->Context.vec2Down->Vec2.Unit.asWorld->Vec2.World.scaleWith(distance)
 
+/** A bolt moves `distance` per part until it leaves the field, so it never has more points than this. */
+let maxPoints = (k: Context.t): int =>
+  Float.toInt(Stdlib_Math.ceil(k->Context.height / distance)) + 2
+
 external initialState: t => Types.comp = "%identity"
 
-let expandRectWithPoint = (
-  currentRect: Types.rect<Vec2.World.t>,
-  newPoint: Vec2.World.t,
-): Types.rect<Vec2.World.t> => {
+// Grows the rect in place so it contains the new point, no new rect or vector is allocated.
+let expandRectWithPoint = (currentRect: Types.rect<Vec2.World.t>, newPoint: Vec2.World.t): unit => {
   let currentMinX = currentRect.pos.x
   let currentMaxX = currentRect.pos.x + currentRect.width
   let currentMinY = currentRect.pos.y
@@ -86,116 +125,283 @@ let expandRectWithPoint = (
   let newMinY = Stdlib_Math.min(currentMinY, newPoint.y)
   let newMaxY = Stdlib_Math.max(currentMaxY, newPoint.y)
 
-  let newWidth = newMaxX - newMinX
-  let newHeight = newMaxY - newMinY
-
-  Math.Rect.makeWorld(k, k->Context.vec2World(newMinX, newMinY), newWidth, newHeight)
+  currentRect.pos->Vec2.World.setXY(newMinX, newMinY)
+  currentRect.width = newMaxX - newMinX
+  currentRect.height = newMaxY - newMinY
 }
 
-let destroy = (pokemon: Pokemon.t, thundershock: t) => {
-  thundershock.timerRef->Kaplay.TimerController.cancel
+/** Liang-Barsky clipping of the segment against the rect, touching the edge counts as a hit. */
+let segmentIntersectsRect = (
+  ~fromX: float,
+  ~fromY: float,
+  ~toX: float,
+  ~toY: float,
+  ~minX: float,
+  ~minY: float,
+  ~maxX: float,
+  ~maxY: float,
+): bool => {
+  let enter = ref(0.)
+  let exit = ref(1.)
 
-  k->Context.wait(5. * intervalSeconds, () => {
-    // Remove the shader from the Pokemon
-    pokemon->Pokemon.unuse(Shader.id)
+  let dx = toX - fromX
+  if dx == 0. {
+    if fromX < minX || fromX > maxX {
+      exit := -1.
+    }
+  } else {
+    let t1 = (minX - fromX) / dx
+    let t2 = (maxX - fromX) / dx
+    enter := Stdlib_Math.max(enter.contents, Stdlib_Math.min(t1, t2))
+    exit := Stdlib_Math.min(exit.contents, Stdlib_Math.max(t1, t2))
+  }
+
+  let dy = toY - fromY
+  if dy == 0. {
+    if fromY < minY || fromY > maxY {
+      exit := -1.
+    }
+  } else {
+    let t1 = (minY - fromY) / dy
+    let t2 = (maxY - fromY) / dy
+    enter := Stdlib_Math.max(enter.contents, Stdlib_Math.min(t1, t2))
+    exit := Stdlib_Math.min(exit.contents, Stdlib_Math.max(t1, t2))
+  }
 
-    // Allow the Pokemon to move again
-    pokemon.mobility = CanMove
-    // Destroy the Thundershock game object
-    thundershock->destroy
-  })
+  enter.contents <= exit.contents
 }
 
-let nextPartOfBolt = (
-  pokemon: Pokemon.t,
-  otherPokemon: array<Pokemon.t>,
-  direction: Vec2.World.t,
+/**
+ * Whether a segment of the bolt, starting at segment `first`, touches the rect.
+ * The bounds of the whole bolt reject rects far away, so most Pokemon are never checked per segment.
+ */
+let segmentsIntersectRect = (
   thundershock: t,
-  (),
-) => {
-  // Propose the next point in world coordinates
-  let candidate: Vec2.World.t = {
-    let pkmnWorldPos = pokemon->Pokemon.worldPos
-    // We use the last point.y + direction.y as the starting point for the next part of the bolt
-    let lastPoint = switch thundershock.points->Array.last {
-    | Some(point) => point
-    | None => pkmnWorldPos
+  ~first: int,
+  ~minX: float,
+  ~minY: float,
+  ~maxX: float,
+  ~maxY: float,
+): bool => {
+  let bounds = thundershock.worldRect
+  if (
+    maxX < bounds.pos.x ||
+    minX > bounds.pos.x + bounds.width ||
+    maxY < bounds.pos.y ||
+    minY > bounds.pos.y + bounds.height
+  ) {
+    false
+  } else {
+    let hit = ref(false)
+    let i = ref(first + 1)
+    while !hit.contents && i.contents < thundershock.pointCount {
+      let previous = thundershock.points->Array.getUnsafe(i.contents - 1)
+      let point = thundershock.points->Array.getUnsafe(i.contents)
+      hit :=
+        segmentIntersectsRect(
+          ~fromX=previous.x,
+          ~fromY=previous.y,
+          ~toX=point.x,
+          ~toY=point.y,
+          ~minX,
+          ~minY,
+          ~maxX,
+          ~maxY,
+        )
+      i := i.contents + 1
     }
+    hit.contents
+  }
+}
 
-    // We determine the deviation in the x direction, which is a random value between -deviationOffset and deviationOffset
-    // Note that the pokemon is anchored in the center.
-    let deviationX = k->Context.randf(-1. * deviationOffset, deviationOffset)
-    k->Context.vec2World(pkmnWorldPos.x + deviationX, lastPoint.y + direction.y)
+/**
+ * The first segment of the bolt the Pokemon still has to be checked against.
+ * Only the new segment when the Pokemon kept its rect, the whole bolt when it moved or was not checked before.
+ */
+let firstUncheckedSegment = (
+  thundershock: t,
+  pokemon: Pokemon.t,
+  ~minX: float,
+  ~minY: float,
+  ~maxX: float,
+  ~maxY: float,
+): int => {
+  let id = pokemon->Pokemon.getId
+  let checked = switch thundershock.checked->Map.get(id) {
+  | Some(checked) => checked
+  | None => {
+      let checked = {minX, minY, maxX, maxY, segments: 0}
+      thundershock.checked->Map.set(id, checked)
+      checked
+    }
+  }
+  if checked.minX != minX || checked.minY != minY || checked.maxX != maxX || checked.maxY != maxY {
+    checked.minX = minX
+    checked.minY = minY
+    checked.maxX = maxX
+    checked.maxY = maxY
+    checked.segments = 0
   }
+  let first = checked.segments
+  checked.segments = thundershock.pointCount - 1
+  first
+}
 
-  let validCandidate = Math.Rect.containsWorld(Wall.worldRect, candidate)
-  let safeCandidate = validCandidate
-    ? candidate
-    : {
-        // Cap the last point to the game bounds edge, then stop
-        k->Context.vec2World(
-          k->Context.clampFloat(candidate.x, 0., k->Context.width),
-          k->Context.clampFloat(candidate.y, 0., k->Context.height),
-        )
-      }
+let stop = (thundershock: t) => {
+  thundershock.stopped = true
+  thundershock.elapsed = 0.
+}
+
+let nextPartOfBolt = (pokemon: Pokemon.t, thundershock: t) => {
+  let pkmnWorldPos = pokemon->Pokemon.worldPos
+  // We use the last point.y + direction.y as the starting point for the next part of the bolt
+  let lastPoint = thundershock.points->Array.getUnsafe(thundershock.pointCount - 1)
 
-  thundershock.points->Array.push(safeCandidate)
-  thundershock.worldRect = expandRectWithPoint(thundershock.worldRect, safeCandidate)
+  // Propose the next point in world coordinates, written straight into the point buffer.
+  // We determine the deviation in the x direction, which is a random value between -deviationOffset and deviationOffset
+  // Note that the pokemon is anchored in the center.
+  let deviationX = k->Context.randf(-1. * deviationOffset, deviationOffset)
+  let candidate = thundershock.points->Array.getUnsafe(thundershock.pointCount)
+  candidate->Vec2.World.setXY(pkmnWorldPos.x + deviationX, lastPoint.y + thundershock.direction.y)
 
+  let validCandidate = Math.Rect.containsWorld(Wall.worldRect, candidate)
   if !validCandidate {
-    // Schedule own destruction
-    destroy(pokemon, thundershock)
+    // Cap the last point to the game bounds edge, then stop
+    candidate->Vec2.World.setXY(
+      k->Context.clampFloat(candidate.x, 0., k->Context.width),
+      k->Context.clampFloat(candidate.y, 0., k->Context.height),
+    )
   }
 
-  // Check collision with other Pokemon (candidate is already in world coordinates)
-  otherPokemon->Array.forEach(otherPokemon => {
-    // All points should be check here, not just the last one
-    if thundershock.points->Array.some(point => otherPokemon->Pokemon.hasPoint(point)) {
-      otherPokemon->Pokemon.setHp(otherPokemon->Pokemon.getHp - 5)
-      destroy(pokemon, thundershock)
+  thundershock.pointCount = thundershock.pointCount + 1
+  expandRectWithPoint(thundershock.worldRect, candidate)
+
+  // Pokemon are queried every time, a Pokemon that moved or joined later is checked against the whole bolt,
+  // so it is also hit by an earlier part of it. The others are only checked against the new segment.
+  let hit = ref(false)
+  let allPokemon: array<Pokemon.t> = k->Context.query({include_: [Pokemon.tag]})
+  for i in 0 to allPokemon->Array.length - 1 {
+    let otherPokemon = allPokemon->Array.getUnsafe(i)
+    if otherPokemon->Pokemon.getId != pokemon->Pokemon.getId {
+      // Pokemon are anchored in the center
+      let otherPos = otherPokemon->Pokemon.worldPos
+      let halfWidth = otherPokemon->Pokemon.getWidth / 2.
+      let halfHeight = otherPokemon->Pokemon.getHeight / 2.
+      let minX = otherPos.x - halfWidth
+      let minY = otherPos.y - halfHeight
+      let maxX = otherPos.x + halfWidth
+      let maxY = otherPos.y + halfHeight
+      let first = firstUncheckedSegment(thundershock, otherPokemon, ~minX, ~minY, ~maxX, ~maxY)
+      if segmentsIntersectRect(thundershock, ~first, ~minX, ~minY, ~maxX, ~maxY) {
+        otherPokemon->Pokemon.setHp(otherPokemon->Pokemon.getHp - 5)
+        hit := true
+      }
     }
-  })
+  }
+
+  // The buffer only runs out if the field is resized during the bolt
+  if (
+    !validCandidate || hit.contents || thundershock.pointCount == thundershock.points->Array.length
+  ) {
+    stop(thundershock)
+  }
 }
 
-let cast = (pokemon: Pokemon.t) => {
-  // Prevent the Pokemon from moving while the Thundershock is active
-  pokemon.mobility = CannotMove
+let update = (pool: Pool.t<t, Pokemon.t>, thundershock: t) => {
+  switch thundershock.caster {
+  | None => ()
+  | Some(pokemon) => {
+      thundershock.elapsed = thundershock.elapsed + k->Context.dt
+      if !thundershock.stopped {
+        while !thundershock.stopped && thundershock.elapsed >= intervalSeconds {
+          thundershock.elapsed = thundershock.elapsed - intervalSeconds
+          nextPartOfBolt(pokemon, thundershock)
+        }
+      } else if thundershock.elapsed >= lingerSeconds {
+        // Remove the shader from the Pokemon
+        pokemon->Pokemon.unuse(Shader.id)
+
+        // Allow the Pokemon to move again
+        pokemon.mobility = CanMove
+        thundershock.caster = None
+        pool->Pool.release(thundershock)
+      }
+    }
+  }
+}
+
+let init = (thundershock: t, pokemon: Pokemon.t) => {
+  // The bolt starts at the Pokemon
+  let pkmnWorldPos = pokemon->Pokemon.worldPos
+  thundershock.points->Array.getUnsafe(0)->Vec2.World.copyInto(pkmnWorldPos)
+  thundershock.pointCount = 1
+  thundershock.worldRect.pos->Vec2.World.copyInto(pkmnWorldPos)
+  thundershock.worldRect.width = 0.
+  thundershock.worldRect.height = 0.
+  thundershock.checked->Map.clear
 
   // Thundershock is either up or down, so we need to get the direction
   // We used cached vectors with the distance already applied to them
-  let direction = pokemon.facing == FacingUp ? up : down
+  thundershock.direction = pokemon.facing == FacingUp ? up : down
+  thundershock.caster = Some(pokemon)
+  thundershock.elapsed = 0.
+  thundershock.stopped = false
 
-  let otherPokemon =
-    k
-    ->Context.query({
-      include_: ["pokemon"],
-    })
-    ->Array.filter(p => p->Pokemon.getId != pokemon->Pokemon.getId)
+  thundershock->untag(Team.getTag(pokemon.team == Player ? Opponent : Player))
+  thundershock->addTag(Team.getTag(pokemon.team))
+}
+
+// A Pokemon casts one bolt at a time, so the pool rarely grows beyond the number of Pokemon.
+let poolSize = 2
 
-  let thundershock: t = pokemon->Pokemon.addChild(
-    [
+let makePool = (k: Context.t): Pool.t<t, Pokemon.t> =>
+  Pool.make(
+    k,
+    ~size=poolSize,
+    ~components=() => [
+      // The points are in world coordinates, the bolt is not a child of the Pokemon
       k->addPos(0., 0.),
       k->addZ(-1),
-      Team.getTagComponent(pokemon.team),
       CustomComponent.make({
         id: "thundershock",
         draw,
         drawInspect,
       }),
-      ...addAttackWithTag(@this (thundershock: t) => thundershock.worldRect),
+      initialState({
+        points: Array.fromInitializer(~length=maxPoints(k), _ => k->Context.vec2World(0., 0.)),
+        pointCount: 0,
+        localBuffer: Array.fromInitializer(~length=maxPoints(k), _ => k->Context.vec2Local(0., 0.)),
+        localPoints: [],
+        caster: None,
+        direction: up,
+        elapsed: 0.,
+        stopped: true,
+        worldRect: Kaplay.Math.Rect.makeWorld(k, k->Context.vec2World(0., 0.), 0., 0.),
+        checked: Map.make(),
+      }),
+      ...addAttackWithTag(k, @this (thundershock: t) => thundershock.worldRect),
+    ],
+    ~listen=(pool, thundershock) => [
+      thundershock->onUpdateWithController(() => update(pool, thundershock)),
     ],
+    ~init,
   )
 
-  thundershock->use(
-    initialState({
-      points: [pokemon->Pokemon.worldPos],
-      worldRect: Kaplay.Math.Rect.makeWorld(k, pokemon->Pokemon.worldPos, 0., 0.),
-      timerRef: k->Context.loopWithController(
-        intervalSeconds,
-        nextPartOfBolt(pokemon, otherPokemon, direction, thundershock, ...),
-      ),
-    }),
-  )
+let pools: WeakMap.t<Context.t, Pool.t<t, Pokemon.t>> = WeakMap.make()
+
+let cast = (k: Context.t, pokemon: Pokemon.t) => {
+  // Prevent the Pokemon from moving while the Thundershock is active
+  pokemon.mobility = CannotMove
+
+  let pool = switch pools->WeakMap.get(k) {
+  | Some(pool) => pool
+  | None => {
+      let pool = makePool(k)
+      pools->WeakMap.set(k, pool)->ignore
+      pool
+    }
+  }
+  pool->Pool.acquire(pokemon)->ignore
 
   pokemon->Pokemon.use(
     addShader(k, "glow", ~uniform=() =>
@@ -217,6 +423,6 @@ let move: PkmnMove.t = {
   maxPP: 25,
   baseDamage: 40,
   coolDownDuration: coolDown,
-  cast: (_k, pkmn) => cast(pkmn->Pokemon.fromAbstractPkmn),
+  cast: (k, pkmn) => cast(k, pkmn->Pokemon.fromAbstractPkmn),
   addRulesForAI: (_k, _rs, _slot, _facts) => (),
 }
@@ -3,13 +3,16 @@
 import * as Z$Kaplay from "@nojaf/rescript-kaplay/src/Components/Z.res.mjs";
 import * as Belt_Array from "@rescript/runtime/lib/es6/Belt_Array.mjs";
 import * as Pos$Kaplay from "@nojaf/rescript-kaplay/src/Components/Pos.res.mjs";
+import * as Pool$Kaplay from "@nojaf/rescript-kaplay/src/Pool.res.mjs";
 import * as Math$Kaplay from "@nojaf/rescript-kaplay/src/Math.res.mjs";
+import * as Vec2$Kaplay from "@nojaf/rescript-kaplay/src/Vec2.res.mjs";
 import * as Stdlib_Array from "@rescript/runtime/lib/es6/Stdlib_Array.mjs";
 import * as Anchor$Kaplay from "@nojaf/rescript-kaplay/src/Components/Anchor.res.mjs";
 import * as Shader$Kaplay from "@nojaf/rescript-kaplay/src/Components/Shader.res.mjs";
 import * as Team$Skirmish from "../Team.res.mjs";
 import * as Wall$Skirmish from "../Wall.res.mjs";
 import * as Attack$Skirmish from "./Attack.res.mjs";
+import * as Pokemon$Skirmish from "../Pokemon.res.mjs";
 import * as GameObjRaw$Kaplay from "@nojaf/rescript-kaplay/src/Components/GameObjRaw.res.mjs";
 import * as GameContext$Skirmish from "../GameContext.res.mjs";
 import GlowFragraw from "../../shaders/glow.frag?raw";
@@ -46,9 +49,17 @@ let lighting = GameContext$Skirmish.k.Color.fromHex("#fef9c2");
 
 function draw() {
   let t = this ;
-  let localPoints = t.points.map(point => t.fromWorld(point));
+  let posX = t.pos.x;
+  let posY = t.pos.y;
+  t.localPoints.length = t.pointCount;
+  for (let i = 0, i_finish = t.pointCount; i < i_finish; ++i) {
+    let point = t.points[i];
+    let localPoint = t.localBuffer[i];
+    Vec2$Kaplay.Local.setXY(localPoint, point.x - posX, point.y - posY);
+    t.localPoints[i] = localPoint;
+  }
   GameContext$Skirmish.k.drawLines({
-    pts: localPoints,
+    pts: t.localPoints,
     color: lighting,
     width: 2,
     cap: "square"
@@ -70,10 +81,16 @@ function drawInspect() {
   });
 }
 
+let lingerSeconds = 5 * 0.050;
+
 let up = GameContext$Skirmish.k.Vec2.UP.scale(40);
 
 let down = GameContext$Skirmish.k.Vec2.DOWN.scale(40);
 
+function maxPoints(k) {
+  return (Math.ceil(k.height() / 40) | 0) + 2 | 0;
+}
+
 function expandRectWithPoint(currentRect, newPoint) {
   let currentMinX = currentRect.pos.x;
   let currentMaxX = currentRect.pos.x + currentRect.width;
@@ -83,69 +100,212 @@ function expandRectWithPoint(currentRect, newPoint) {
   let newMaxX = Math.max(currentMaxX, newPoint.x);
   let newMinY = Math.min(currentMinY, newPoint.y);
   let newMaxY = Math.max(currentMaxY, newPoint.y);
-  let newWidth = newMaxX - newMinX;
-  let newHeight = newMaxY - newMinY;
-  return Math$Kaplay.Rect.makeWorld(GameContext$Skirmish.k, GameContext$Skirmish.k.vec2(newMinX, newMinY), newWidth, newHeight);
+  Vec2$Kaplay.World.setXY(currentRect.pos, newMinX, newMinY);
+  currentRect.width = newMaxX - newMinX;
+  currentRect.height = newMaxY - newMinY;
+}
+
+function segmentIntersectsRect(fromX, fromY, toX, toY, minX, minY, maxX, maxY) {
+  let enter = 0;
+  let exit = 1;
+  let dx = toX - fromX;
+  if (dx === 0) {
+    if (fromX < minX || fromX > maxX) {
+      exit = -1;
+    }
+  } else {
+    let t1 = (minX - fromX) / dx;
+    let t2 = (maxX - fromX) / dx;
+    enter = Math.max(enter, Math.min(t1, t2));
+    exit = Math.min(exit, Math.max(t1, t2));
+  }
+  let dy = toY - fromY;
+  if (dy === 0) {
+    if (fromY < minY || fromY > maxY) {
+      exit = -1;
+    }
+  } else {
+    let t1$1 = (minY - fromY) / dy;
+    let t2$1 = (maxY - fromY) / dy;
+    enter = Math.max(enter, Math.min(t1$1, t2$1));
+    exit = Math.min(exit, Math.max(t1$1, t2$1));
+  }
+  return enter <= exit;
+}
+
+function segmentsIntersectRect(thundershock, first, minX, minY, maxX, maxY) {
+  let bounds = thundershock.worldRect;
+  if (maxX < bounds.pos.x || minX > bounds.pos.x + bounds.width || maxY < bounds.pos.y || minY > bounds.pos.y + bounds.height) {
+    return false;
+  }
+  let hit = false;
+  let i = first + 1 | 0;
+  while (!hit && i < thundershock.pointCount) {
+    let previous = thundershock.points[i - 1 | 0];
+    let point = thundershock.points[i];
+    hit = segmentIntersectsRect(previous.x, previous.y, point.x, point.y, minX, minY, maxX, maxY);
+    i = i + 1 | 0;
+  };
+  return hit;
+}
+
+function firstUncheckedSegment(thundershock, pokemon, minX, minY, maxX, maxY) {
+  let id = pokemon.id;
+  let checked = thundershock.checked.get(id);
+  let checked$1;
+  if (checked !== undefined) {
+    checked$1 = checked;
+  } else {
+    let checked$2 = {
+      minX: minX,
+      minY: minY,
+      maxX: maxX,
+      maxY: maxY,
+      segments: 0
+    };
+    thundershock.checked.set(id, checked$2);
+    checked$1 = checked$2;
+  }
+  if (checked$1.minX !== minX || checked$1.minY !== minY || checked$1.maxX !== maxX || checked$1.maxY !== maxY) {
+    checked$1.minX = minX;
+    checked$1.minY = minY;
+    checked$1.maxX = maxX;
+    checked$1.maxY = maxY;
+    checked$1.segments = 0;
+  }
+  let first = checked$1.segments;
+  checked$1.segments = thundershock.pointCount - 1 | 0;
+  return first;
 }
 
-function destroy(pokemon, thundershock) {
-  thundershock.timerRef.cancel();
-  GameContext$Skirmish.k.wait(5 * 0.050, () => {
-    pokemon.unuse(Shader$Kaplay.id);
-    pokemon.mobility = true;
-    thundershock.destroy();
+function stop(thundershock) {
+  thundershock.stopped = true;
+  thundershock.elapsed = 0;
+}
+
+function nextPartOfBolt(pokemon, thundershock) {
+  let pkmnWorldPos = pokemon.worldPos();
+  let lastPoint = thundershock.points[thundershock.pointCount - 1 | 0];
+  let deviationX = GameContext$Skirmish.k.rand(-1 * 7, 7);
+  let candidate = thundershock.points[thundershock.pointCount];
+  Vec2$Kaplay.World.setXY(candidate, pkmnWorldPos.x + deviationX, lastPoint.y + thundershock.direction.y);
+  let validCandidate = Wall$Skirmish.worldRect.contains(candidate);
+  if (!validCandidate) {
+    Vec2$Kaplay.World.setXY(candidate, GameContext$Skirmish.k.clamp(candidate.x, 0, GameContext$Skirmish.k.width()), GameContext$Skirmish.k.clamp(candidate.y, 0, GameContext$Skirmish.k.height()));
+  }
+  thundershock.pointCount = thundershock.pointCount + 1 | 0;
+  expandRectWithPoint(thundershock.worldRect, candidate);
+  let hit = false;
+  let allPokemon = GameContext$Skirmish.k.query({
+    include: [Pokemon$Skirmish.tag]
   });
+  for (let i = 0, i_finish = allPokemon.length; i < i_finish; ++i) {
+    let otherPokemon = allPokemon[i];
+    if (otherPokemon.id !== pokemon.id) {
+      let otherPos = otherPokemon.worldPos();
+      let halfWidth = otherPokemon.width / 2;
+      let halfHeight = otherPokemon.height / 2;
+      let minX = otherPos.x - halfWidth;
+      let minY = otherPos.y - halfHeight;
+      let maxX = otherPos.x + halfWidth;
+      let maxY = otherPos.y + halfHeight;
+      let first = firstUncheckedSegment(thundershock, otherPokemon, minX, minY, maxX, maxY);
+      if (segmentsIntersectRect(thundershock, first, minX, minY, maxX, maxY)) {
+        otherPokemon.hp = otherPokemon.hp - 5 | 0;
+        hit = true;
+      }
+    }
+  }
+  if (!validCandidate || hit || thundershock.pointCount === thundershock.points.length) {
+    return stop(thundershock);
+  }
 }
 
-function cast(pokemon) {
-  pokemon.mobility = false;
-  let direction = pokemon.facing === true ? up : down;
-  let otherPokemon = GameContext$Skirmish.k.query({
-    include: ["pokemon"]
-  }).filter(p => p.id !== pokemon.id);
-  let thundershock = pokemon.add(Belt_Array.concatMany([
+function update(pool, thundershock) {
+  let pokemon = thundershock.caster;
+  if (pokemon === undefined) {
+    return;
+  }
+  thundershock.elapsed = thundershock.elapsed + GameContext$Skirmish.k.dt();
+  if (!thundershock.stopped) {
+    while (!thundershock.stopped && thundershock.elapsed >= 0.050) {
+      thundershock.elapsed = thundershock.elapsed - 0.050;
+      nextPartOfBolt(pokemon, thundershock);
+    };
+    return;
+  }
+  if (thundershock.elapsed < lingerSeconds) {
+    return;
+  }
+  pokemon.unuse(Shader$Kaplay.id);
+  pokemon.mobility = true;
+  thundershock.caster = undefined;
+  Pool$Kaplay.release(pool, thundershock);
+}
+
+function init(thundershock, pokemon) {
+  let pkmnWorldPos = pokemon.worldPos();
+  Vec2$Kaplay.World.copyInto(thundershock.points[0], pkmnWorldPos);
+  thundershock.pointCount = 1;
+  Vec2$Kaplay.World.copyInto(thundershock.worldRect.pos, pkmnWorldPos);
+  thundershock.worldRect.width = 0;
+  thundershock.worldRect.height = 0;
+  thundershock.checked.clear();
+  thundershock.direction = pokemon.facing === true ? up : down;
+  thundershock.caster = pokemon;
+  thundershock.elapsed = 0;
+  thundershock.stopped = false;
+  thundershock.untag(Team$Skirmish.getTag(pokemon.team === true ? false : true));
+  thundershock.tag(Team$Skirmish.getTag(pokemon.team));
+}
+
+function makePool(k) {
+  return Pool$Kaplay.make(k, 2, () => Belt_Array.concatMany([
     [
-      GameContext$Skirmish.k.pos(0, 0),
-      GameContext$Skirmish.k.z(-1),
-      Team$Skirmish.getTagComponent(pokemon.team),
+      k.pos(0, 0),
+      k.z(-1),
       {
         id: "thundershock",
         draw: draw,
         drawInspect: drawInspect
+      },
+      {
+        points: Stdlib_Array.fromInitializer(maxPoints(k), param => k.vec2(0, 0)),
+        pointCount: 0,
+        localBuffer: Stdlib_Array.fromInitializer(maxPoints(k), param => k.vec2(0, 0)),
+        localPoints: [],
+        caster: undefined,
+        direction: up,
+        elapsed: 0,
+        stopped: true,
+        worldRect: Math$Kaplay.Rect.makeWorld(k, k.vec2(0, 0), 0, 0),
+        checked: new Map()
       }
     ],
-    addAttackWithTag(function () {
+    addAttackWithTag(k, function () {
       let thundershock = this ;
       return thundershock.worldRect;
     })
-  ]));
-  thundershock.use({
-    points: [pokemon.worldPos()],
-    timerRef: GameContext$Skirmish.k.loop(0.050, extra => {
-      let pkmnWorldPos = pokemon.worldPos();
-      let point = Stdlib_Array.last(thundershock.points);
-      let lastPoint = point !== undefined ? point : pkmnWorldPos;
-      let deviationX = GameContext$Skirmish.k.rand(-1 * 7, 7);
-      let candidate = GameContext$Skirmish.k.vec2(pkmnWorldPos.x + deviationX, lastPoint.y + direction.y);
-      let validCandidate = Wall$Skirmish.worldRect.contains(candidate);
-      let safeCandidate = validCandidate ? candidate : GameContext$Skirmish.k.vec2(GameContext$Skirmish.k.clamp(candidate.x, 0, GameContext$Skirmish.k.width()), GameContext$Skirmish.k.clamp(candidate.y, 0, GameContext$Skirmish.k.height()));
-      thundershock.points.push(safeCandidate);
-      thundershock.worldRect = expandRectWithPoint(thundershock.worldRect, safeCandidate);
-      if (!validCandidate) {
-        destroy(pokemon, thundershock);
-      }
-      otherPokemon.forEach(otherPokemon => {
-        if (thundershock.points.some(point => otherPokemon.hasPoint(point))) {
-          otherPokemon.hp = otherPokemon.hp - 5 | 0;
-          return destroy(pokemon, thundershock);
-        }
-      });
-    }),
-    worldRect: Math$Kaplay.Rect.makeWorld(GameContext$Skirmish.k, pokemon.worldPos(), 0, 0)
-  });
-  pokemon.use(GameContext$Skirmish.k.shader("glow", () => ({
-    u_time: GameContext$Skirmish.k.time(),
-    u_resolution: GameContext$Skirmish.k.vec2(pokemon.width, pokemon.height),
+  ]), (pool, thundershock) => [thundershock.onUpdate(() => update(pool, thundershock))], init);
+}
+
+let pools = new WeakMap();
+
+function cast(k, pokemon) {
+  pokemon.mobility = false;
+  let pool = pools.get(k);
+  let pool$1;
+  if (pool !== undefined) {
+    pool$1 = pool;
+  } else {
+    let pool$2 = makePool(k);
+    pools.set(k, pool$2);
+    pool$1 = pool$2;
+  }
+  Pool$Kaplay.acquire(pool$1, pokemon);
+  pokemon.use(k.shader("glow", () => ({
+    u_time: k.time(),
+    u_resolution: k.vec2(pokemon.width, pokemon.height),
     u_thickness: 0.7,
     u_color: lighting,
     u_intensity: 0.66,
@@ -153,8 +313,8 @@ function cast(pokemon) {
   })));
 }
 
-function move_cast(_k, pkmn) {
-  cast(pkmn);
+function move_cast(k, pkmn) {
+  cast(k, pkmn);
 }
 
 function move_addRulesForAI(_k, _rs, _slot, _facts) {
@@ -175,5 +335,6 @@ export {
   load,
   cast,
   move,
+  segmentIntersectsRect,
 }
 /*  Not a pure module */
@@ -0,0 +1,210 @@
+/***
+ * Packs the sprites of `public/sprites` into one atlas image, `public/atlas.png`, and writes the
+ * region of every sprite to `src/atlas.json` (see `Atlas`). Run it after downloading a sprite:
+ *
+ *   bun run pack-sprites
+ *
+ * Pokemon sprites are named like `Pokemon.frontSpriteName`, move sprites keep their file name.
+ * The atlas is only written again when a sprite was added, removed or changed.
+ */
+
+@module("node:fs/promises")
+external readdir: string => promise<array<string>> = "readdir"
+
+@module("node:fs/promises")
+external readFile: string => promise<RescriptBun.Buffer.t> = "readFile"
+
+@module("node:fs/promises")
+external readTextFile: (string, @as("utf8") _) => promise<string> = "readFile"
+
+@module("node:fs/promises")
+external writeFile: (string, string) => promise<unit> = "writeFile"
+
+@module("node:fs")
+external existsSync: string => bool = "existsSync"
+
+type hash
+
+@module("node:crypto")
+external createHash: string => hash = "createHash"
+
+@send
+external updateString: (hash, string) => hash = "update"
+
+@send
+external updateBuffer: (hash, RescriptBun.Buffer.t) => hash = "update"
+
+@send
+external digest: (hash, @as("hex") _) => string = "digest"
+
+external atlasToJson: Kaplay.SpriteAtlas.t => JSON.t = "%identity"
+
+type sprite = {
+  name: string,
+  buffer: RescriptBun.Buffer.t,
+  width: int,
+  height: int,
+}
+
+type placement = {
+  sprite: sprite,
+  x: int,
+  y: int,
+}
+
+/** Transparent pixels around every sprite, so filtering never picks up a neighbour. */
+let padding = 1
+
+let spritesDirectory = RescriptBun.Path.join([
+  RescriptBun.Global.dirname,
+  "..",
+  "public",
+  "sprites",
+])
+let atlasImagePath = RescriptBun.Path.join([
+  RescriptBun.Global.dirname,
+  "..",
+  "public",
+  "atlas.png",
+])
+let atlasDataPath = RescriptBun.Path.join([RescriptBun.Global.dirname, "atlas.json"])
+
+/** Directories with sprites and the prefix of their sprite names. */
+let sources = [
+  (spritesDirectory, "pokemon-"),
+  (RescriptBun.Path.join([spritesDirectory, "moves"]), ""),
+]
+
+let readSprites = async (directory: string, prefix: string): array<sprite> => {
+  let files = (await readdir(directory))->Array.filter(file => file->String.endsWith(".png"))
+  let sprites = []
+  for i in 0 to files->Array.length - 1 {
+    let file = files->Array.getUnsafe(i)
+    let buffer = await readFile(RescriptBun.Path.join([directory, file]))
+    let {width, height} = await Sharp.sharpFromBuffer(buffer)->Sharp.metadata
+    sprites->Array.push({
+      name: prefix ++ file->String.slice(~start=0, ~end=file->String.length - 4),
+      buffer,
+      width,
+      height,
+    })
+  }
+  sprites
+}
+
+let compareNames = (a: sprite, b: sprite): float =>
+  if a.name < b.name {
+    -1.
+  } else if a.name > b.name {
+    1.
+  } else {
+    0.
+  }
+
+/** Hash of the names and contents of all sprites, ordered by name. */
+let hashSprites = (sprites: array<sprite>): string => {
+  let hash = createHash("sha256")
+  sprites->Array.forEach(sprite => {
+    hash->updateString(sprite.name)->updateBuffer(sprite.buffer)->ignore
+  })
+  hash->digest
+}
+
+let nextPowerOfTwo = (n: int): int => {
+  let size = ref(1)
+  while size.contents < n {
+    size := size.contents * 2
+  }
+  size.contents
+}
+
+/**
+ * Shelf packing: sprites are placed left to right, tallest first, and a new shelf is started
+ * when a sprite doesn't fit on the current one. The width is the smallest power of two that
+ * holds the widest sprite and would fit all sprites in a square.
+ */
+let pack = (sprites: array<sprite>): (int, int, array<placement>) => {
+  let cellWidth = sprite => sprite.width + 2 * padding
+  let cellHeight = sprite => sprite.height + 2 * padding
+  let area =
+    sprites->Array.reduce(0, (area, sprite) => area + cellWidth(sprite) * cellHeight(sprite))
+  let widest =
+    sprites->Array.reduce(0, (widest, sprite) => Math.Int.max(widest, cellWidth(sprite)))
+  let width = nextPowerOfTwo(
+    Math.Int.max(widest, Float.toInt(Math.ceil(Math.sqrt(Int.toFloat(area))))),
+  )
+
+  let placements = []
+  let x = ref(0)
+  let shelfY = ref(0)
+  let shelfHeight = ref(0)
+  sprites
+  ->Array.toSorted((a, b) => Int.toFloat(b.height - a.height))
+  ->Array.forEach(sprite => {
+    if x.contents + cellWidth(sprite) > width {
+      x := 0
+      shelfY := shelfY.contents + shelfHeight.contents
+      shelfHeight := 0
+    }
+    placements->Array.push({sprite, x: x.contents + padding, y: shelfY.contents + padding})
+    x := x.contents + cellWidth(sprite)
+    shelfHeight := Math.Int.max(shelfHeight.contents, cellHeight(sprite))
+  })
+  (width, shelfY.contents + shelfHeight.contents, placements)
+}
+
+let readPackedHash = async (): option<string> => {
+  if !existsSync(atlasImagePath) || !existsSync(atlasDataPath) {
+    None
+  } else {
+    switch JSON.parseOrThrow(await readTextFile(atlasDataPath)) {
+    | JSON.Object(dict{"hash": JSON.String(hash)}) => Some(hash)
+    | _ => None
+    | exception _ => None
+    }
+  }
+}
+
+let main = async () => {
+  let sprites = []
+  for i in 0 to sources->Array.length - 1 {
+    let (directory, prefix) = sources->Array.getUnsafe(i)
+    sprites->Array.pushMany(await readSprites(directory, prefix))
+  }
+  sprites->Array.sort(compareNames)
+
+  let hash = hashSprites(sprites)
+  if await readPackedHash() == Some(hash) {
+    Console.log("Atlas is up to date")
+  } else {
+    let (width, height, placements) = pack(sprites)
+    let frames = Dict.make()
+    placements->Array.forEach(({sprite, x, y}) => {
+      frames->Dict.set(
+        sprite.name,
+        ({x, y, width: sprite.width, height: sprite.height}: Kaplay.Context.spriteAtlasEntry),
+      )
+    })
+
+    await Sharp.sharp({
+      create: {width, height, channels: 4, background: {r: 0, g: 0, b: 0, alpha: 0}},
+    })
+    ->Sharp.composite(
+      placements->Array.map(({sprite, x, y}): Sharp.overlayOption => {
+        input: sprite.buffer,
+        top: y,
+        left: x,
+      }),
+    )
+    ->Sharp.png
+    ->Sharp.toFile(atlasImagePath)
+
+    let atlas: Kaplay.SpriteAtlas.t = {hash, width, height, frames}
+    await writeFile(atlasDataPath, JSON.stringify(atlasToJson(atlas), ~space=2) ++ "\n")
+    Console.log(
+      `Packed ${sprites->Array.length->Int.toString} sprites into a ${width->Int.toString}x${height->Int.toString} atlas`,
+    )
+  }
+}
+
+await main()
@@ -0,0 +1,197 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import Sharp from "sharp";
+import * as Nodefs from "node:fs";
+import * as Nodepath from "node:path";
+import * as Promises from "node:fs/promises";
+import * as Nodecrypto from "node:crypto";
+import * as Primitive_object from "@rescript/runtime/lib/es6/Primitive_object.mjs";
+
+let spritesDirectory = Nodepath.join(__dirname, "..", "public", "sprites");
+
+let atlasImagePath = Nodepath.join(__dirname, "..", "public", "atlas.png");
+
+let atlasDataPath = Nodepath.join(__dirname, "atlas.json");
+
+let sources = [
+  [
+    spritesDirectory,
+    "pokemon-"
+  ],
+  [
+    Nodepath.join(spritesDirectory, "moves"),
+    ""
+  ]
+];
+
+async function readSprites(directory, prefix) {
+  let files = (await Promises.readdir(directory)).filter(file => file.endsWith(".png"));
+  let sprites = [];
+  for (let i = 0, i_finish = files.length; i < i_finish; ++i) {
+    let file = files[i];
+    let buffer = await Promises.readFile(Nodepath.join(directory, file));
+    let match = await Sharp(buffer).metadata();
+    sprites.push({
+      name: prefix + file.slice(0, file.length - 4 | 0),
+      buffer: buffer,
+      width: match.width,
+      height: match.height
+    });
+  }
+  return sprites;
+}
+
+function compareNames(a, b) {
+  if (a.name < b.name) {
+    return -1;
+  } else if (a.name > b.name) {
+    return 1;
+  } else {
+    return 0;
+  }
+}
+
+function hashSprites(sprites) {
+  let hash = Nodecrypto.createHash("sha256");
+  sprites.forEach(sprite => {
+    hash.update(sprite.name).update(sprite.buffer);
+  });
+  return hash.digest("hex");
+}
+
+function nextPowerOfTwo(n) {
+  let size = 1;
+  while (size < n) {
+    size = (size << 1);
+  };
+  return size;
+}
+
+function pack(sprites) {
+  let cellWidth = sprite => sprite.width + 2 | 0;
+  let cellHeight = sprite => sprite.height + 2 | 0;
+  let area = sprites.reduce((area, sprite) => area + Math.imul(cellWidth(sprite), cellHeight(sprite)) | 0, 0);
+  let widest = sprites.reduce((widest, sprite) => Math.max(widest, cellWidth(sprite)), 0);
+  let width = nextPowerOfTwo(Math.max(widest, Math.ceil(Math.sqrt(area)) | 0));
+  let placements = [];
+  let x = {
+    contents: 0
+  };
+  let shelfY = {
+    contents: 0
+  };
+  let shelfHeight = {
+    contents: 0
+  };
+  sprites.toSorted((a, b) => b.height - a.height | 0).forEach(sprite => {
+    if ((x.contents + cellWidth(sprite) | 0) > width) {
+      x.contents = 0;
+      shelfY.contents = shelfY.contents + shelfHeight.contents | 0;
+      shelfHeight.contents = 0;
+    }
+    placements.push({
+      sprite: sprite,
+      x: x.contents + 1 | 0,
+      y: shelfY.contents + 1 | 0
+    });
+    x.contents = x.contents + cellWidth(sprite) | 0;
+    shelfHeight.contents = Math.max(shelfHeight.contents, cellHeight(sprite));
+  });
+  return [
+    width,
+    shelfY.contents + shelfHeight.contents | 0,
+    placements
+  ];
+}
+
+async function readPackedHash() {
+  if (!Nodefs.existsSync(atlasImagePath) || !Nodefs.existsSync(atlasDataPath)) {
+    return;
+  }
+  let match;
+  try {
+    match = JSON.parse(await Promises.readFile(atlasDataPath, "utf8"));
+  } catch (exn) {
+    return;
+  }
+  if (typeof match !== "object" || match === null || Array.isArray(match)) {
+    return;
+  }
+  let hash = match.hash;
+  if (typeof hash === "string") {
+    return hash;
+  }
+}
+
+async function main() {
+  let sprites = [];
+  for (let i = 0, i_finish = sources.length; i < i_finish; ++i) {
+    let match = sources[i];
+    sprites.push(...(await readSprites(match[0], match[1])));
+  }
+  sprites.sort(compareNames);
+  let hash = hashSprites(sprites);
+  if (Primitive_object.equal(await readPackedHash(), hash)) {
+    console.log("Atlas is up to date");
+    return;
+  }
+  let match$1 = pack(sprites);
+  let placements = match$1[2];
+  let height = match$1[1];
+  let width = match$1[0];
+  let frames = {};
+  placements.forEach(param => {
+    let sprite = param.sprite;
+    frames[sprite.name] = {
+      x: param.x,
+      y: param.y,
+      width: sprite.width,
+      height: sprite.height
+    };
+  });
+  await Sharp({
+    create: {
+      width: width,
+      height: height,
+      channels: 4,
+      background: {
+        r: 0,
+        g: 0,
+        b: 0,
+        alpha: 0
+      }
+    }
+  }).composite(placements.map(param => ({
+    input: param.sprite.buffer,
+    top: param.y,
+    left: param.x
+  }))).png().toFile(atlasImagePath);
+  let atlas = {
+    hash: hash,
+    width: width,
+    height: height,
+    frames: frames
+  };
+  await Promises.writeFile(atlasDataPath, JSON.stringify(atlas, undefined, 2) + "\n");
+  console.log(`Packed ` + sprites.length.toString() + ` sprites into a ` + width.toString() + `x` + height.toString() + ` atlas`);
+}
+
+await main();
+
+let padding = 1;
+
+export {
+  padding,
+  spritesDirectory,
+  atlasImagePath,
+  atlasDataPath,
+  sources,
+  readSprites,
+  compareNames,
+  hashSprites,
+  nextPowerOfTwo,
+  pack,
+  readPackedHash,
+  main,
+}
+/* spritesDirectory Not a pure module */
@@ -45,7 +45,12 @@ type rec t = {
   // ruleSystem: the rule system to add rules to
   // moveSlot: current PP and last used time for this move
   // factNames: standard fact names to assert (e.g., "move-0-available")
-  addRulesForAI: (Context.t, RuleSystem.t<enemyAIRuleSystemState>, moveSlot, moveFactNames) => unit,
+  addRulesForAI: (
+    Context.t,
+    RuleSystem.Compiled.t<enemyAIRuleSystemState>,
+    moveSlot,
+    moveFactNames,
+  ) => unit,
 }
 
 and moveSlot = {
@@ -55,10 +55,12 @@ let backSpriteName = (id: int) => "pokemon-" ++ Int.toString(id) ++ "-back"
 let frontSpriteUrl = (id: int) => `/sprites/${Int.toString(id)}-front.png`
 let backSpriteUrl = (id: int) => `/sprites/${Int.toString(id)}-back.png`
 
-/* Load both front and back sprites for the given pokemon id */
+/* Load both front and back sprites for the given pokemon id, from the sprite atlas when it has them */
 let load = (k: Context.t, id: int): unit => {
-  k->Context.loadSprite(frontSpriteName(id), frontSpriteUrl(id), ~options={singular: true})
-  k->Context.loadSprite(backSpriteName(id), backSpriteUrl(id), ~options={singular: true})
+  if !Atlas.load(k, [frontSpriteName(id), backSpriteName(id)]) {
+    k->Context.loadSprite(frontSpriteName(id), frontSpriteUrl(id), ~options={singular: true})
+    k->Context.loadSprite(backSpriteName(id), backSpriteUrl(id), ~options={singular: true})
+  }
 }
 
 let movementSpeed = 200.
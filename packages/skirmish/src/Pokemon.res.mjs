@@ -8,6 +8,7 @@ import * as Health$Kaplay from "@nojaf/rescript-kaplay/src/Components/Health.res
 import * as Shader$Kaplay from "@nojaf/rescript-kaplay/src/Components/Shader.res.mjs";
 import * as Sprite$Kaplay from "@nojaf/rescript-kaplay/src/Components/Sprite.res.mjs";
 import * as Team$Skirmish from "./Team.res.mjs";
+import * as Atlas$Skirmish from "./Atlas.res.mjs";
 import * as Animate$Kaplay from "@nojaf/rescript-kaplay/src/Components/Animate.res.mjs";
 import * as Opacity$Kaplay from "@nojaf/rescript-kaplay/src/Components/Opacity.res.mjs";
 import * as GameObjRaw$Kaplay from "@nojaf/rescript-kaplay/src/Components/GameObjRaw.res.mjs";
@@ -54,12 +55,18 @@ function backSpriteUrl(id) {
 }
 
 function load(k, id) {
-  k.loadSprite(frontSpriteName(id), frontSpriteUrl(id), {
-    singular: true
-  });
-  k.loadSprite(backSpriteName(id), backSpriteUrl(id), {
-    singular: true
-  });
+  if (!Atlas$Skirmish.load(k, [
+      frontSpriteName(id),
+      backSpriteName(id)
+    ])) {
+    k.loadSprite(frontSpriteName(id), frontSpriteUrl(id), {
+      singular: true
+    });
+    k.loadSprite(backSpriteName(id), backSpriteUrl(id), {
+      singular: true
+    });
+    return;
+  }
 }
 
 function getHealthPercentage(pokemon) {
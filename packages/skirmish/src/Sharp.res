@@ -55,3 +55,11 @@ type trimOptions = {
 
 @send
 external trim: (t, ~options: trimOptions=?) => t = "trim"
+
+type metadata = {
+  width: int,
+  height: int,
+}
+
+@send
+external metadata: t => promise<metadata> = "metadata"
@@ -12,3 +12,7 @@ let opponentTagComponent = Context.tag(opponent)
 let getTagComponent = (team: t) => {
   team == Player ? playerTagComponent : opponentTagComponent
 }
+
+let getTag = (team: t) => {
+  team == Player ? player : opponent
+}
@@ -13,6 +13,14 @@ function getTagComponent(team) {
   }
 }
 
+function getTag(team) {
+  if (team === true) {
+    return player;
+  } else {
+    return opponent;
+  }
+}
+
 let playerTagComponent = player;
 
 let opponentTagComponent = opponent;
@@ -23,5 +31,6 @@ export {
   playerTagComponent,
   opponentTagComponent,
   getTagComponent,
+  getTag,
 }
 /* No side effect */
@@ -0,0 +1,190 @@
+open Vitest
+open Kaplay
+
+// Stand-ins for the context and the attacks, the index only reads `debug.numFrames`,
+// the world rect, the team tag and `paused`.
+
+type fakeDebug = {numFrames: unit => int}
+
+type fakeContext = {debug: fakeDebug}
+
+external toContext: fakeContext => Context.t = "%identity"
+
+type fakeAttack = {
+  name: string,
+  getWorldRect: unit => Types.rect<Vec2.World.t>,
+  is: string => bool,
+  mutable paused: bool,
+}
+
+external toAttack: fakeAttack => AttackIndex.attack = "%identity"
+
+external fromAttack: AttackIndex.attack => fakeAttack = "%identity"
+
+/** A fresh context, so every test gets its own index. */
+let makeContext = (): Context.t => toContext({debug: {numFrames: () => 0}})
+
+let makeAttack = (name: string, team: Team.t, ~x: float, ~width: float): fakeAttack => {
+  let tag = Team.getTag(team)
+  {
+    name,
+    getWorldRect: () => {pos: {x, y: 0.}, width, height: 10.},
+    is: other => other == tag,
+    paused: false,
+  }
+}
+
+let register = (k: Context.t, attacks: array<fakeAttack>) =>
+  attacks->Array.forEach(attack => AttackIndex.register(k, attack->toAttack))
+
+let names = (attacks: array<AttackIndex.attack>): array<string> =>
+  attacks->Array.map(attack => (attack->fromAttack).name)
+
+let overlapping = (index: AttackIndex.t, team: Team.t, ~minX: float, ~maxX: float) => {
+  let visited = []
+  index->AttackIndex.forEachOverlappingX(team, ~minX, ~maxX, (attack, _bounds) =>
+    visited->Array.push(attack)
+  )
+  names(visited)
+}
+
+let leftOf = (index: AttackIndex.t, team: Team.t, ~x: float, ~limit=100) => {
+  let visited = []
+  index->AttackIndex.forEachLeftOf(team, ~x, (attack, _bounds) => {
+    visited->Array.push(attack)
+    visited->Array.length < limit
+  })
+  names(visited)
+}
+
+let rightOf = (index: AttackIndex.t, team: Team.t, ~x: float, ~limit=100) => {
+  let visited = []
+  index->AttackIndex.forEachRightOf(team, ~x, (attack, _bounds) => {
+    visited->Array.push(attack)
+    visited->Array.length < limit
+  })
+  names(visited)
+}
+
+// =============================================================================
+// Queries
+// =============================================================================
+
+// a: [0, 10], b: [10, 10], c: [30, 40]
+let makeRow = (): AttackIndex.t => {
+  let k = makeContext()
+  register(
+    k,
+    [
+      makeAttack("a", Player, ~x=0., ~width=10.),
+      makeAttack("b", Player, ~x=10., ~width=0.),
+      makeAttack("c", Player, ~x=30., ~width=10.),
+    ],
+  )
+  AttackIndex.forContext(k)
+}
+
+test("forEachOverlappingX includes attacks that touch the range", () => {
+  let index = makeRow()
+
+  expect(overlapping(index, Player, ~minX=10., ~maxX=30.))->Expect.toEqual(["c", "b", "a"])
+  expect(overlapping(index, Player, ~minX=10.5, ~maxX=29.5))->Expect.toEqual([])
+  // A zero width range still overlaps the attacks it touches
+  expect(overlapping(index, Player, ~minX=10., ~maxX=10.))->Expect.toEqual(["b", "a"])
+  expect(overlapping(index, Player, ~minX=40., ~maxX=50.))->Expect.toEqual(["c"])
+  expect(overlapping(index, Player, ~minX=-10., ~maxX=-1.))->Expect.toEqual([])
+  Promise.resolve()
+})
+
+test("forEachLeftOf visits the attacks that end left of x, nearest first", () => {
+  let index = makeRow()
+
+  // An attack that ends at x is not left of it
+  expect(leftOf(index, Player, ~x=10.))->Expect.toEqual([])
+  expect(leftOf(index, Player, ~x=10.5))->Expect.toEqual(["b", "a"])
+  expect(leftOf(index, Player, ~x=50.))->Expect.toEqual(["c", "b", "a"])
+  expect(leftOf(index, Player, ~x=50., ~limit=1))->Expect.toEqual(["c"])
+  expect(index->AttackIndex.nearestLeftOf(Player, ~x=10.))->Expect.toBe(None)
+  Promise.resolve()
+})
+
+test("forEachRightOf visits the attacks that start right of x, nearest first", () => {
+  let index = makeRow()
+
+  // An attack that starts at x is not right of it
+  expect(rightOf(index, Player, ~x=10.))->Expect.toEqual(["c"])
+  expect(rightOf(index, Player, ~x=9.5))->Expect.toEqual(["b", "c"])
+  expect(rightOf(index, Player, ~x=-1.))->Expect.toEqual(["a", "b", "c"])
+  expect(rightOf(index, Player, ~x=-1., ~limit=2))->Expect.toEqual(["a", "b"])
+  expect(index->AttackIndex.nearestRightOf(Player, ~x=30.))->Expect.toBe(None)
+  Promise.resolve()
+})
+
+test("queries on a team without attacks visit nothing", () => {
+  let index = makeRow()
+
+  expect(index->AttackIndex.count(Opponent))->Expect.toBe(0)
+  expect(overlapping(index, Opponent, ~minX=-100., ~maxX=100.))->Expect.toEqual([])
+  expect(leftOf(index, Opponent, ~x=100.))->Expect.toEqual([])
+  expect(rightOf(index, Opponent, ~x=-100.))->Expect.toEqual([])
+  expect(index->AttackIndex.nearestLeftOf(Opponent, ~x=100.))->Expect.toBe(None)
+  expect(index->AttackIndex.nearestRightOf(Opponent, ~x=-100.))->Expect.toBe(None)
+  Promise.resolve()
+})
+
+// =============================================================================
+// Registration
+// =============================================================================
+
+test("unregister swaps the last attack into the freed position", () => {
+  let k = makeContext()
+  let a = makeAttack("a", Player, ~x=0., ~width=10.)
+  let b = makeAttack("b", Player, ~x=20., ~width=10.)
+  let c = makeAttack("c", Player, ~x=40., ~width=10.)
+  register(k, [a, b, c])
+  let index = AttackIndex.forContext(k)
+
+  AttackIndex.unregister(k, a->toAttack)
+  expect(names(index.attacks))->Expect.toEqual(["c", "b"])
+  expect(overlapping(index, Player, ~minX=0., ~maxX=50.))->Expect.toEqual(["c", "b"])
+
+  // c moved into the position of a
+  AttackIndex.unregister(k, c->toAttack)
+  expect(names(index.attacks))->Expect.toEqual(["b"])
+  expect(index->AttackIndex.count(Player))->Expect.toBe(1)
+
+  // Registering twice and unregistering an unknown attack change nothing
+  register(k, [b])
+  AttackIndex.unregister(k, a->toAttack)
+  expect(names(index.attacks))->Expect.toEqual(["b"])
+
+  register(k, [a])
+  expect(names(index.attacks))->Expect.toEqual(["b", "a"])
+  expect(leftOf(index, Player, ~x=20.))->Expect.toEqual(["a"])
+  Promise.resolve()
+})
+
+test("attacks are kept per team and paused attacks are skipped", () => {
+  let k = makeContext()
+  let a = makeAttack("a", Player, ~x=0., ~width=10.)
+  let b = makeAttack("b", Opponent, ~x=5., ~width=10.)
+  let c = makeAttack("c", Player, ~x=20., ~width=10.)
+  register(k, [a, b, c])
+  let index = AttackIndex.forContext(k)
+
+  expect(index->AttackIndex.count(Player))->Expect.toBe(2)
+  expect(index->AttackIndex.count(Opponent))->Expect.toBe(1)
+  expect(overlapping(index, Opponent, ~minX=0., ~maxX=30.))->Expect.toEqual(["b"])
+
+  // Pooled attacks are paused while they wait to be reused
+  a.paused = true
+  index->AttackIndex.invalidate
+  expect(index->AttackIndex.count(Player))->Expect.toBe(1)
+  expect(overlapping(index, Player, ~minX=0., ~maxX=30.))->Expect.toEqual(["c"])
+  expect(leftOf(index, Player, ~x=15.))->Expect.toEqual([])
+
+  a.paused = false
+  index->AttackIndex.invalidate
+  expect(overlapping(index, Player, ~minX=0., ~maxX=30.))->Expect.toEqual(["c", "a"])
+  Promise.resolve()
+})
@@ -0,0 +1,216 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vitest from "vitest";
+import * as Team$Skirmish from "../src/Team.res.mjs";
+import * as AttackIndex$Skirmish from "../src/Moves/AttackIndex.res.mjs";
+
+function makeContext() {
+  return {
+    debug: {
+      numFrames: () => 0
+    }
+  };
+}
+
+function makeAttack(name, team, x, width) {
+  let tag = Team$Skirmish.getTag(team);
+  return {
+    name: name,
+    getWorldRect: () => ({
+      pos: {
+        x: x,
+        y: 0
+      },
+      width: width,
+      height: 10
+    }),
+    is: other => other === tag,
+    paused: false
+  };
+}
+
+function register(k, attacks) {
+  attacks.forEach(attack => AttackIndex$Skirmish.register(k, attack));
+}
+
+function names(attacks) {
+  return attacks.map(attack => attack.name);
+}
+
+function overlapping(index, team, minX, maxX) {
+  let visited = [];
+  AttackIndex$Skirmish.forEachOverlappingX(index, team, minX, maxX, (attack, _bounds) => {
+    visited.push(attack);
+  });
+  return names(visited);
+}
+
+function leftOf(index, team, x, limitOpt) {
+  let limit = limitOpt !== undefined ? limitOpt : 100;
+  let visited = [];
+  AttackIndex$Skirmish.forEachLeftOf(index, team, x, (attack, _bounds) => {
+    visited.push(attack);
+    return visited.length < limit;
+  });
+  return names(visited);
+}
+
+function rightOf(index, team, x, limitOpt) {
+  let limit = limitOpt !== undefined ? limitOpt : 100;
+  let visited = [];
+  AttackIndex$Skirmish.forEachRightOf(index, team, x, (attack, _bounds) => {
+    visited.push(attack);
+    return visited.length < limit;
+  });
+  return names(visited);
+}
+
+function makeRow() {
+  let k = makeContext();
+  register(k, [
+    makeAttack("a", true, 0, 10),
+    makeAttack("b", true, 10, 0),
+    makeAttack("c", true, 30, 10)
+  ]);
+  return AttackIndex$Skirmish.forContext(k);
+}
+
+Vitest.test("forEachOverlappingX includes attacks that touch the range", () => {
+  let index = makeRow();
+  Vitest.expect(overlapping(index, true, 10, 30)).toEqual([
+    "c",
+    "b",
+    "a"
+  ]);
+  Vitest.expect(overlapping(index, true, 10.5, 29.5)).toEqual([]);
+  Vitest.expect(overlapping(index, true, 10, 10)).toEqual([
+    "b",
+    "a"
+  ]);
+  Vitest.expect(overlapping(index, true, 40, 50)).toEqual(["c"]);
+  Vitest.expect(overlapping(index, true, -10, -1)).toEqual([]);
+  return Promise.resolve();
+});
+
+Vitest.test("forEachLeftOf visits the attacks that end left of x, nearest first", () => {
+  let index = makeRow();
+  Vitest.expect(leftOf(index, true, 10, undefined)).toEqual([]);
+  Vitest.expect(leftOf(index, true, 10.5, undefined)).toEqual([
+    "b",
+    "a"
+  ]);
+  Vitest.expect(leftOf(index, true, 50, undefined)).toEqual([
+    "c",
+    "b",
+    "a"
+  ]);
+  Vitest.expect(leftOf(index, true, 50, 1)).toEqual(["c"]);
+  Vitest.expect(AttackIndex$Skirmish.nearestLeftOf(index, true, 10)).toBe(undefined);
+  return Promise.resolve();
+});
+
+Vitest.test("forEachRightOf visits the attacks that start right of x, nearest first", () => {
+  let index = makeRow();
+  Vitest.expect(rightOf(index, true, 10, undefined)).toEqual(["c"]);
+  Vitest.expect(rightOf(index, true, 9.5, undefined)).toEqual([
+    "b",
+    "c"
+  ]);
+  Vitest.expect(rightOf(index, true, -1, undefined)).toEqual([
+    "a",
+    "b",
+    "c"
+  ]);
+  Vitest.expect(rightOf(index, true, -1, 2)).toEqual([
+    "a",
+    "b"
+  ]);
+  Vitest.expect(AttackIndex$Skirmish.nearestRightOf(index, true, 30)).toBe(undefined);
+  return Promise.resolve();
+});
+
+Vitest.test("queries on a team without attacks visit nothing", () => {
+  let index = makeRow();
+  Vitest.expect(AttackIndex$Skirmish.count(index, false)).toBe(0);
+  Vitest.expect(overlapping(index, false, -100, 100)).toEqual([]);
+  Vitest.expect(leftOf(index, false, 100, undefined)).toEqual([]);
+  Vitest.expect(rightOf(index, false, -100, undefined)).toEqual([]);
+  Vitest.expect(AttackIndex$Skirmish.nearestLeftOf(index, false, 100)).toBe(undefined);
+  Vitest.expect(AttackIndex$Skirmish.nearestRightOf(index, false, -100)).toBe(undefined);
+  return Promise.resolve();
+});
+
+Vitest.test("unregister swaps the last attack into the freed position", () => {
+  let k = makeContext();
+  let a = makeAttack("a", true, 0, 10);
+  let b = makeAttack("b", true, 20, 10);
+  let c = makeAttack("c", true, 40, 10);
+  register(k, [
+    a,
+    b,
+    c
+  ]);
+  let index = AttackIndex$Skirmish.forContext(k);
+  AttackIndex$Skirmish.unregister(k, a);
+  Vitest.expect(names(index.attacks)).toEqual([
+    "c",
+    "b"
+  ]);
+  Vitest.expect(overlapping(index, true, 0, 50)).toEqual([
+    "c",
+    "b"
+  ]);
+  AttackIndex$Skirmish.unregister(k, c);
+  Vitest.expect(names(index.attacks)).toEqual(["b"]);
+  Vitest.expect(AttackIndex$Skirmish.count(index, true)).toBe(1);
+  register(k, [b]);
+  AttackIndex$Skirmish.unregister(k, a);
+  Vitest.expect(names(index.attacks)).toEqual(["b"]);
+  register(k, [a]);
+  Vitest.expect(names(index.attacks)).toEqual([
+    "b",
+    "a"
+  ]);
+  Vitest.expect(leftOf(index, true, 20, undefined)).toEqual(["a"]);
+  return Promise.resolve();
+});
+
+Vitest.test("attacks are kept per team and paused attacks are skipped", () => {
+  let k = makeContext();
+  let a = makeAttack("a", true, 0, 10);
+  let b = makeAttack("b", false, 5, 10);
+  let c = makeAttack("c", true, 20, 10);
+  register(k, [
+    a,
+    b,
+    c
+  ]);
+  let index = AttackIndex$Skirmish.forContext(k);
+  Vitest.expect(AttackIndex$Skirmish.count(index, true)).toBe(2);
+  Vitest.expect(AttackIndex$Skirmish.count(index, false)).toBe(1);
+  Vitest.expect(overlapping(index, false, 0, 30)).toEqual(["b"]);
+  a.paused = true;
+  AttackIndex$Skirmish.invalidate(index);
+  Vitest.expect(AttackIndex$Skirmish.count(index, true)).toBe(1);
+  Vitest.expect(overlapping(index, true, 0, 30)).toEqual(["c"]);
+  Vitest.expect(leftOf(index, true, 15, undefined)).toEqual([]);
+  a.paused = false;
+  AttackIndex$Skirmish.invalidate(index);
+  Vitest.expect(overlapping(index, true, 0, 30)).toEqual([
+    "c",
+    "a"
+  ]);
+  return Promise.resolve();
+});
+
+export {
+  makeContext,
+  makeAttack,
+  register,
+  names,
+  overlapping,
+  leftOf,
+  rightOf,
+  makeRow,
+}
+/*  Not a pure module */
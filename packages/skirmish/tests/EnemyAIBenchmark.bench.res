@@ -0,0 +1,73 @@
+open Vitest
+
+/***
+ * Measures how the cost of the enemy's rule evaluation grows with the number of player attacks on the field.
+ * Run with `bun run bench`, the results are printed as a table.
+ * Kaplay plays the frames at its own pace, see `Simulation`, so every attack count takes a few seconds.
+ *
+ * Timings depend on the machine, so they are only reported, never asserted.
+ * CI keeps the table as the `benchmark-results` artifact.
+ */
+
+@val @scope("console")
+external table: array<'row> => unit = "table"
+
+type row = {
+  attacks: int,
+  executeMsPerFrame: float,
+  simulatedSeconds: float,
+  vec2CallsPerFrame: float,
+  executeVec2CallsPerFrame: float,
+  heapKbPerFrame: option<float>,
+}
+
+let frames = 300
+let warmUpFrames = 60
+let attackCounts = [1, 10, 50, 100, 250, 500]
+
+/** Spread the attacks deterministically over the field between both Pokémon. */
+let attackPositions = (count: int): array<(float, float)> => {
+  let columns = Float.toInt(Simulation.width) - 32
+  let rows = Float.toInt(Simulation.height) - 224
+  Array.fromInitializer(~length=count, i => (
+    Int.toFloat(mod(i * 37, columns) + 16),
+    Int.toFloat(112 + mod(i * 53, rows)),
+  ))
+}
+
+/** The player keeps walking, so the enemy keeps re-evaluating its position. */
+let walkBackAndForth = (simulation: Simulation.t, frame: int) => {
+  if mod(frame / 60, 2) == 0 {
+    Pokemon.moveLeft(simulation.k, simulation.rs.state.player)
+  } else {
+    Pokemon.moveRight(simulation.k, simulation.rs.state.player)
+  }
+}
+
+test("EnemyAI rule system benchmark", async () => {
+  let rows = []
+
+  for i in 0 to attackCounts->Array.length - 1 {
+    let attacks = attackCounts->Array.getUnsafe(i)
+    await Simulation.withSimulation(~attacks=attackPositions(attacks), async simulation => {
+      let _ = await Simulation.run(simulation, ~frames=warmUpFrames, ~script=walkBackAndForth)
+      let report = await Simulation.run(simulation, ~frames, ~script=walkBackAndForth)
+      let perFrame = value => value / Int.toFloat(report.frames)
+
+      rows->Array.push({
+        attacks,
+        executeMsPerFrame: perFrame(report.executeTimeMs),
+        simulatedSeconds: report.simulatedSeconds,
+        vec2CallsPerFrame: perFrame(Int.toFloat(report.vec2Calls)),
+        executeVec2CallsPerFrame: perFrame(Int.toFloat(report.executeVec2Calls)),
+        heapKbPerFrame: report.heapGrowthBytes->Option.map(bytes => perFrame(bytes) / 1024.),
+      })
+
+      // The world rect of every attack is read at most once per frame
+      // and `GenericMove` calls `k.vec2` once to build it
+      expect(report.executeVec2Calls)->Expect.toBeLessThanOrEqual(attacks * report.frames)
+    })
+  }
+
+  table(rows)
+})
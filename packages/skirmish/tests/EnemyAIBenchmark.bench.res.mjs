@@ -0,0 +1,69 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vitest from "vitest";
+import * as Stdlib_Array from "@rescript/runtime/lib/es6/Stdlib_Array.mjs";
+import * as Primitive_int from "@rescript/runtime/lib/es6/Primitive_int.mjs";
+import * as Stdlib_Option from "@rescript/runtime/lib/es6/Stdlib_Option.mjs";
+import * as Pokemon$Skirmish from "../src/Pokemon.res.mjs";
+import * as Simulation$Skirmish from "./Simulation.res.mjs";
+
+let frames = 300;
+
+let warmUpFrames = 60;
+
+let attackCounts = [
+  1,
+  10,
+  50,
+  100,
+  250,
+  500
+];
+
+function attackPositions(count) {
+  let columns = (Simulation$Skirmish.width | 0) - 32 | 0;
+  let rows = (Simulation$Skirmish.height | 0) - 224 | 0;
+  return Stdlib_Array.fromInitializer(count, i => [
+    Primitive_int.mod_(Math.imul(i, 37), columns) + 16 | 0,
+    112 + Primitive_int.mod_(Math.imul(i, 53), rows) | 0
+  ]);
+}
+
+function walkBackAndForth(simulation, frame) {
+  if ((frame / 60 | 0) % 2 === 0) {
+    return Pokemon$Skirmish.moveLeft(simulation.k, simulation.rs.state.player);
+  } else {
+    return Pokemon$Skirmish.moveRight(simulation.k, simulation.rs.state.player);
+  }
+}
+
+Vitest.test("EnemyAI rule system benchmark", async () => {
+  let rows = [];
+  for (let i = 0, i_finish = attackCounts.length; i < i_finish; ++i) {
+    let attacks = attackCounts[i];
+    await Simulation$Skirmish.withSimulation(attackPositions(attacks), undefined, async simulation => {
+      await Simulation$Skirmish.run(simulation, 60, walkBackAndForth);
+      let report = await Simulation$Skirmish.run(simulation, 300, walkBackAndForth);
+      let perFrame = value => value / report.frames;
+      rows.push({
+        attacks: attacks,
+        executeMsPerFrame: perFrame(report.executeTimeMs),
+        simulatedSeconds: report.simulatedSeconds,
+        vec2CallsPerFrame: perFrame(report.vec2Calls),
+        executeVec2CallsPerFrame: perFrame(report.executeVec2Calls),
+        heapKbPerFrame: Stdlib_Option.map(report.heapGrowthBytes, bytes => perFrame(bytes) / 1024)
+      });
+      Vitest.expect(report.executeVec2Calls).toBeLessThanOrEqual(Math.imul(attacks, report.frames));
+    });
+  }
+  console.table(rows);
+});
+
+export {
+  frames,
+  warmUpFrames,
+  attackCounts,
+  attackPositions,
+  walkBackAndForth,
+}
+/*  Not a pure module */
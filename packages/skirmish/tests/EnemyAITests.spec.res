@@ -97,11 +97,12 @@ let withKaplayContext = (
         )
       }
 
-      let rs = EnemyAI.makeRuleSystem(
-        k,
-        ~enemy=enemies->Array.getUnsafe(0),
-        ~player=players->Array.getUnsafe(0),
-      )
+      let rs =
+        EnemyAI.makeRuleSystem(
+          k,
+          ~enemy=enemies->Array.getUnsafe(0),
+          ~player=players->Array.getUnsafe(0),
+        )->RuleSystem.toRuleSystem
 
       testFn(k, rs)
       ->thenResolve(resolve)
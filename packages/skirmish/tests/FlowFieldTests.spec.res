@@ -0,0 +1,52 @@
+open Vitest
+open Kaplay
+
+let tile = (x: float, y: float): Vec2.Tile.t => {x, y}
+
+test("a flow field leads around obstacles", () => {
+  // .#..
+  // .#..
+  // ....
+  let grid = FlowField.make(~columns=4, ~rows=3, ~tileWidth=10., ~tileHeight=10.)
+  grid->FlowField.setCost(tile(1., 0.), FlowField.blocked)
+  grid->FlowField.setCost(tile(1., 1.), FlowField.blocked)
+  let field = grid->FlowField.toGoal(tile(0., 0.))
+
+  let unreachable = Float.Constants.positiveInfinity
+  expect(field.distances)->Expect.toEqual(
+    Float64Array.fromArray([0., unreachable, 6., 7., 1., unreachable, 5., 6., 2., 3., 4., 5.]),
+  )
+  expect(grid->FlowField.toGoal(tile(0., 0.)))->Expect.toBe(field)
+
+  let direction: Vec2.World.t = {x: 0., y: 0.}
+  expect(field->FlowField.directionInto({x: 25., y: 5.}, direction))->Expect.toBe(true)
+  expect(direction)->Expect.toEqual(({x: 0., y: 1.}: Vec2.World.t))
+  // There is nowhere to go on the goal and outside the grid
+  expect(field->FlowField.directionInto({x: 5., y: 5.}, direction))->Expect.toBe(false)
+  expect(field->FlowField.directionInto({x: 45., y: 5.}, direction))->Expect.toBe(false)
+  Promise.resolve()
+})
+
+test("a repaired flow field matches one computed from scratch", () => {
+  let grid = FlowField.make(~columns=5, ~rows=5, ~tileWidth=1., ~tileHeight=1.)
+  let field = grid->FlowField.toGoal(tile(0., 0.))
+  let changes = [
+    (tile(1., 1.), FlowField.blocked),
+    (tile(2., 0.), 5),
+    (tile(0., 2.), FlowField.blocked),
+    (tile(1., 2.), FlowField.blocked),
+    (tile(1., 1.), 1),
+    (tile(2., 0.), 1),
+    (tile(3., 3.), 9),
+  ]
+
+  changes->Array.forEachWithIndex(((at, cost), index) => {
+    grid->FlowField.setCost(at, cost)
+    let fresh = FlowField.make(~columns=5, ~rows=5, ~tileWidth=1., ~tileHeight=1.)
+    changes
+    ->Array.slice(~start=0, ~end=index + 1)
+    ->Array.forEach(((at, cost)) => fresh->FlowField.setCost(at, cost))
+    expect(field.distances)->Expect.toEqual((fresh->FlowField.toGoal(tile(0., 0.))).distances)
+  })
+  Promise.resolve()
+})
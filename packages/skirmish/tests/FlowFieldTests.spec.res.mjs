@@ -0,0 +1,101 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vitest from "vitest";
+import * as FlowField$Kaplay from "@nojaf/rescript-kaplay/src/FlowField.res.mjs";
+
+function tile(x, y) {
+  return {
+    x: x,
+    y: y
+  };
+}
+
+Vitest.test("a flow field leads around obstacles", () => {
+  let grid = FlowField$Kaplay.make(4, 3, 10, 10, undefined);
+  FlowField$Kaplay.setCost(grid, tile(1, 0), -1);
+  FlowField$Kaplay.setCost(grid, tile(1, 1), -1);
+  let field = FlowField$Kaplay.toGoal(grid, tile(0, 0), undefined);
+  Vitest.expect(field.distances).toEqual(new Float64Array([
+    0,
+    Number.POSITIVE_INFINITY,
+    6,
+    7,
+    1,
+    Number.POSITIVE_INFINITY,
+    5,
+    6,
+    2,
+    3,
+    4,
+    5
+  ]));
+  Vitest.expect(FlowField$Kaplay.toGoal(grid, tile(0, 0), undefined)).toBe(field);
+  let direction = {
+    x: 0,
+    y: 0
+  };
+  Vitest.expect(FlowField$Kaplay.directionInto(field, {
+    x: 25,
+    y: 5
+  }, direction)).toBe(true);
+  Vitest.expect(direction).toEqual({
+    x: 0,
+    y: 1
+  });
+  Vitest.expect(FlowField$Kaplay.directionInto(field, {
+    x: 5,
+    y: 5
+  }, direction)).toBe(false);
+  Vitest.expect(FlowField$Kaplay.directionInto(field, {
+    x: 45,
+    y: 5
+  }, direction)).toBe(false);
+  return Promise.resolve();
+});
+
+Vitest.test("a repaired flow field matches one computed from scratch", () => {
+  let grid = FlowField$Kaplay.make(5, 5, 1, 1, undefined);
+  let field = FlowField$Kaplay.toGoal(grid, tile(0, 0), undefined);
+  let changes = [
+    [
+      tile(1, 1),
+      -1
+    ],
+    [
+      tile(2, 0),
+      5
+    ],
+    [
+      tile(0, 2),
+      -1
+    ],
+    [
+      tile(1, 2),
+      -1
+    ],
+    [
+      tile(1, 1),
+      1
+    ],
+    [
+      tile(2, 0),
+      1
+    ],
+    [
+      tile(3, 3),
+      9
+    ]
+  ];
+  changes.forEach((param, index) => {
+    FlowField$Kaplay.setCost(grid, param[0], param[1]);
+    let fresh = FlowField$Kaplay.make(5, 5, 1, 1, undefined);
+    changes.slice(0, index + 1 | 0).forEach(param => FlowField$Kaplay.setCost(fresh, param[0], param[1]));
+    Vitest.expect(field.distances).toEqual(FlowField$Kaplay.toGoal(fresh, tile(0, 0), undefined).distances);
+  });
+  return Promise.resolve();
+});
+
+export {
+  tile,
+}
+/*  Not a pure module */
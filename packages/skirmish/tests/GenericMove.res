@@ -11,7 +11,8 @@ include Color.Comp({type t = t})
 
 let tag = "generic-move"
 
-let getCorner = (attack: t, k: Context.t) => {
+/** The corner closest to the opponent in local coordinates, `corner` is written to in world coordinates. */
+let getCorner = (attack: t, k: Context.t, ~corner: Vec2.World.t) => {
   let pkmn =
     k
     ->Context.query({
@@ -23,20 +24,21 @@ let getCorner = (attack: t, k: Context.t) => {
   | None => None
   | Some(pkmn) => {
       let pkmnPos = pkmn->worldPos
-      let closestCorner = getClosestCorner(attack, k, ~pokemonPosition=pkmnPos)
-      Some(attack->fromWorld(closestCorner))
+      attack->getClosestCornerInto(~pokemonPosition=pkmnPos, corner)
+      Some(attack->fromWorld(corner))
     }
   }
 }
 
 let make = (k: Context.t, ~x, ~y, ~size: float, team: Team.t): t => {
+  let corner = k->Context.vec2World(0., 0.)
   let gameObj = k->Context.add(
     [
       Context.tag(tag),
       addPos(k, x, y),
       addAnchorCenter(k),
       Team.getTagComponent(team),
-      ...addAttackWithTag(@this (gameObj: t) => {
+      ...addAttackWithTag(k, @this (gameObj: t) => {
         let halfSize = size / 2.
         let worldPos = gameObj->worldPos
         Kaplay.Math.Rect.makeWorld(
@@ -61,7 +63,7 @@ let make = (k: Context.t, ~x, ~y, ~size: float, team: Team.t): t => {
             },
           )
 
-          switch getCorner(gameObj, k) {
+          switch getCorner(gameObj, k, ~corner) {
           | None => ()
           | Some(corner) => Context.drawCircle(k, {color: k->Color.yellow, pos: corner, radius: 3.})
           }
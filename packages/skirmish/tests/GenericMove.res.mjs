@@ -19,7 +19,7 @@ Rect$Kaplay.Comp({});
 
 let include = Attack$Skirmish.Comp({});
 
-let getClosestCorner = include.getClosestCorner;
+let getClosestCornerInto = include.getClosestCornerInto;
 
 let addAttackWithTag = include.addAttackWithTag;
 
@@ -29,7 +29,7 @@ Color$Kaplay.Comp({});
 
 let tag = "generic-move";
 
-function getCorner(attack, k) {
+function getCorner(attack, k, corner) {
   let pkmn = k.query({
       include: [Team$Skirmish.opponent]
     })[0];
@@ -37,11 +37,12 @@ function getCorner(attack, k) {
     return;
   }
   let pkmnPos = Primitive_option.valFromOption(pkmn).worldPos();
-  let closestCorner = getClosestCorner(attack, k, pkmnPos);
-  return attack.fromWorld(closestCorner);
+  getClosestCornerInto(attack, pkmnPos, corner);
+  return attack.fromWorld(corner);
 }
 
 function make(k, x, y, size, team) {
+  let corner = k.vec2(0, 0);
   let gameObj = k.add(Belt_Array.concatMany([
     [
       tag,
@@ -49,7 +50,7 @@ function make(k, x, y, size, team) {
       k.anchor("center"),
       Team$Skirmish.getTagComponent(team)
     ],
-    addAttackWithTag(function () {
+    addAttackWithTag(k, function () {
       let gameObj = this ;
       let halfSize = size / 2;
       let worldPos = gameObj.worldPos();
@@ -66,10 +67,10 @@ function make(k, x, y, size, team) {
             width: size,
             height: size
           });
-          let corner = getCorner(gameObj, k);
-          if (corner !== undefined) {
+          let corner$1 = getCorner(gameObj, k, corner);
+          if (corner$1 !== undefined) {
             k.drawCircle({
-              pos: corner,
+              pos: corner$1,
               color: k.YELLOW,
               radius: 3
             });
@@ -89,7 +90,7 @@ function make(k, x, y, size, team) {
 let addAttack = include.addAttack;
 
 export {
-  getClosestCorner,
+  getClosestCornerInto,
   addAttack,
   addAttackWithTag,
   tag,
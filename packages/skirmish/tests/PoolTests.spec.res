@@ -0,0 +1,140 @@
+open Vitest
+open Kaplay
+
+// Stand-ins for the context and its game objects, a pool only calls `add` on the context
+// and reads `exists`, `hidden` and `paused` of the objects.
+
+type fakeObj = {
+  id: int,
+  mutable hidden: bool,
+  mutable paused: bool,
+  alive: ref<bool>,
+  exists: unit => bool,
+}
+
+type fakeContext = {add: array<Types.comp> => fakeObj}
+
+external toContext: fakeContext => Context.t = "%identity"
+
+/** A context that records every object added to it, the id of an object is its position in `added`. */
+let makeContext = (added: array<fakeObj>): Context.t =>
+  toContext({
+    add: _components => {
+      let alive = ref(true)
+      let gameObj = {
+        id: added->Array.length,
+        hidden: false,
+        paused: false,
+        alive,
+        exists: () => alive.contents,
+      }
+      added->Array.push(gameObj)
+      gameObj
+    },
+  })
+
+let destroy = (gameObj: fakeObj) => gameObj.alive := false
+
+/** Every object gets one controller, `init` records the object and the argument of `acquire`. */
+let makePool = (k: Context.t, ~size: int, ~inits: array<(int, string)>) =>
+  Pool.make(
+    k,
+    ~size,
+    ~components=() => [],
+    ~listen=(_pool, _gameObj) => [{KEventController.paused: false}],
+    ~init=(gameObj: fakeObj, arg: string) => inits->Array.push((gameObj.id, arg)),
+  )
+
+let controllersPaused = (pool: Pool.t<fakeObj, string>, gameObj: fakeObj): array<bool> =>
+  switch pool.entries->WeakMap.get(gameObj) {
+  | Some(entry) => entry.controllers->Array.map(controller => controller.paused)
+  | None => []
+  }
+
+test("acquire hands out a pooled object and release puts it back", () => {
+  let added = []
+  let inits = []
+  let pool = makePool(makeContext(added), ~size=2, ~inits)
+
+  expect(added)->Expect.toHaveLength(2)
+  expect(pool->Pool.availableCount)->Expect.toBe(2)
+  added->Array.forEach(gameObj => {
+    expect((gameObj.hidden, gameObj.paused))->Expect.toEqual((true, true))
+    expect(controllersPaused(pool, gameObj))->Expect.toEqual([true])
+  })
+
+  // The last object added is handed out first
+  let gameObj = pool->Pool.acquire("first")
+  expect(gameObj)->Expect.toBe(added->Array.getUnsafe(1))
+  expect((gameObj.hidden, gameObj.paused))->Expect.toEqual((false, false))
+  expect(controllersPaused(pool, gameObj))->Expect.toEqual([false])
+  expect(inits)->Expect.toEqual([(1, "first")])
+  expect(pool->Pool.availableCount)->Expect.toBe(1)
+
+  pool->Pool.release(gameObj)
+  expect((gameObj.hidden, gameObj.paused))->Expect.toEqual((true, true))
+  expect(controllersPaused(pool, gameObj))->Expect.toEqual([true])
+  expect(pool->Pool.availableCount)->Expect.toBe(2)
+
+  expect(pool->Pool.acquire("second"))->Expect.toBe(gameObj)
+  expect(inits)->Expect.toEqual([(1, "first"), (1, "second")])
+  expect(added)->Expect.toHaveLength(2)
+  Promise.resolve()
+})
+
+test("acquire adds a new object when every object is in use", () => {
+  let added = []
+  let pool = makePool(makeContext(added), ~size=1, ~inits=[])
+
+  let first = pool->Pool.acquire("first")
+  let second = pool->Pool.acquire("second")
+  expect(added)->Expect.toHaveLength(2)
+  expect(second)->Expect.toBe(added->Array.getUnsafe(1))
+  expect(controllersPaused(pool, second))->Expect.toEqual([false])
+
+  // The pool keeps the object it grew with
+  pool->Pool.release(first)
+  pool->Pool.release(second)
+  expect(pool->Pool.availableCount)->Expect.toBe(2)
+  Promise.resolve()
+})
+
+test("releasing an object twice or one of another pool does nothing", () => {
+  let added = []
+  let k = makeContext(added)
+  let pool = makePool(k, ~size=1, ~inits=[])
+  let other = makePool(k, ~size=1, ~inits=[])
+
+  let gameObj = pool->Pool.acquire("first")
+  pool->Pool.release(gameObj)
+  pool->Pool.release(gameObj)
+  expect(pool->Pool.availableCount)->Expect.toBe(1)
+
+  let otherObj = other->Pool.acquire("other")
+  pool->Pool.release(otherObj)
+  expect(pool->Pool.availableCount)->Expect.toBe(1)
+  expect(otherObj.hidden)->Expect.toBe(false)
+
+  // The object was only put back once, so the second acquire adds a new one
+  expect(pool->Pool.acquire("second"))->Expect.toBe(gameObj)
+  expect(pool->Pool.acquire("third"))->Expect.not->Expect.toBe(gameObj)
+  expect(added)->Expect.toHaveLength(3)
+  Promise.resolve()
+})
+
+test("objects destroyed while pooled are dropped and replaced", () => {
+  let added = []
+  let pool = makePool(makeContext(added), ~size=2, ~inits=[])
+
+  // A scene change destroys the objects in the pool as well
+  destroy(added->Array.getUnsafe(1))
+  expect(pool->Pool.acquire("first"))->Expect.toBe(added->Array.getUnsafe(0))
+  expect(pool->Pool.availableCount)->Expect.toBe(0)
+
+  let gameObj = added->Array.getUnsafe(0)
+  pool->Pool.release(gameObj)
+  destroy(gameObj)
+  expect(pool->Pool.acquire("second"))->Expect.toBe(added->Array.getUnsafe(2))
+  expect(pool->Pool.availableCount)->Expect.toBe(0)
+  Promise.resolve()
+})
@@ -0,0 +1,158 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vitest from "vitest";
+import * as Pool$Kaplay from "@nojaf/rescript-kaplay/src/Pool.res.mjs";
+
+function makeContext(added) {
+  return {
+    add: _components => {
+      let alive = {
+        contents: true
+      };
+      let gameObj = {
+        id: added.length,
+        hidden: false,
+        paused: false,
+        alive: alive,
+        exists: () => alive.contents
+      };
+      added.push(gameObj);
+      return gameObj;
+    }
+  };
+}
+
+function destroy(gameObj) {
+  gameObj.alive.contents = false;
+}
+
+function makePool(k, size, inits) {
+  return Pool$Kaplay.make(k, size, () => [], (_pool, _gameObj) => [{
+      paused: false
+    }], (gameObj, arg) => {
+    inits.push([
+      gameObj.id,
+      arg
+    ]);
+  });
+}
+
+function controllersPaused(pool, gameObj) {
+  let entry = pool.entries.get(gameObj);
+  if (entry !== undefined) {
+    return entry.controllers.map(controller => controller.paused);
+  } else {
+    return [];
+  }
+}
+
+Vitest.test("acquire hands out a pooled object and release puts it back", () => {
+  let added = [];
+  let inits = [];
+  let pool = makePool(makeContext(added), 2, inits);
+  Vitest.expect(added).toHaveLength(2);
+  Vitest.expect(Pool$Kaplay.availableCount(pool)).toBe(2);
+  added.forEach(gameObj => {
+    Vitest.expect([
+      gameObj.hidden,
+      gameObj.paused
+    ]).toEqual([
+      true,
+      true
+    ]);
+    Vitest.expect(controllersPaused(pool, gameObj)).toEqual([true]);
+  });
+  let gameObj = Pool$Kaplay.acquire(pool, "first");
+  Vitest.expect(gameObj).toBe(added[1]);
+  Vitest.expect([
+    gameObj.hidden,
+    gameObj.paused
+  ]).toEqual([
+    false,
+    false
+  ]);
+  Vitest.expect(controllersPaused(pool, gameObj)).toEqual([false]);
+  Vitest.expect(inits).toEqual([[
+      1,
+      "first"
+    ]]);
+  Vitest.expect(Pool$Kaplay.availableCount(pool)).toBe(1);
+  Pool$Kaplay.release(pool, gameObj);
+  Vitest.expect([
+    gameObj.hidden,
+    gameObj.paused
+  ]).toEqual([
+    true,
+    true
+  ]);
+  Vitest.expect(controllersPaused(pool, gameObj)).toEqual([true]);
+  Vitest.expect(Pool$Kaplay.availableCount(pool)).toBe(2);
+  Vitest.expect(Pool$Kaplay.acquire(pool, "second")).toBe(gameObj);
+  Vitest.expect(inits).toEqual([
+    [
+      1,
+      "first"
+    ],
+    [
+      1,
+      "second"
+    ]
+  ]);
+  Vitest.expect(added).toHaveLength(2);
+  return Promise.resolve();
+});
+
+Vitest.test("acquire adds a new object when every object is in use", () => {
+  let added = [];
+  let pool = makePool(makeContext(added), 1, []);
+  let first = Pool$Kaplay.acquire(pool, "first");
+  let second = Pool$Kaplay.acquire(pool, "second");
+  Vitest.expect(added).toHaveLength(2);
+  Vitest.expect(second).toBe(added[1]);
+  Vitest.expect(controllersPaused(pool, second)).toEqual([false]);
+  Pool$Kaplay.release(pool, first);
+  Pool$Kaplay.release(pool, second);
+  Vitest.expect(Pool$Kaplay.availableCount(pool)).toBe(2);
+  return Promise.resolve();
+});
+
+Vitest.test("releasing an object twice or one of another pool does nothing", () => {
+  let added = [];
+  let k = makeContext(added);
+  let pool = makePool(k, 1, []);
+  let other = makePool(k, 1, []);
+  let gameObj = Pool$Kaplay.acquire(pool, "first");
+  Pool$Kaplay.release(pool, gameObj);
+  Pool$Kaplay.release(pool, gameObj);
+  Vitest.expect(Pool$Kaplay.availableCount(pool)).toBe(1);
+  let otherObj = Pool$Kaplay.acquire(other, "other");
+  Pool$Kaplay.release(pool, otherObj);
+  Vitest.expect(Pool$Kaplay.availableCount(pool)).toBe(1);
+  Vitest.expect(otherObj.hidden).toBe(false);
+  Vitest.expect(Pool$Kaplay.acquire(pool, "second")).toBe(gameObj);
+  Vitest.expect(Pool$Kaplay.acquire(pool, "third")).not.toBe(gameObj);
+  Vitest.expect(added).toHaveLength(3);
+  return Promise.resolve();
+});
+
+Vitest.test("objects destroyed while pooled are dropped and replaced", () => {
+  let added = [];
+  let pool = makePool(makeContext(added), 2, []);
+  destroy(added[1]);
+  Vitest.expect(Pool$Kaplay.acquire(pool, "first")).toBe(added[0]);
+  Vitest.expect(Pool$Kaplay.availableCount(pool)).toBe(0);
+  let gameObj = added[0];
+  Pool$Kaplay.release(pool, gameObj);
+  destroy(gameObj);
+  Vitest.expect(Pool$Kaplay.acquire(pool, "second")).toBe(added[2]);
+  Vitest.expect(Pool$Kaplay.availableCount(pool)).toBe(0);
+  return Promise.resolve();
+});
+
+export {
+  makeContext,
+  destroy,
+  makePool,
+  controllersPaused,
+}
+/*  Not a pure module */
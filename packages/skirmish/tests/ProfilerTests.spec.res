@@ -0,0 +1,50 @@
+open Vitest
+open Kaplay
+
+test("the update histogram only keeps the last window of samples", () => {
+  let histogram = Profiler.makeHistogram(~window=4, ~bucketMs=1., ~buckets=4)
+  [0.5, 0.5, 9., 1.5, 2.5, 2.5]->Array.forEach(ms => histogram->Profiler.addSample(ms))
+
+  expect(histogram.size)->Expect.toBe(4)
+  // The two 0.5ms samples were dropped, 9ms falls in the last bucket
+  expect(histogram.counts)->Expect.toEqual([0, 1, 2, 1])
+  expect(histogram->Profiler.percentile(0.5))->Expect.toBe(3.)
+  expect(histogram->Profiler.maxSample)->Expect.toBe(9.)
+  Promise.resolve()
+})
+
+// The profiler only reads `debug.numFrames` of the context
+type fakeDebug = {numFrames: unit => int}
+
+type fakeContext = {debug: fakeDebug}
+
+external toContext: fakeContext => Context.t = "%identity"
+
+test("measureUpdate only measures the wrapped handler between start and stop", () => {
+  let frame = ref(0)
+  let profiler = Profiler.make(toContext({debug: {numFrames: () => frame.contents}}))
+  let calls = ref(0)
+  let handler = profiler->Profiler.measureUpdate(~name="handler", () => calls := calls.contents + 1)
+
+  // The handler can be wrapped before the profiler starts
+  handler()
+  expect(calls.contents)->Expect.toBe(1)
+  expect(profiler.events)->Expect.toHaveLength(0)
+
+  profiler->Profiler.start
+  handler()
+  frame := 1
+  handler()
+  expect(calls.contents)->Expect.toBe(3)
+  expect(profiler.events->Array.map(event => event.name))->Expect.toEqual(["handler", "handler"])
+  // A frame goes into the histogram once a handler runs in the next frame
+  expect(profiler.updates.size)->Expect.toBe(1)
+
+  profiler->Profiler.stop
+  frame := 2
+  handler()
+  expect(calls.contents)->Expect.toBe(4)
+  expect(profiler.events)->Expect.toHaveLength(2)
+  expect(profiler.updates.size)->Expect.toBe(1)
+  Promise.resolve()
+})
@@ -0,0 +1,65 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vitest from "vitest";
+import * as Profiler$Kaplay from "@nojaf/rescript-kaplay/src/Profiler.res.mjs";
+
+Vitest.test("the update histogram only keeps the last window of samples", () => {
+  let histogram = Profiler$Kaplay.makeHistogram(4, 1, 4);
+  [
+    0.5,
+    0.5,
+    9,
+    1.5,
+    2.5,
+    2.5
+  ].forEach(ms => Profiler$Kaplay.addSample(histogram, ms));
+  Vitest.expect(histogram.size).toBe(4);
+  Vitest.expect(histogram.counts).toEqual([
+    0,
+    1,
+    2,
+    1
+  ]);
+  Vitest.expect(Profiler$Kaplay.percentile(histogram, 0.5)).toBe(3);
+  Vitest.expect(Profiler$Kaplay.maxSample(histogram)).toBe(9);
+  return Promise.resolve();
+});
+
+Vitest.test("measureUpdate only measures the wrapped handler between start and stop", () => {
+  let frame = {
+    contents: 0
+  };
+  let profiler = Profiler$Kaplay.make({
+    debug: {
+      numFrames: () => frame.contents
+    }
+  }, undefined, undefined, undefined, undefined);
+  let calls = {
+    contents: 0
+  };
+  let handler = Profiler$Kaplay.measureUpdate(profiler, "handler", () => {
+    calls.contents = calls.contents + 1 | 0;
+  });
+  handler();
+  Vitest.expect(calls.contents).toBe(1);
+  Vitest.expect(profiler.events).toHaveLength(0);
+  Profiler$Kaplay.start(profiler);
+  handler();
+  frame.contents = 1;
+  handler();
+  Vitest.expect(calls.contents).toBe(3);
+  Vitest.expect(profiler.events.map(event => event.name)).toEqual([
+    "handler",
+    "handler"
+  ]);
+  Vitest.expect(profiler.updates.size).toBe(1);
+  Profiler$Kaplay.stop(profiler);
+  frame.contents = 2;
+  handler();
+  Vitest.expect(calls.contents).toBe(4);
+  Vitest.expect(profiler.events).toHaveLength(2);
+  Vitest.expect(profiler.updates.size).toBe(1);
+  return Promise.resolve();
+});
+
+/*  Not a pure module */
@@ -0,0 +1,262 @@
+open Vitest
+open Kaplay
+
+let factA = RuleSystem.Fact("a")
+let factB = RuleSystem.Fact("b")
+
+// =============================================================================
+// RuleSystem.Compiled tests
+// =============================================================================
+
+test("assertFact adds to the current grade and clamps at 1.0", () => {
+  let rs: RuleSystem.t<unit> = RuleSystem.makeCompiled()->RuleSystem.toRuleSystem
+  rs->RuleSystem.assertFact(factA, ~grade=RuleSystem.Grade(0.25))
+  rs->RuleSystem.assertFact(factA, ~grade=RuleSystem.Grade(0.5))
+  expect(rs->RuleSystem.gradeForFact(factA))->Expect.toBe(RuleSystem.Grade(0.75))
+
+  rs->RuleSystem.assertFact(factA)
+  expect(rs->RuleSystem.gradeForFact(factA))->Expect.toBe(RuleSystem.Grade(1.0))
+  Promise.resolve()
+})
+
+test("retractFact subtracts from the current grade and clamps at 0.0", () => {
+  let rs: RuleSystem.t<unit> = RuleSystem.makeCompiled()->RuleSystem.toRuleSystem
+  rs->RuleSystem.assertFact(factA, ~grade=RuleSystem.Grade(0.5))
+  rs->RuleSystem.retractFact(factA, ~grade=RuleSystem.Grade(0.25))
+  expect(rs->RuleSystem.gradeForFact(factA))->Expect.toBe(RuleSystem.Grade(0.25))
+
+  rs->RuleSystem.retractFact(factA)
+  expect(rs->RuleSystem.gradeForFact(factA))->Expect.toBe(RuleSystem.Grade(0.0))
+  // Like Kaplay, a retracted fact is still present in the facts map
+  expect(rs.facts->Map.has(factA))->Expect.toBeTruthy
+  Promise.resolve()
+})
+
+test("reset clears all facts", () => {
+  let rs: RuleSystem.t<unit> = RuleSystem.makeCompiled()->RuleSystem.toRuleSystem
+  rs->RuleSystem.assertFact(factA)
+  rs->RuleSystem.assertFact(factB, ~grade=RuleSystem.Grade(0.5))
+  expect(rs.facts->Map.size)->Expect.toBe(2)
+
+  rs->RuleSystem.reset
+  expect(rs.facts->Map.size)->Expect.toBe(0)
+  expect(rs.facts->Map.has(factA))->Expect.toBeFalsy
+  expect(rs->RuleSystem.gradeForFact(factB))->Expect.toBe(RuleSystem.Grade(0.0))
+  Promise.resolve()
+})
+
+test("facts can be viewed as a map", () => {
+  let rs: RuleSystem.t<unit> = RuleSystem.makeCompiled()->RuleSystem.toRuleSystem
+  rs->RuleSystem.assertFact(factA, ~grade=RuleSystem.Grade(0.5))
+  let entries = rs.facts->Map.entries->Iterator.toArray
+
+  expect(entries)->Expect.toHaveLength(1)
+  expect(rs.facts->Map.get(factA))->Expect.toBe(Some(RuleSystem.Grade(0.5)))
+  expect(rs.facts->Map.get(factB))->Expect.toBeUndefined
+  Promise.resolve()
+})
+
+test("minimumGradeForFacts and maximumGradeForFacts treat missing facts as 0.0", () => {
+  let rs: RuleSystem.t<unit> = RuleSystem.makeCompiled()->RuleSystem.toRuleSystem
+  rs->RuleSystem.assertFact(factA, ~grade=RuleSystem.Grade(0.8))
+
+  expect(rs->RuleSystem.minimumGradeForFacts([factA, factB]))->Expect.toBe(RuleSystem.Grade(0.0))
+  expect(rs->RuleSystem.maximumGradeForFacts([factA, factB]))->Expect.toBe(RuleSystem.Grade(0.8))
+  Promise.resolve()
+})
+
+test("rules execute in ascending salience regardless of insertion order", () => {
+  let rs: RuleSystem.t<array<string>> = RuleSystem.makeCompiled()->RuleSystem.toRuleSystem
+  rs.state = []
+  rs->RuleSystem.addRuleExecutingAction(
+    _rs => true,
+    rs => rs.state->Array.push("derived"),
+    ~salience=RuleSystem.Salience(10.0),
+  )
+  rs->RuleSystem.addRuleExecutingAction(
+    _rs => true,
+    rs => rs.state->Array.push("base"),
+    ~salience=RuleSystem.Salience(0.0),
+  )
+  rs->RuleSystem.addRuleExecutingAction(
+    _rs => true,
+    rs => rs.state->Array.push("derived-2"),
+    ~salience=RuleSystem.Salience(10.0),
+  )
+
+  rs->RuleSystem.execute
+  expect(rs.state->Array.join(","))->Expect.toBe("base,derived,derived-2")
+  Promise.resolve()
+})
+
+test("facts asserted by lower salience rules are visible to higher salience rules", () => {
+  let rs: RuleSystem.t<unit> = RuleSystem.makeCompiled()->RuleSystem.toRuleSystem
+  rs->RuleSystem.addRuleAssertingFact(
+    rs => rs->RuleSystem.gradeForFact(factA) > RuleSystem.Grade(0.0),
+    factB,
+  )
+  rs->RuleSystem.addRuleExecutingAction(
+    _rs => true,
+    rs => rs->RuleSystem.assertFact(factA),
+    ~salience=RuleSystem.Salience(-1.0),
+  )
+
+  rs->RuleSystem.execute
+  expect(rs->RuleSystem.gradeForFact(factB))->Expect.toBe(RuleSystem.Grade(1.0))
+  Promise.resolve()
+})
+
+test("interning more facts than the initial capacity keeps all grades", () => {
+  let rs: RuleSystem.t<unit> = RuleSystem.makeCompiled()->RuleSystem.toRuleSystem
+  let facts = Array.fromInitializer(~length=40, index => RuleSystem.Fact(`fact-${Int.toString(index)}`))
+  facts->Array.forEach(fact => rs->RuleSystem.assertFact(fact, ~grade=RuleSystem.Grade(0.5)))
+
+  expect(rs.facts->Map.size)->Expect.toBe(40)
+  expect(rs->RuleSystem.minimumGradeForFacts(facts))->Expect.toBe(RuleSystem.Grade(0.5))
+  Promise.resolve()
+})
+
+// =============================================================================
+// Derived rules & changed facts
+// =============================================================================
+
+test("derived rules replay their facts when their reads are unchanged", () => {
+  let compiled: RuleSystem.Compiled.t<unit> = RuleSystem.makeCompiled()
+  let rs = compiled->RuleSystem.toRuleSystem
+  let runs = ref(0)
+  rs->RuleSystem.addRuleExecutingAction(
+    _rs => true,
+    rs => rs->RuleSystem.assertFact(factA, ~grade=RuleSystem.Grade(0.5)),
+  )
+  compiled->RuleSystem.addDerivedRule(
+    rs => rs->RuleSystem.gradeForFact(factA) > RuleSystem.Grade(0.0),
+    rs => {
+      runs := runs.contents + 1
+      rs->RuleSystem.assertFact(factB)
+    },
+    ~salience=RuleSystem.Salience(10.0),
+  )
+
+  for _frame in 1 to 3 {
+    rs->RuleSystem.reset
+    rs->RuleSystem.execute
+  }
+
+  expect(runs.contents)->Expect.toBe(1)
+  expect(rs->RuleSystem.gradeForFact(factB))->Expect.toBe(RuleSystem.Grade(1.0))
+  Promise.resolve()
+})
+
+test("derived rules re-run when one of their declared reads changed", () => {
+  let compiled: RuleSystem.Compiled.t<array<float>> = RuleSystem.makeCompiled()
+  let rs = compiled->RuleSystem.toRuleSystem
+  rs.state = [0.25, 0.25, 0.75]
+  let frame = ref(0)
+  let runs = ref(0)
+  rs->RuleSystem.addRuleExecutingAction(
+    _rs => true,
+    rs =>
+      rs->RuleSystem.assertFact(
+        factA,
+        ~grade=RuleSystem.Grade(rs.state->Array.getUnsafe(frame.contents)),
+      ),
+  )
+  compiled->RuleSystem.addDerivedRule(
+    _rs => true,
+    rs => {
+      runs := runs.contents + 1
+      rs->RuleSystem.assertFact(factB, ~grade=rs->RuleSystem.gradeForFact(factA))
+    },
+    ~reads=[factA],
+    ~salience=RuleSystem.Salience(10.0),
+  )
+
+  for index in 0 to 2 {
+    frame := index
+    rs->RuleSystem.reset
+    rs->RuleSystem.execute
+  }
+
+  expect(runs.contents)->Expect.toBe(2)
+  expect(rs->RuleSystem.gradeForFact(factB))->Expect.toBe(RuleSystem.Grade(0.75))
+  Promise.resolve()
+})
+
+test("changedFacts reports the grades that differ from the previous execute", () => {
+  let compiled: RuleSystem.Compiled.t<float> = RuleSystem.makeCompiled()
+  let rs = compiled->RuleSystem.toRuleSystem
+  rs.state = 0.5
+  rs->RuleSystem.addRuleExecutingAction(
+    _rs => true,
+    rs => {
+      rs->RuleSystem.assertFact(factA, ~grade=RuleSystem.Grade(rs.state))
+      rs->RuleSystem.assertFact(factB)
+    },
+  )
+
+  rs->RuleSystem.execute
+  rs->RuleSystem.reset
+  rs.state = 0.25
+  rs->RuleSystem.execute
+
+  let changes = compiled->RuleSystem.changedFacts
+  expect(changes)->Expect.toHaveLength(1)
+  expect((changes->Array.getUnsafe(0)).fact)->Expect.toBe(factA)
+  expect((changes->Array.getUnsafe(0)).previous)->Expect.toBe(RuleSystem.Grade(0.5))
+  expect(compiled->RuleSystem.hasFactChanged(factA))->Expect.toBeTruthy
+  expect(compiled->RuleSystem.hasFactChanged(factB))->Expect.toBeFalsy
+  Promise.resolve()
+})
+
+test("profile counts rule runs, replays and fact writes", () => {
+  let compiled: RuleSystem.Compiled.t<unit> = RuleSystem.makeCompiled()
+  let rs = compiled->RuleSystem.toRuleSystem
+  rs->RuleSystem.addRuleExecutingAction(_rs => true, rs => rs->RuleSystem.assertFact(factA))
+  compiled->RuleSystem.addDerivedRule(
+    rs => rs->RuleSystem.gradeForFact(factA) > RuleSystem.Grade(0.0),
+    rs => rs->RuleSystem.assertFact(factB),
+    ~salience=RuleSystem.Salience(10.0),
+  )
+  rs->RuleSystem.addRuleExecutingAction(
+    _rs => false,
+    rs => rs->RuleSystem.retractFact(factA),
+    ~salience=RuleSystem.Salience(20.0),
+  )
+
+  compiled->RuleSystem.startProfiling
+  for _frame in 1 to 3 {
+    rs->RuleSystem.reset
+    rs->RuleSystem.execute
+  }
+
+  let profile = compiled->RuleSystem.profile
+  expect(profile.executions)->Expect.toBe(3)
+  let rule = index => profile.rules->Array.getUnsafe(index)
+  expect((rule(0)).hits)->Expect.toBe(3)
+  expect((rule(1)).evaluations)->Expect.toBe(1)
+  expect((rule(1)).replays)->Expect.toBe(2)
+  expect((rule(2)).evaluations)->Expect.toBe(3)
+  expect((rule(2)).hits)->Expect.toBe(0)
+  expect(profile.facts)->Expect.toHaveLength(2)
+  expect((profile.facts->Array.getUnsafe(1)).asserts)->Expect.toBe(3)
+  Promise.resolve()
+})
+
+test("execute stops counting after stopProfiling", () => {
+  let compiled: RuleSystem.Compiled.t<unit> = RuleSystem.makeCompiled()
+  let rs = compiled->RuleSystem.toRuleSystem
+  rs->RuleSystem.addRuleExecutingAction(_rs => true, rs => rs->RuleSystem.assertFact(factA))
+  expect((compiled->RuleSystem.profile).rules)->Expect.toHaveLength(0)
+
+  compiled->RuleSystem.startProfiling
+  rs->RuleSystem.execute
+  compiled->RuleSystem.stopProfiling
+  rs->RuleSystem.reset
+  rs->RuleSystem.execute
+
+  let profile = compiled->RuleSystem.profile
+  expect(profile.executions)->Expect.toBe(1)
+  expect((profile.rules->Array.getUnsafe(0)).hits)->Expect.toBe(1)
+  expect(rs->RuleSystem.gradeForFact(factA))->Expect.toBe(RuleSystem.Grade(1.0))
+  Promise.resolve()
+})
@@ -0,0 +1,207 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vitest from "vitest";
+import * as Stdlib_Array from "@rescript/runtime/lib/es6/Stdlib_Array.mjs";
+import * as RuleSystem$Kaplay from "@nojaf/rescript-kaplay/src/RuleSystem.res.mjs";
+
+Vitest.test("assertFact adds to the current grade and clamps at 1.0", () => {
+  let rs = RuleSystem$Kaplay.makeCompiled();
+  rs.assertFact("a", 0.25);
+  rs.assertFact("a", 0.5);
+  Vitest.expect(rs.gradeForFact("a")).toBe(0.75);
+  rs.assertFact("a");
+  Vitest.expect(rs.gradeForFact("a")).toBe(1.0);
+  return Promise.resolve();
+});
+
+Vitest.test("retractFact subtracts from the current grade and clamps at 0.0", () => {
+  let rs = RuleSystem$Kaplay.makeCompiled();
+  rs.assertFact("a", 0.5);
+  rs.retractFact("a", 0.25);
+  Vitest.expect(rs.gradeForFact("a")).toBe(0.25);
+  rs.retractFact("a");
+  Vitest.expect(rs.gradeForFact("a")).toBe(0.0);
+  Vitest.expect(rs.facts.has("a")).toBeTruthy();
+  return Promise.resolve();
+});
+
+Vitest.test("reset clears all facts", () => {
+  let rs = RuleSystem$Kaplay.makeCompiled();
+  rs.assertFact("a");
+  rs.assertFact("b", 0.5);
+  Vitest.expect(rs.facts.size).toBe(2);
+  rs.reset();
+  Vitest.expect(rs.facts.size).toBe(0);
+  Vitest.expect(rs.facts.has("a")).toBeFalsy();
+  Vitest.expect(rs.gradeForFact("b")).toBe(0.0);
+  return Promise.resolve();
+});
+
+Vitest.test("facts can be viewed as a map", () => {
+  let rs = RuleSystem$Kaplay.makeCompiled();
+  rs.assertFact("a", 0.5);
+  let entries = rs.facts.entries().toArray();
+  Vitest.expect(entries).toHaveLength(1);
+  Vitest.expect(rs.facts.get("a")).toBe(0.5);
+  Vitest.expect(rs.facts.get("b")).toBeUndefined();
+  return Promise.resolve();
+});
+
+Vitest.test("minimumGradeForFacts and maximumGradeForFacts treat missing facts as 0.0", () => {
+  let rs = RuleSystem$Kaplay.makeCompiled();
+  rs.assertFact("a", 0.8);
+  Vitest.expect(rs.minimumGradeForFacts("a", "b")).toBe(0.0);
+  Vitest.expect(rs.maximumGradeForFacts("a", "b")).toBe(0.8);
+  return Promise.resolve();
+});
+
+Vitest.test("rules execute in ascending salience regardless of insertion order", () => {
+  let rs = RuleSystem$Kaplay.makeCompiled();
+  rs.state = [];
+  rs.addRuleExecutingAction(_rs => true, rs => {
+    rs.state.push("derived");
+  }, 10.0);
+  rs.addRuleExecutingAction(_rs => true, rs => {
+    rs.state.push("base");
+  }, 0.0);
+  rs.addRuleExecutingAction(_rs => true, rs => {
+    rs.state.push("derived-2");
+  }, 10.0);
+  rs.execute();
+  Vitest.expect(rs.state.join(",")).toBe("base,derived,derived-2");
+  return Promise.resolve();
+});
+
+Vitest.test("facts asserted by lower salience rules are visible to higher salience rules", () => {
+  let rs = RuleSystem$Kaplay.makeCompiled();
+  rs.addRuleAssertingFact(rs => rs.gradeForFact("a") > 0.0, "b");
+  rs.addRuleExecutingAction(_rs => true, rs => rs.assertFact("a"), -1.0);
+  rs.execute();
+  Vitest.expect(rs.gradeForFact("b")).toBe(1.0);
+  return Promise.resolve();
+});
+
+Vitest.test("interning more facts than the initial capacity keeps all grades", () => {
+  let rs = RuleSystem$Kaplay.makeCompiled();
+  let facts = Stdlib_Array.fromInitializer(40, index => `fact-` + index.toString());
+  facts.forEach(fact => rs.assertFact(fact, 0.5));
+  Vitest.expect(rs.facts.size).toBe(40);
+  Vitest.expect(rs.minimumGradeForFacts(...facts)).toBe(0.5);
+  return Promise.resolve();
+});
+
+Vitest.test("derived rules replay their facts when their reads are unchanged", () => {
+  let compiled = RuleSystem$Kaplay.makeCompiled();
+  let runs = {
+    contents: 0
+  };
+  compiled.addRuleExecutingAction(_rs => true, rs => rs.assertFact("a", 0.5));
+  compiled.addDerivedRule(rs => rs.gradeForFact("a") > 0.0, rs => {
+    runs.contents = runs.contents + 1 | 0;
+    rs.assertFact("b");
+  }, undefined, 10.0);
+  for (let _frame = 1; _frame <= 3; ++_frame) {
+    compiled.reset();
+    compiled.execute();
+  }
+  Vitest.expect(runs.contents).toBe(1);
+  Vitest.expect(compiled.gradeForFact("b")).toBe(1.0);
+  return Promise.resolve();
+});
+
+Vitest.test("derived rules re-run when one of their declared reads changed", () => {
+  let compiled = RuleSystem$Kaplay.makeCompiled();
+  compiled.state = [
+    0.25,
+    0.25,
+    0.75
+  ];
+  let frame = {
+    contents: 0
+  };
+  let runs = {
+    contents: 0
+  };
+  compiled.addRuleExecutingAction(_rs => true, rs => rs.assertFact("a", rs.state[frame.contents]));
+  compiled.addDerivedRule(_rs => true, rs => {
+    runs.contents = runs.contents + 1 | 0;
+    rs.assertFact("b", rs.gradeForFact("a"));
+  }, ["a"], 10.0);
+  for (let index = 0; index <= 2; ++index) {
+    frame.contents = index;
+    compiled.reset();
+    compiled.execute();
+  }
+  Vitest.expect(runs.contents).toBe(2);
+  Vitest.expect(compiled.gradeForFact("b")).toBe(0.75);
+  return Promise.resolve();
+});
+
+Vitest.test("changedFacts reports the grades that differ from the previous execute", () => {
+  let compiled = RuleSystem$Kaplay.makeCompiled();
+  compiled.state = 0.5;
+  compiled.addRuleExecutingAction(_rs => true, rs => {
+    rs.assertFact("a", rs.state);
+    rs.assertFact("b");
+  });
+  compiled.execute();
+  compiled.reset();
+  compiled.state = 0.25;
+  compiled.execute();
+  let changes = compiled.changedFacts();
+  Vitest.expect(changes).toHaveLength(1);
+  Vitest.expect(changes[0].fact).toBe("a");
+  Vitest.expect(changes[0].previous).toBe(0.5);
+  Vitest.expect(compiled.hasFactChanged("a")).toBeTruthy();
+  Vitest.expect(compiled.hasFactChanged("b")).toBeFalsy();
+  return Promise.resolve();
+});
+
+Vitest.test("profile counts rule runs, replays and fact writes", () => {
+  let compiled = RuleSystem$Kaplay.makeCompiled();
+  compiled.addRuleExecutingAction(_rs => true, rs => rs.assertFact("a"));
+  compiled.addDerivedRule(rs => rs.gradeForFact("a") > 0.0, rs => rs.assertFact("b"), undefined, 10.0);
+  compiled.addRuleExecutingAction(_rs => false, rs => rs.retractFact("a"), 20.0);
+  compiled.startProfiling();
+  for (let _frame = 1; _frame <= 3; ++_frame) {
+    compiled.reset();
+    compiled.execute();
+  }
+  let profile = compiled.profile();
+  Vitest.expect(profile.executions).toBe(3);
+  let rule = index => profile.rules[index];
+  Vitest.expect(rule(0).hits).toBe(3);
+  Vitest.expect(rule(1).evaluations).toBe(1);
+  Vitest.expect(rule(1).replays).toBe(2);
+  Vitest.expect(rule(2).evaluations).toBe(3);
+  Vitest.expect(rule(2).hits).toBe(0);
+  Vitest.expect(profile.facts).toHaveLength(2);
+  Vitest.expect(profile.facts[1].asserts).toBe(3);
+  return Promise.resolve();
+});
+
+Vitest.test("execute stops counting after stopProfiling", () => {
+  let compiled = RuleSystem$Kaplay.makeCompiled();
+  compiled.addRuleExecutingAction(_rs => true, rs => rs.assertFact("a"));
+  Vitest.expect(compiled.profile().rules).toHaveLength(0);
+  compiled.startProfiling();
+  compiled.execute();
+  compiled.stopProfiling();
+  compiled.reset();
+  compiled.execute();
+  let profile = compiled.profile();
+  Vitest.expect(profile.executions).toBe(1);
+  Vitest.expect(profile.rules[0].hits).toBe(1);
+  Vitest.expect(compiled.gradeForFact("a")).toBe(1.0);
+  return Promise.resolve();
+});
+
+let factA = "a";
+
+let factB = "b";
+
+export {
+  factA,
+  factB,
+}
+/*  Not a pure module */
@@ -0,0 +1,225 @@
+open Kaplay
+
+/***
+ * Headless runner that measures `EnemyAI` rule evaluation under synthetic attack load.
+ *
+ * The frames are played by Kaplay's own loop, so time advances, collisions are resolved and
+ * move cooldowns recover like in a match. Each frame the enemy's rule system is reset, executed and
+ * acted upon from an `onUpdate` handler. During a run `debug.timeScale` is fixed so that a frame
+ * advances the game by about `dt` seconds.
+ *
+ * A run is not faster than real time, it takes as long as Kaplay takes to play its frames.
+ */
+
+@val @scope("performance")
+external now: unit => float = "now"
+
+type memory = {usedJSHeapSize: float}
+
+/** Only available in Chromium, precise with `--enable-precise-memory-info`. */
+@val @scope("performance")
+external memory: Nullable.t<memory> = "memory"
+
+@send
+external thenResolve: (promise<'data>, 'data => unit) => promise<'data> = "then"
+
+@send
+external catchJSError: (promise<'data>, JsError.t => unit) => promise<'data> = "catch"
+
+@send
+external finally: (promise<'data>, unit => unit) => unit = "finally"
+
+type vec2Factory
+
+@get
+external getVec2: Context.t => vec2Factory = "vec2"
+
+@set
+external setVec2: (Context.t, vec2Factory) => unit = "vec2"
+
+let countCalls: (vec2Factory, unit => unit) => vec2Factory = %raw(`
+  function (vec2, count) {
+    return function (...args) {
+      count();
+      return vec2.apply(this, args);
+    };
+  }
+`)
+
+/** Runs `frame`, an error it throws is passed to `onError` instead of Kaplay's error handler. */
+let catchFrameError: (unit => unit, JsError.t => unit) => unit = %raw(`
+  function (frame, onError) {
+    try {
+      frame();
+    } catch (error) {
+      onError(error);
+    }
+  }
+`)
+
+type t = {
+  k: Context.t,
+  rs: RuleSystem.t<RuleSystemState.t>,
+  dt: float,
+  mutable frame: int,
+}
+
+type report = {
+  frames: int,
+  /** The sum of `dt()` over the frames */
+  simulatedSeconds: float,
+  wallTimeMs: float,
+  /** Total time spent in `RuleSystem.execute` */
+  executeTimeMs: float,
+  /**
+   * `Context.vec2*` calls made during the run. Vectors that Kaplay creates internally or that
+   * `Vec2` functions like `add` return are not counted.
+   */
+  vec2Calls: int,
+  /** `Context.vec2*` calls made by `RuleSystem.execute` */
+  executeVec2Calls: int,
+  heapGrowthBytes: option<float>,
+}
+
+let make = (k: Context.t, ~enemy: Pokemon.t, ~player: Pokemon.t, ~dt=1. / 60.): t => {
+  k,
+  rs: EnemyAI.makeRuleSystem(k, ~enemy, ~player)->RuleSystem.toRuleSystem,
+  dt,
+  frame: 0,
+}
+
+let usedHeap = () => memory->Nullable.toOption->Option.map(memory => memory.usedJSHeapSize)
+
+/**
+ * Play `frames` frames. Each frame `script` is called first to drive the player,
+ * then the enemy thinks (`RuleSystem.execute`) and acts, then Kaplay updates the other objects.
+ */
+let run = (simulation: t, ~frames: int, ~script: (t, int) => unit=(_, _) => ()): promise<report> => {
+  let k = simulation.k
+  let debug = k.debug
+  let timeScale = debug.timeScale
+  let vec2 = k->getVec2
+
+  Promise.make((resolve, reject) => {
+    // dt() is the duration of Kaplay's last frame times the time scale
+    debug.timeScale = 1.
+    let frameTime = k->Context.dt
+    if frameTime <= 0. {
+      debug.timeScale = timeScale
+      JsError.throwWithMessage("Simulation.run needs Kaplay to have run at least one frame")
+    }
+    debug.timeScale = simulation.dt / frameTime
+
+    let vec2Calls = ref(0)
+    let executeVec2Calls = ref(0)
+    k->setVec2(countCalls(vec2, () => vec2Calls := vec2Calls.contents + 1))
+
+    let played = ref(0)
+    let simulatedSeconds = ref(0.)
+    let executeTimeMs = ref(0.)
+    let heapBefore = usedHeap()
+    let start = now()
+
+    let controller = ref(KEventController.empty)
+    // Kaplay's time scale and `vec2` are restored also when the script or a rule throws
+    let stop = () => {
+      controller.contents->KEventController.cancel
+      k->setVec2(vec2)
+      debug.timeScale = timeScale
+    }
+
+    let playFrame = () => {
+      script(simulation, simulation.frame)
+
+      simulation.rs->RuleSystem.reset
+      let callsBefore = vec2Calls.contents
+      let executeStart = now()
+      simulation.rs->RuleSystem.execute
+      executeTimeMs := executeTimeMs.contents + now() - executeStart
+      executeVec2Calls := executeVec2Calls.contents + vec2Calls.contents - callsBefore
+      EnemyAI.act(k, simulation.rs)
+
+      simulatedSeconds := simulatedSeconds.contents + k->Context.dt
+      simulation.frame = simulation.frame + 1
+      played := played.contents + 1
+
+      if played.contents == frames {
+        stop()
+        let wallTimeMs = now() - start
+        let heapGrowthBytes = switch (heapBefore, usedHeap()) {
+        | (Some(before), Some(after)) => Some(after - before)
+        | _ => None
+        }
+
+        resolve({
+          frames,
+          simulatedSeconds: simulatedSeconds.contents,
+          wallTimeMs,
+          executeTimeMs: executeTimeMs.contents,
+          vec2Calls: vec2Calls.contents,
+          executeVec2Calls: executeVec2Calls.contents,
+          heapGrowthBytes,
+        })
+      }
+    }
+
+    controller :=
+      k->Context.onUpdateWithController(() =>
+        catchFrameError(playFrame, error => {
+          stop()
+          reject(error)
+        })
+      )
+  })
+}
+
+let width = 480.
+let height = 480.
+
+/**
+ * Set up a match in a fresh Kaplay context: the enemy at the top, the player at the bottom
+ * and a player attack (see `GenericMove`) at each of `attacks`.
+ */
+let withSimulation = (
+  ~attacks: array<(float, float)>=[],
+  ~dt=?,
+  testFn: t => promise<unit>,
+): promise<unit> => {
+  let k = Context.kaplay(
+    ~initOptions={
+      width: Float.toInt(width),
+      height: Float.toInt(height),
+      global: false,
+      background: "#000000",
+      scale: 1.,
+      crisp: true,
+    },
+  )
+
+  Pokemon.load(k, 4)
+  Pokemon.load(k, 25)
+
+  Promise.make((resolve, reject) => {
+    k->Context.onError((error: JsError.t) => {
+      k->Context.quit
+      reject(error)
+    })
+    k->Context.onLoad(() => {
+      let enemy = Pokemon.make(k, ~pokemonId=4, ~level=5, Opponent)
+      enemy->Pokemon.setPos(k->Context.vec2Local(width / 2., 48.))
+      let player = Pokemon.make(k, ~pokemonId=25, ~level=12, Player)
+      player->Pokemon.setPos(k->Context.vec2Local(width / 2., height - 48.))
+
+      attacks->Array.forEach(((x, y)) => GenericMove.make(k, ~x, ~y, ~size=16., Player)->ignore)
+
+      testFn(make(k, ~enemy, ~player, ~dt?))
+      ->thenResolve(resolve)
+      ->catchJSError(reject)
+      ->finally(
+        () => {
+          k->Context.quit
+        },
+      )
+    })
+  })
+}
@@ -0,0 +1,165 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import Kaplay from "kaplay";
+import * as Stdlib_Option from "@rescript/runtime/lib/es6/Stdlib_Option.mjs";
+import * as EnemyAI$Skirmish from "../src/EnemyAI.res.mjs";
+import * as Pokemon$Skirmish from "../src/Pokemon.res.mjs";
+import * as Stdlib_JsError from "@rescript/runtime/lib/es6/Stdlib_JsError.mjs";
+import * as Primitive_option from "@rescript/runtime/lib/es6/Primitive_option.mjs";
+import * as KEventController$Kaplay from "@nojaf/rescript-kaplay/src/KEventController.res.mjs";
+import * as GenericMove$Skirmish from "./GenericMove.res.mjs";
+
+let countCalls = (function (vec2, count) {
+    return function (...args) {
+      count();
+      return vec2.apply(this, args);
+    };
+  });
+
+let catchFrameError = (function (frame, onError) {
+    try {
+      frame();
+    } catch (error) {
+      onError(error);
+    }
+  });
+
+function make(k, enemy, player, dtOpt) {
+  let dt = dtOpt !== undefined ? dtOpt : 1 / 60;
+  return {
+    k: k,
+    rs: EnemyAI$Skirmish.makeRuleSystem(k, enemy, player),
+    dt: dt,
+    frame: 0
+  };
+}
+
+function usedHeap() {
+  return Stdlib_Option.map(Primitive_option.fromNullable(performance.memory), memory => memory.usedJSHeapSize);
+}
+
+function run(simulation, frames, scriptOpt) {
+  let script = scriptOpt !== undefined ? scriptOpt : (param, param$1) => {};
+  let k = simulation.k;
+  let debug = k.debug;
+  let timeScale = debug.timeScale;
+  let vec2 = k.vec2;
+  return new Promise((resolve, reject) => {
+    debug.timeScale = 1;
+    let frameTime = k.dt();
+    if (frameTime <= 0) {
+      debug.timeScale = timeScale;
+      Stdlib_JsError.throwWithMessage("Simulation.run needs Kaplay to have run at least one frame");
+    }
+    debug.timeScale = simulation.dt / frameTime;
+    let vec2Calls = {
+      contents: 0
+    };
+    let executeVec2Calls = {
+      contents: 0
+    };
+    k.vec2 = countCalls(vec2, () => {
+      vec2Calls.contents = vec2Calls.contents + 1 | 0;
+    });
+    let played = {
+      contents: 0
+    };
+    let simulatedSeconds = {
+      contents: 0
+    };
+    let executeTimeMs = {
+      contents: 0
+    };
+    let heapBefore = usedHeap();
+    let start = performance.now();
+    let controller = {
+      contents: KEventController$Kaplay.empty
+    };
+    let stop = () => {
+      controller.contents.cancel();
+      k.vec2 = vec2;
+      debug.timeScale = timeScale;
+    };
+    let playFrame = () => {
+      script(simulation, simulation.frame);
+      simulation.rs.reset();
+      let callsBefore = vec2Calls.contents;
+      let executeStart = performance.now();
+      simulation.rs.execute();
+      executeTimeMs.contents = executeTimeMs.contents + performance.now() - executeStart;
+      executeVec2Calls.contents = (executeVec2Calls.contents + vec2Calls.contents | 0) - callsBefore | 0;
+      EnemyAI$Skirmish.act(k, simulation.rs);
+      simulatedSeconds.contents = simulatedSeconds.contents + k.dt();
+      simulation.frame = simulation.frame + 1 | 0;
+      played.contents = played.contents + 1 | 0;
+      if (played.contents !== frames) {
+        return;
+      }
+      stop();
+      let wallTimeMs = performance.now() - start;
+      let match = usedHeap();
+      let heapGrowthBytes = heapBefore !== undefined && match !== undefined ? match - heapBefore : undefined;
+      resolve({
+        frames: frames,
+        simulatedSeconds: simulatedSeconds.contents,
+        wallTimeMs: wallTimeMs,
+        executeTimeMs: executeTimeMs.contents,
+        vec2Calls: vec2Calls.contents,
+        executeVec2Calls: executeVec2Calls.contents,
+        heapGrowthBytes: heapGrowthBytes
+      });
+    };
+    controller.contents = k.onUpdate(() => catchFrameError(playFrame, error => {
+      stop();
+      reject(error);
+    }));
+  });
+}
+
+let width = 480;
+
+let height = 480;
+
+function withSimulation(attacksOpt, dt, testFn) {
+  let attacks = attacksOpt !== undefined ? attacksOpt : [];
+  let k = Kaplay({
+    width: 480,
+    height: 480,
+    global: false,
+    background: "#000000",
+    scale: 1,
+    crisp: true
+  });
+  Pokemon$Skirmish.load(k, 4);
+  Pokemon$Skirmish.load(k, 25);
+  return new Promise((resolve, reject) => {
+    k.onError(error => {
+      k.quit();
+      reject(error);
+    });
+    k.onLoad(() => {
+      let enemy = Pokemon$Skirmish.make(k, 4, 5, undefined, undefined, undefined, undefined, false);
+      enemy.pos = k.vec2(480 / 2, 48);
+      let player = Pokemon$Skirmish.make(k, 25, 12, undefined, undefined, undefined, undefined, true);
+      player.pos = k.vec2(480 / 2, 480 - 48);
+      attacks.forEach(param => {
+        GenericMove$Skirmish.make(k, param[0], param[1], 16, true);
+      });
+      testFn(make(k, enemy, player, dt)).then(resolve).catch(reject).finally(() => {
+        k.quit();
+      });
+    });
+  });
+}
+
+export {
+  countCalls,
+  catchFrameError,
+  make,
+  usedHeap,
+  run,
+  width,
+  height,
+  withSimulation,
+}
+/*  Not a pure module */
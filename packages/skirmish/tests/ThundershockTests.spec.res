@@ -0,0 +1,49 @@
+open Vitest
+
+// The rect is the square from (0, 0) to (10, 10)
+let hitsSquare = (~fromX, ~fromY, ~toX, ~toY) =>
+  Thundershock.segmentIntersectsRect(
+    ~fromX,
+    ~fromY,
+    ~toX,
+    ~toY,
+    ~minX=0.,
+    ~minY=0.,
+    ~maxX=10.,
+    ~maxY=10.,
+  )
+
+test("segmentIntersectsRect hits segments inside or crossing the rect", () => {
+  expect(hitsSquare(~fromX=2., ~fromY=2., ~toX=8., ~toY=8.))->Expect.toBe(true)
+  expect(hitsSquare(~fromX=-5., ~fromY=5., ~toX=15., ~toY=5.))->Expect.toBe(true)
+  expect(hitsSquare(~fromX=5., ~fromY=-5., ~toX=5., ~toY=2.))->Expect.toBe(true)
+  Promise.resolve()
+})
+
+test("segmentIntersectsRect counts touching an edge or a corner as a hit", () => {
+  // Along the top edge
+  expect(hitsSquare(~fromX=-5., ~fromY=0., ~toX=15., ~toY=0.))->Expect.toBe(true)
+  // Ends on the left edge
+  expect(hitsSquare(~fromX=-5., ~fromY=5., ~toX=0., ~toY=5.))->Expect.toBe(true)
+  // Starts in the bottom right corner
+  expect(hitsSquare(~fromX=10., ~fromY=10., ~toX=20., ~toY=20.))->Expect.toBe(true)
+  Promise.resolve()
+})
+
+test("segmentIntersectsRect treats a zero-length segment as a point", () => {
+  expect(hitsSquare(~fromX=5., ~fromY=5., ~toX=5., ~toY=5.))->Expect.toBe(true)
+  expect(hitsSquare(~fromX=10., ~fromY=5., ~toX=10., ~toY=5.))->Expect.toBe(true)
+  expect(hitsSquare(~fromX=12., ~fromY=5., ~toX=12., ~toY=5.))->Expect.toBe(false)
+  Promise.resolve()
+})
+
+test("segmentIntersectsRect misses segments next to the rect", () => {
+  // Parallel to an edge, just outside
+  expect(hitsSquare(~fromX=-5., ~fromY=-1., ~toX=15., ~toY=-1.))->Expect.toBe(false)
+  expect(hitsSquare(~fromX=11., ~fromY=-5., ~toX=11., ~toY=15.))->Expect.toBe(false)
+  // Ends before the rect
+  expect(hitsSquare(~fromX=5., ~fromY=-10., ~toX=5., ~toY=-1.))->Expect.toBe(false)
+  // Passes the top right corner diagonally
+  expect(hitsSquare(~fromX=8., ~fromY=-5., ~toX=15., ~toY=2.))->Expect.toBe(false)
+  Promise.resolve()
+})
@@ -0,0 +1,42 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vitest from "vitest";
+import * as Thundershock$Skirmish from "../src/Moves/Thundershock.res.mjs";
+
+function hitsSquare(fromX, fromY, toX, toY) {
+  return Thundershock$Skirmish.segmentIntersectsRect(fromX, fromY, toX, toY, 0, 0, 10, 10);
+}
+
+Vitest.test("segmentIntersectsRect hits segments inside or crossing the rect", () => {
+  Vitest.expect(hitsSquare(2, 2, 8, 8)).toBe(true);
+  Vitest.expect(hitsSquare(-5, 5, 15, 5)).toBe(true);
+  Vitest.expect(hitsSquare(5, -5, 5, 2)).toBe(true);
+  return Promise.resolve();
+});
+
+Vitest.test("segmentIntersectsRect counts touching an edge or a corner as a hit", () => {
+  Vitest.expect(hitsSquare(-5, 0, 15, 0)).toBe(true);
+  Vitest.expect(hitsSquare(-5, 5, 0, 5)).toBe(true);
+  Vitest.expect(hitsSquare(10, 10, 20, 20)).toBe(true);
+  return Promise.resolve();
+});
+
+Vitest.test("segmentIntersectsRect treats a zero-length segment as a point", () => {
+  Vitest.expect(hitsSquare(5, 5, 5, 5)).toBe(true);
+  Vitest.expect(hitsSquare(10, 5, 10, 5)).toBe(true);
+  Vitest.expect(hitsSquare(12, 5, 12, 5)).toBe(false);
+  return Promise.resolve();
+});
+
+Vitest.test("segmentIntersectsRect misses segments next to the rect", () => {
+  Vitest.expect(hitsSquare(-5, -1, 15, -1)).toBe(false);
+  Vitest.expect(hitsSquare(11, -5, 11, 15)).toBe(false);
+  Vitest.expect(hitsSquare(5, -10, 5, -1)).toBe(false);
+  Vitest.expect(hitsSquare(8, -5, 15, 2)).toBe(false);
+  return Promise.resolve();
+});
+
+export {
+  hitsSquare,
+}
+/*  Not a pure module */
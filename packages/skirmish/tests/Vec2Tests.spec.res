@@ -0,0 +1,99 @@
+open Vitest
+open Kaplay
+
+// The in-place operations only read and write `x` and `y`, so plain records stand in for Kaplay's vectors.
+
+let vec = (x: float, y: float): Vec2.World.t => {x, y}
+
+let xy = (vec2: Vec2.World.t) => (vec2.x, vec2.y)
+
+// =============================================================================
+// In-place operations
+// =============================================================================
+
+test("in-place operations write the result into their first argument", () => {
+  let a = vec(1., 2.)
+  let b = vec(3., 5.)
+
+  a->Vec2.World.addInPlace(b)
+  expect(xy(a))->Expect.toEqual((4., 7.))
+  a->Vec2.World.subInPlace(b)
+  expect(xy(a))->Expect.toEqual((1., 2.))
+  a->Vec2.World.addXYInPlace(-1., 1.)
+  expect(xy(a))->Expect.toEqual((0., 3.))
+  a->Vec2.World.scaleInPlace(2.)
+  expect(xy(a))->Expect.toEqual((0., 6.))
+  a->Vec2.World.setXY(8., 9.)
+  expect(xy(a))->Expect.toEqual((8., 9.))
+
+  b->Vec2.World.copyInto(a)
+  expect(xy(b))->Expect.toEqual((8., 9.))
+  expect(b)->Expect.not->Expect.toBe(a)
+  expect(a->Vec2.World.sdistXY(5., 5.))->Expect.toBe(25.)
+  Promise.resolve()
+})
+
+test("in-place operations accept the same vector as both arguments", () => {
+  let a = vec(1., 2.)
+  a->Vec2.World.addInPlace(a)
+  expect(xy(a))->Expect.toEqual((2., 4.))
+  a->Vec2.World.copyInto(a)
+  expect(xy(a))->Expect.toEqual((2., 4.))
+  a->Vec2.World.subInPlace(a)
+  expect(xy(a))->Expect.toEqual((0., 0.))
+
+  // `out` may be either end of the interpolation
+  let start = vec(0., 0.)
+  let target = vec(10., 20.)
+  start->Vec2.World.lerpInto(start, target, 0.5)
+  expect(xy(start))->Expect.toEqual((5., 10.))
+  target->Vec2.World.lerpInto(start, target, 0.5)
+  expect(xy(target))->Expect.toEqual((7.5, 15.))
+  Promise.resolve()
+})
+
+test("unitInPlace normalizes the vector and keeps a zero vector zero", () => {
+  let zero = vec(0., 0.)
+  zero->Vec2.World.unitInPlace
+  expect(xy(zero))->Expect.toEqual((0., 0.))
+
+  let left = vec(-8., 0.)
+  left->Vec2.World.unitInPlace
+  expect(xy(left))->Expect.toEqual((-1., 0.))
+
+  let diagonal = vec(3., 4.)
+  diagonal->Vec2.World.unitInPlace
+  expect(diagonal.x)->Expect.toBeCloseTo(0.6)
+  expect(diagonal.y)->Expect.toBeCloseTo(0.8)
+  Promise.resolve()
+})
+
+// =============================================================================
+// Scratch
+// =============================================================================
+
+test("a released scratch hands out the same vectors again", () => {
+  let created = ref(0)
+  let scratch = Vec2.World.makeScratch(() => {
+    created := created.contents + 1
+    vec(0., 0.)
+  })
+
+  let first = scratch->Vec2.World.borrow(1., 2.)
+  let second = scratch->Vec2.World.borrow(3., 4.)
+  expect(first)->Expect.not->Expect.toBe(second)
+  expect((xy(first), xy(second)))->Expect.toEqual(((1., 2.), (3., 4.)))
+  expect(created.contents)->Expect.toBe(2)
+
+  scratch->Vec2.World.releaseScratch
+  let reused = scratch->Vec2.World.borrow(5., 6.)
+  expect(reused)->Expect.toBe(first)
+  expect(xy(reused))->Expect.toEqual((5., 6.))
+  expect(scratch->Vec2.World.borrow(7., 8.))->Expect.toBe(second)
+  expect(created.contents)->Expect.toBe(2)
+
+  // The scratch only grows when every vector is borrowed
+  scratch->Vec2.World.borrow(9., 10.)->ignore
+  expect(created.contents)->Expect.toBe(3)
+  Promise.resolve()
+})
@@ -0,0 +1,153 @@
+// Generated by ReScript, PLEASE EDIT WITH CARE
+
+import * as Vitest from "vitest";
+import * as Vec2$Kaplay from "@nojaf/rescript-kaplay/src/Vec2.res.mjs";
+
+function vec(x, y) {
+  return {
+    x: x,
+    y: y
+  };
+}
+
+function xy(vec2) {
+  return [
+    vec2.x,
+    vec2.y
+  ];
+}
+
+Vitest.test("in-place operations write the result into their first argument", () => {
+  let a = vec(1, 2);
+  let b = vec(3, 5);
+  Vec2$Kaplay.World.addInPlace(a, b);
+  Vitest.expect(xy(a)).toEqual([
+    4,
+    7
+  ]);
+  Vec2$Kaplay.World.subInPlace(a, b);
+  Vitest.expect(xy(a)).toEqual([
+    1,
+    2
+  ]);
+  Vec2$Kaplay.World.addXYInPlace(a, -1, 1);
+  Vitest.expect(xy(a)).toEqual([
+    0,
+    3
+  ]);
+  Vec2$Kaplay.World.scaleInPlace(a, 2);
+  Vitest.expect(xy(a)).toEqual([
+    0,
+    6
+  ]);
+  Vec2$Kaplay.World.setXY(a, 8, 9);
+  Vitest.expect(xy(a)).toEqual([
+    8,
+    9
+  ]);
+  Vec2$Kaplay.World.copyInto(b, a);
+  Vitest.expect(xy(b)).toEqual([
+    8,
+    9
+  ]);
+  Vitest.expect(b).not.toBe(a);
+  Vitest.expect(Vec2$Kaplay.World.sdistXY(a, 5, 5)).toBe(25);
+  return Promise.resolve();
+});
+
+Vitest.test("in-place operations accept the same vector as both arguments", () => {
+  let a = vec(1, 2);
+  Vec2$Kaplay.World.addInPlace(a, a);
+  Vitest.expect(xy(a)).toEqual([
+    2,
+    4
+  ]);
+  Vec2$Kaplay.World.copyInto(a, a);
+  Vitest.expect(xy(a)).toEqual([
+    2,
+    4
+  ]);
+  Vec2$Kaplay.World.subInPlace(a, a);
+  Vitest.expect(xy(a)).toEqual([
+    0,
+    0
+  ]);
+  let start = vec(0, 0);
+  let target = vec(10, 20);
+  Vec2$Kaplay.World.lerpInto(start, start, target, 0.5);
+  Vitest.expect(xy(start)).toEqual([
+    5,
+    10
+  ]);
+  Vec2$Kaplay.World.lerpInto(target, start, target, 0.5);
+  Vitest.expect(xy(target)).toEqual([
+    7.5,
+    15
+  ]);
+  return Promise.resolve();
+});
+
+Vitest.test("unitInPlace normalizes the vector and keeps a zero vector zero", () => {
+  let zero = vec(0, 0);
+  Vec2$Kaplay.World.unitInPlace(zero);
+  Vitest.expect(xy(zero)).toEqual([
+    0,
+    0
+  ]);
+  let left = vec(-8, 0);
+  Vec2$Kaplay.World.unitInPlace(left);
+  Vitest.expect(xy(left)).toEqual([
+    -1,
+    0
+  ]);
+  let diagonal = vec(3, 4);
+  Vec2$Kaplay.World.unitInPlace(diagonal);
+  Vitest.expect(diagonal.x).toBeCloseTo(0.6);
+  Vitest.expect(diagonal.y).toBeCloseTo(0.8);
+  return Promise.resolve();
+});
+
+Vitest.test("a released scratch hands out the same vectors again", () => {
+  let created = {
+    contents: 0
+  };
+  let scratch = Vec2$Kaplay.World.makeScratch(() => {
+    created.contents = created.contents + 1 | 0;
+    return vec(0, 0);
+  });
+  let first = Vec2$Kaplay.World.borrow(scratch, 1, 2);
+  let second = Vec2$Kaplay.World.borrow(scratch, 3, 4);
+  Vitest.expect(first).not.toBe(second);
+  Vitest.expect([
+    xy(first),
+    xy(second)
+  ]).toEqual([
+    [
+      1,
+      2
+    ],
+    [
+      3,
+      4
+    ]
+  ]);
+  Vitest.expect(created.contents).toBe(2);
+  Vec2$Kaplay.World.releaseScratch(scratch);
+  let reused = Vec2$Kaplay.World.borrow(scratch, 5, 6);
+  Vitest.expect(reused).toBe(first);
+  Vitest.expect(xy(reused)).toEqual([
+    5,
+    6
+  ]);
+  Vitest.expect(Vec2$Kaplay.World.borrow(scratch, 7, 8)).toBe(second);
+  Vitest.expect(created.contents).toBe(2);
+  Vec2$Kaplay.World.borrow(scratch, 9, 10);
+  Vitest.expect(created.contents).toBe(3);
+  return Promise.resolve();
+});
+
+export {
+  vec,
+  xy,
+}
+/*  Not a pure module */
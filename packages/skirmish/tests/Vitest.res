@@ -10,6 +10,9 @@ module Expect = {
   @send
   external toBe: (t, 'expected) => unit = "toBe"
 
+  @send
+  external toEqual: (t, 'expected) => unit = "toEqual"
+
   @send
   external toBeDefined: t => unit = "toBeDefined"
 
@@ -25,6 +28,15 @@ module Expect = {
   @send
   external toHaveLength: (t, int) => unit = "toHaveLength"
 
+  @send
+  external toBeGreaterThan: (t, 'expected) => unit = "toBeGreaterThan"
+
+  @send
+  external toBeLessThanOrEqual: (t, 'expected) => unit = "toBeLessThanOrEqual"
+
+  @send
+  external toBeCloseTo: (t, float) => unit = "toBeCloseTo"
+
   @send
   external toHaveBeenCalled: t => unit = "toHaveBeenCalled"
 }
@@ -0,0 +1,20 @@
+import { defineConfig } from "vitest/config";
+import { playwright } from "@vitest/browser-playwright";
+
+export default defineConfig({
+  test: {
+    include: ["tests/*.bench.res.mjs"],
+    // Benchmarks run many simulated matches
+    testTimeout: 120_000,
+    browser: {
+      provider: playwright({
+        // Makes performance.memory report exact heap sizes
+        launchOptions: { args: ["--enable-precise-memory-info"] },
+      }),
+      enabled: true,
+      // at least one instance is required
+      instances: [{ browser: "chromium" }],
+      headless: true,
+    },
+  },
+});